@@ -22,6 +22,7 @@ from scipy.spatial import ConvexHull
 import html as html_escape
 
 from src.data_loader import DATA_DIR, REPORTS_DIR
+from src.clustering import ClusterIndex
 from src.map_visualization import APP_DIR, load_cluster_descriptors, load_cluster_names
 from src.temporal_analysis import run_temporal_analysis
 
@@ -31,17 +32,20 @@ CLUSTER_MAP_V2_PATH = APP_DIR / "cluster_map_v2.html"
 TEMPORAL_CLASSIFICATIONS_PATH = REPORTS_DIR / "temporal_classifications.json"
 
 
-def compute_monthly_distributions(df: pd.DataFrame) -> dict:
+def compute_monthly_distributions(df: pd.DataFrame, cluster_index: ClusterIndex = None) -> dict:
     """Compute monthly photo distribution for each cluster."""
-    df_clustered = df[df['cluster'] != -1].copy()
+    if cluster_index is None:
+        cluster_index = ClusterIndex(df)
     
     monthly_dist = {}
-    for cluster_id in df_clustered['cluster'].unique():
-        cluster_df = df_clustered[df_clustered['cluster'] == cluster_id]
+    for cluster_id in cluster_index.appearance_order():
+        if cluster_id == -1:
+            continue
         
         # Count by month
-        month_counts = cluster_df['date_taken_month'].value_counts()
-        total = len(cluster_df)
+        months = cluster_index.values('date_taken_month', cluster_id)
+        month_counts = pd.Series(months).value_counts()
+        total = len(months)
         
         # Normalize to percentages
         dist = []
@@ -86,21 +90,24 @@ def create_enhanced_map_v2(
     df: pd.DataFrame,
     temporal_classifications: dict,
     monthly_distributions: dict,
-    output_path: Path = CLUSTER_MAP_V2_PATH
+    output_path: Path = CLUSTER_MAP_V2_PATH,
+    cluster_index: ClusterIndex = None
 ):
     """
     Create enhanced cluster map v2 with interactive JavaScript filtering.
+    
+    Pass the ClusterIndex built after clustering as cluster_index to reuse
+    it; otherwise one is built here.
     """
     import folium
     
     print("Creating enhanced cluster map v2...")
     
-    # Filter noise
-    df_clustered = df[df['cluster'] != -1].copy()
+    if cluster_index is None:
+        cluster_index = ClusterIndex(df)
     
-    # Get cluster info
-    cluster_counts = df_clustered['cluster'].value_counts()
-    unique_clusters = sorted([c for c in df_clustered['cluster'].unique()])
+    # Get cluster info (noise excluded)
+    unique_clusters = [c for c in cluster_index.cluster_ids.tolist() if c != -1]
     
     print(f"  Processing {len(unique_clusters)} clusters...")
     
@@ -112,7 +119,7 @@ def create_enhanced_map_v2(
     cluster_data = []
     
     for cluster_id in unique_clusters:
-        cluster_df = df_clustered[df_clustered['cluster'] == cluster_id]
+        cluster_df = cluster_index.get(cluster_id)
         cluster_size = len(cluster_df)
         
         if cluster_size < 3:
@@ -896,14 +903,16 @@ def main():
     
     # Compute monthly distributions
     print("Computing monthly distributions...")
-    monthly_distributions = compute_monthly_distributions(df)
+    cluster_index = ClusterIndex(df)
+    monthly_distributions = compute_monthly_distributions(df, cluster_index=cluster_index)
     
     # Create enhanced map
     create_enhanced_map_v2(
         df=df,
         temporal_classifications=temporal_classifications,
         monthly_distributions=monthly_distributions,
-        output_path=CLUSTER_MAP_V2_PATH
+        output_path=CLUSTER_MAP_V2_PATH,
+        cluster_index=cluster_index
     )
     
     print(f"\n🎉 Open {CLUSTER_MAP_V2_PATH} in your browser!")
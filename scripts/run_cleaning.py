@@ -6,12 +6,13 @@ This script provides a reproducible way to run the cleaning pipeline
 from the command line with consistent parameters.
 
 Usage:
-    python scripts/run_cleaning.py [--no-bbox] [--no-cache] [--quiet]
+    python scripts/run_cleaning.py [--no-bbox] [--no-cache] [--partition year|year_month] [--quiet]
     
 Options:
-    --no-bbox   Skip Lyon bounding box filtering
-    --no-cache  Don't save cleaned data to cache
-    --quiet     Minimal output
+    --no-bbox    Skip Lyon bounding box filtering
+    --no-cache   Don't save cleaned data to cache
+    --partition  Also save a Hive-partitioned dataset by year or year/month
+    --quiet      Minimal output
 """
 
 import sys
@@ -21,7 +22,10 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from data_loader import load_and_clean_data, get_data_stats, CLEANED_DATA_PATH, CLEANING_LOG_PATH
+from data_loader import (
+    load_and_clean_data, get_data_stats, CLEANED_DATA_PATH, CLEANING_LOG_PATH,
+    CLEANED_PARTITIONED_DIR, PARTITION_SCHEMES
+)
 
 
 def main():
@@ -38,6 +42,12 @@ def main():
         action="store_true",
         help="Don't save cleaned data to cache"
     )
+    parser.add_argument(
+        "--partition",
+        choices=list(PARTITION_SCHEMES),
+        default=None,
+        help="Also save a Hive-partitioned Parquet dataset by year or year/month"
+    )
     parser.add_argument(
         "--quiet", 
         action="store_true",
@@ -51,7 +61,8 @@ def main():
         filter_bbox=not args.no_bbox,
         save_cache=not args.no_cache,
         save_log=True,
-        verbose=not args.quiet
+        verbose=not args.quiet,
+        partition_by=args.partition
     )
     
     if not args.quiet:
@@ -60,6 +71,8 @@ def main():
         print("=" * 60)
         print(f"\nOutputs:")
         print(f"  - Cleaned data: {CLEANED_DATA_PATH}")
+        if args.partition and not args.no_cache:
+            print(f"  - Partitioned data: {CLEANED_PARTITIONED_DIR}")
         print(f"  - Cleaning log: {CLEANING_LOG_PATH}")
         print(f"\nReady for clustering and analysis!")
     
@@ -31,15 +31,22 @@ PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.data_loader import (
-    load_and_clean_data, load_cleaned_data, 
-    CLEANED_DATA_PATH, DATA_DIR, REPORTS_DIR
+    load_and_clean_data, load_cleaned_data, create_datetime_column, build_visits,
+    cap_user_contributions, tag_user_types, save_spatial_parquet, export_to_sqlite,
+    CLEANED_DATA_PATH, DATA_DIR, REPORTS_DIR, PHOTO_DB_PATH,
+    VISIT_MAX_DISTANCE, VISIT_MAX_GAP_MINUTES, USER_CAP_CELL_SIZE, USER_TYPES
 )
 from src.clustering import (
-    prepare_coordinates, run_hdbscan, run_dbscan, run_kmeans, 
-    run_hierarchical, get_cluster_stats
+    prepare_coordinates, run_clustering, run_hdbscan, get_cluster_stats, ClusterIndex,
+    align_cluster_labels, save_cluster_hierarchy, CLUSTERING_ALGORITHMS, HIERARCHY_LEVELS
+)
+from src.spatial_index import build_cluster_lookup_index, CLUSTER_INDEX_PATH
+from src.stability import (
+    compute_cluster_stability, save_stability_json, load_cluster_stability
 )
 from src.text_mining import run_text_mining, run_association_rules_mining
 from src.temporal_analysis import run_temporal_analysis, classify_all_clusters
+from src.trajectories import run_trajectory_analysis, CLUSTER_TRANSITIONS_PATH
 from src.map_visualization import APP_DIR
 
 import pandas as pd
@@ -49,6 +56,7 @@ CLUSTERED_DATA_PATH = DATA_DIR / "flickr_clustered.csv"
 CLUSTERING_CACHE_META_PATH = DATA_DIR / "clustering_cache_meta.json"
 CLUSTER_MAP_PATH = APP_DIR / "cluster_map_v2.html"
 TEMPORAL_CLASSIFICATIONS_PATH = REPORTS_DIR / "temporal_classifications.json"
+CLUSTER_ALIGNMENT_PATH = REPORTS_DIR / "cluster_alignment.json"
 
 
 def print_header(title: str):
@@ -68,7 +76,8 @@ def create_enhanced_cluster_map(
     df: pd.DataFrame,
     temporal_classifications: dict,
     output_path: Path = CLUSTER_MAP_PATH,
-    min_cluster_size: int = 1  # Show ALL clusters
+    min_cluster_size: int = 1,  # Show ALL clusters
+    cluster_index: ClusterIndex = None
 ):
     """
     Create an enhanced cluster map with cluster type filter and temporal filtering.
@@ -78,6 +87,7 @@ def create_enhanced_cluster_map(
         temporal_classifications: Dict mapping cluster ID to type info
         output_path: Path to save the HTML map
         min_cluster_size: Minimum cluster size to display (1 = all clusters)
+        cluster_index: Prebuilt ClusterIndex of df (built if None)
     """
     import folium
     from folium.plugins import HeatMap
@@ -94,10 +104,12 @@ def create_enhanced_cluster_map(
     
     # Filter noise
     df_clustered = df[df['cluster'] != -1].copy()
+    if cluster_index is None:
+        cluster_index = ClusterIndex(df)
     
     # Get cluster info
-    cluster_counts = df_clustered['cluster'].value_counts()
-    unique_clusters = sorted([c for c in df_clustered['cluster'].unique()])
+    cluster_counts = cluster_index.sizes
+    unique_clusters = [c for c in cluster_index.cluster_ids.tolist() if c != -1]
     valid_clusters = [c for c in unique_clusters if cluster_counts.get(c, 0) >= min_cluster_size]
     
     print(f"  Total clusters: {len(valid_clusters)}")
@@ -135,7 +147,7 @@ def create_enhanced_cluster_map(
     
     # Add polygons for each cluster
     for cluster_id in valid_clusters:
-        cluster_df = df_clustered[df_clustered['cluster'] == cluster_id]
+        cluster_df = cluster_index.get(cluster_id)
         cluster_size = len(cluster_df)
         
         # Get coordinates
@@ -619,11 +631,31 @@ def run_full_pipeline(
     quick: bool = False,
     map_only: bool = False,
     skip_rules: bool = False,
+    rules_jobs: int = 1,
+    rules_max_len: int = 3,
     algorithm: str = 'hdbscan',
-    algo_params: dict = None
+    algo_params: dict = None,
+    stable_ids: bool = True,
+    stability_runs: int = 0,
+    hierarchy: bool = False,
+    visits: dict = None,
+    user_cap: dict = None,
+    user_type: str = None,
+    sqlite: bool = False
 ):
     """
     Run the complete Grand Lyon Photo Clusters pipeline with Session 3 enhancements.
+    
+    If visits is given (dict with max_distance and max_gap_minutes), photo
+    bursts are collapsed into visits after cleaning and all later stages run
+    on one record per visit. If user_cap is given (dict with max_per_cell and
+    cell_size), each user keeps at most max_per_cell photos per grid cell.
+    If user_type is given ('tourist' or 'resident'), only that user group's
+    photos are analysed. If sqlite is set, the clustered photos are also
+    exported to the SQLite query store (see data_loader.query_photos).
+    rules_jobs sets the worker processes for per-cluster association rule
+    mining (0 = all CPUs); rules_max_len=2 mines pair rules only, for all
+    clusters at once from sparse co-occurrence counts.
     """
     start_time = time.time()
     
@@ -638,6 +670,7 @@ def run_full_pipeline(
     if map_only:
         print_step(1, 1, "MAP GENERATION (from existing data)")
         df = pd.read_csv(CLUSTERED_DATA_PATH)
+        cluster_index = ClusterIndex(df)
     else:
         # =========================================================================
         # STAGE 1: DATA CLEANING
@@ -647,6 +680,10 @@ def run_full_pipeline(
         if skip_if_exists and CLEANED_DATA_PATH.exists():
             print(f"Loading cached cleaned data: {CLEANED_DATA_PATH}")
             df = pd.read_parquet(CLEANED_DATA_PATH)
+            if 'user_type' not in df.columns:
+                print("Tagging user types (cache predates user profiles)...")
+                df = tag_user_types(df)
+                save_spatial_parquet(df, CLEANED_DATA_PATH)
         else:
             df = load_and_clean_data(
                 filter_bbox=True,
@@ -660,7 +697,22 @@ def run_full_pipeline(
             print(f"Quick mode: sampling 20,000 rows...")
             df = df.sample(n=min(20000, len(df)), random_state=42)
         
-        print(f"✅ {len(df):,} photos ready")
+        if user_type:
+            df = df[df['user_type'] == user_type]
+            print(f"Keeping {user_type} photos only: {len(df):,}")
+        
+        if visits:
+            n_photos = len(df)
+            df = build_visits(df, **visits)
+            print(f"Collapsed {n_photos:,} photos into {len(df):,} visits "
+                  f"(<= {visits['max_distance']} deg, <= {visits['max_gap_minutes']} min)")
+        
+        if user_cap:
+            df, removed = cap_user_contributions(df, **user_cap)
+            print(f"Capped contributions at {user_cap['max_per_cell']} per user per "
+                  f"{user_cap['cell_size']} deg cell: removed {removed:,}")
+        
+        print(f"✅ {len(df):,} {'visits' if visits else 'photos'} ready")
         
         # =========================================================================
         # STAGE 2: CLUSTERING
@@ -669,12 +721,18 @@ def run_full_pipeline(
         
         # Build cache key from algorithm + params to detect stale cache
         params = algo_params or {}
+        hierarchy = hierarchy and algorithm == 'hdbscan'
         cache_meta = {
             'algorithm': algorithm,
+            'hierarchy': HIERARCHY_LEVELS if hierarchy else None,
+            'visits': visits or None,
+            'user_cap': user_cap or None,
+            'user_type': user_type,
             'params': {
                 'min_cluster_size': params.get('min_cluster_size', 120),
                 'min_samples': params.get('min_samples'),
                 'eps': params.get('eps', 0.005),
+                'eps_temporal': params.get('eps_temporal', 1.0),
                 'n_clusters': params.get('n_clusters', 50),
             }
         }
@@ -707,31 +765,37 @@ def run_full_pipeline(
             coords = prepare_coordinates(df, scale=scale)
             
             # Run selected clustering algorithm
-            if algorithm == 'hdbscan':
-                labels = run_hdbscan(
+            if hierarchy:
+                # City / district / POI labels from the same condensed tree
+                labels, cluster_hierarchy = run_hdbscan(
                     coords,
                     min_cluster_size=params.get('min_cluster_size', 120),
-                    min_samples=params.get('min_samples', None)
-                )
-            elif algorithm == 'dbscan':
-                labels = run_dbscan(
-                    coords,
-                    eps=params.get('eps', 0.005),
-                    min_samples=params.get('min_samples', 10)
-                )
-            elif algorithm == 'kmeans':
-                labels = run_kmeans(
-                    coords,
-                    n_clusters=params.get('n_clusters', 50)
-                )
-            elif algorithm == 'hierarchical':
-                labels = run_hierarchical(
-                    coords,
-                    n_clusters=params.get('n_clusters', 50),
-                    linkage=params.get('linkage', 'ward')
+                    min_samples=params.get('min_samples', None),
+                    hierarchy_levels=HIERARCHY_LEVELS
                 )
+                for level in cluster_hierarchy['levels']:
+                    df[f'cluster_{level}'] = cluster_hierarchy['labels'][level]
+                    n_level = int(cluster_hierarchy['labels'][level].max()) + 1
+                    print(f"  Level '{level}' (>= {cluster_hierarchy['thresholds'][level]} photos): {n_level} clusters")
+                save_cluster_hierarchy(cluster_hierarchy)
             else:
-                raise ValueError(f"Unknown algorithm: {algorithm}")
+                times = create_datetime_column(df) if algorithm == 'st_dbscan' else None
+                labels = run_clustering(coords, algorithm, params, times=times)
+            
+            # Reuse the previous run's cluster IDs so downstream outputs stay valid
+            if stable_ids and CLUSTERED_DATA_PATH.exists():
+                previous = pd.read_csv(CLUSTERED_DATA_PATH, usecols=['id', 'cluster'])
+                previous = previous.drop_duplicates(subset='id')
+                reference = df[['id']].merge(previous, on='id', how='left')['cluster']
+                labels, alignment = align_cluster_labels(
+                    labels, reference.fillna(-1).astype(int).values
+                )
+                alignment['created_at'] = datetime.now().isoformat()
+                with open(CLUSTER_ALIGNMENT_PATH, 'w') as f:
+                    json.dump(alignment, f, indent=2)
+                print(f"  Aligned IDs with previous run: {alignment['n_matched']} matched "
+                      f"({len(alignment['unchanged_clusters'])} unchanged), "
+                      f"{alignment['n_new']} new, {alignment['n_retired']} retired")
             
             df['cluster'] = labels
             
@@ -747,8 +811,41 @@ def run_full_pipeline(
                 json.dump(cache_meta, f, indent=2)
             print(f"  Cache saved with key: {cache_key}")
         
+        # Point-to-cluster lookup index for ad-hoc tools and the map
+        if not cache_valid or not CLUSTER_INDEX_PATH.exists():
+            build_cluster_lookup_index(df)
+        
         print(f"✅ {df['cluster'].nunique()} clusters")
         
+        if sqlite:
+            export_to_sqlite(df, PHOTO_DB_PATH)
+            print(f"  SQLite store: {PHOTO_DB_PATH}")
+        
+        # Rows grouped by cluster once, shared by temporal analysis and the map
+        cluster_index = ClusterIndex(df)
+        
+        # Bootstrap stability (reuse saved scores when the clustering was reused)
+        if stability_runs > 0:
+            stability = compute_cluster_stability(
+                prepare_coordinates(df, scale=algorithm in ['kmeans', 'hierarchical']),
+                df['cluster'].values,
+                algorithm=algorithm,
+                params=params,
+                times=create_datetime_column(df) if algorithm == 'st_dbscan' else None,
+                n_bootstrap=stability_runs
+            )
+            save_stability_json(stability, metadata={
+                'algorithm': algorithm,
+                'params': cache_meta['params'],
+                'cache_key': cache_key,
+                'n_bootstrap': stability_runs
+            })
+            cluster_stability = stability['stability'].round(4).dropna().to_dict()
+        elif cache_valid:
+            cluster_stability = load_cluster_stability(cache_key=cache_key)
+        else:
+            cluster_stability = {}
+        
         # =========================================================================
         # STAGE 3: TEXT MINING
         # =========================================================================
@@ -765,7 +862,10 @@ def run_full_pipeline(
             run_association_rules_mining(
                 df=df, 
                 save_results=True,
-                tfidf_descriptors=tfidf_descriptors  # Pass TF-IDF to avoid recomputation
+                tfidf_descriptors=tfidf_descriptors,  # Pass TF-IDF to avoid recomputation
+                cluster_stability=cluster_stability,
+                n_jobs=rules_jobs or None,
+                max_len=rules_max_len
             )
         else:
             print("⏭️  Skipping association rules mining (--skip-rules)")
@@ -777,7 +877,7 @@ def run_full_pipeline(
         # =========================================================================
         print_step(4, total_steps, "TEMPORAL ANALYSIS")
         
-        result = run_temporal_analysis(df=df)
+        result = run_temporal_analysis(df=df, cluster_index=cluster_index)
         temporal_classifications = result['classifications']
         
         # Save classifications for later use
@@ -788,6 +888,7 @@ def run_full_pipeline(
                 json_data[str(cid)] = {
                     'type': info['type'],
                     'matched_events': info['matched_events'],
+                    'stability': cluster_stability.get(cid),
                     'stats': {
                         'total_photos': info['stats'].get('total_photos', 0),
                         'december_ratio': info['stats'].get('december_ratio', 0),
@@ -797,6 +898,9 @@ def run_full_pipeline(
                 }
             json.dump(json_data, f, indent=2)
         
+        # Movements between clusters (trips split on long time gaps)
+        run_trajectory_analysis(df=df)
+        
         print("✅ Temporal analysis complete")
         
         # =========================================================================
@@ -814,7 +918,7 @@ def run_full_pipeline(
                     temporal_classifications[int(cid_str)] = info
         else:
             print("  Running temporal classification...")
-            result = run_temporal_analysis(df=df)
+            result = run_temporal_analysis(df=df, cluster_index=cluster_index)
             temporal_classifications = result['classifications']
     
     # Generate enhanced map v2
@@ -825,14 +929,15 @@ def run_full_pipeline(
     
     # Compute monthly distributions
     print("  Computing monthly distributions...")
-    monthly_distributions = compute_monthly_distributions(df)
+    monthly_distributions = compute_monthly_distributions(df, cluster_index=cluster_index)
     
     # Create v2 map
     create_enhanced_map_v2(
         df=df,
         temporal_classifications=temporal_classifications,
         monthly_distributions=monthly_distributions,
-        output_path=CLUSTER_MAP_PATH
+        output_path=CLUSTER_MAP_PATH,
+        cluster_index=cluster_index
     )
     
     # =========================================================================
@@ -848,6 +953,7 @@ def run_full_pipeline(
     print(f"  📝 TF-IDF descriptors: {REPORTS_DIR / 'cluster_descriptors.json'}")
     print(f"  📝 Association rules: {REPORTS_DIR / 'association_rules.json'}")
     print(f"  📊 Temporal analysis: {REPORTS_DIR / 'temporal_analysis.md'}")
+    print(f"  🧭 Transitions:       {CLUSTER_TRANSITIONS_PATH}")
     print(f"  🗺️  Cluster map:       {CLUSTER_MAP_PATH}")
     print(f"\n🎉 Open {CLUSTER_MAP_PATH} in your browser!")
     
@@ -880,11 +986,25 @@ def main():
         action="store_true",
         help="Skip association rules mining for faster execution"
     )
+    parser.add_argument(
+        "--rules-jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Mine association rules over N processes, 0 = all CPUs (default: 1)"
+    )
+    parser.add_argument(
+        "--rules-max-len",
+        type=int,
+        default=3,
+        choices=[2, 3],
+        help="Maximum rule itemset length; 2 mines pair rules for all clusters at once (default: 3)"
+    )
     parser.add_argument(
         "--algorithm", "-a",
         type=str,
         default="hdbscan",
-        choices=["hdbscan", "dbscan", "kmeans", "hierarchical"],
+        choices=CLUSTERING_ALGORITHMS,
         help="Clustering algorithm to use (default: hdbscan)"
     )
     parser.add_argument(
@@ -897,7 +1017,13 @@ def main():
         "--eps",
         type=float,
         default=0.005,
-        help="DBSCAN: epsilon radius (default: 0.005)"
+        help="DBSCAN/ST-DBSCAN: epsilon radius (default: 0.005)"
+    )
+    parser.add_argument(
+        "--eps-temporal",
+        type=float,
+        default=1.0,
+        help="ST-DBSCAN: temporal epsilon in days (default: 1.0)"
     )
     parser.add_argument(
         "--min-samples",
@@ -911,6 +1037,65 @@ def main():
         default=50,
         help="KMeans/Hierarchical: number of clusters (default: 50)"
     )
+    parser.add_argument(
+        "--no-stable-ids",
+        action="store_true",
+        help="Do not align cluster IDs with the previous run's clustered data"
+    )
+    parser.add_argument(
+        "--stability",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Compute bootstrap cluster stability over N resamples (default: off)"
+    )
+    parser.add_argument(
+        "--hierarchy",
+        action="store_true",
+        help="HDBSCAN: also save city/district/POI cluster levels from the same fit"
+    )
+    parser.add_argument(
+        "--visits",
+        action="store_true",
+        help="Collapse same-user photo bursts into visits before clustering"
+    )
+    parser.add_argument(
+        "--visit-distance",
+        type=float,
+        default=VISIT_MAX_DISTANCE,
+        help=f"Visits: max distance between consecutive photos in degrees (default: {VISIT_MAX_DISTANCE})"
+    )
+    parser.add_argument(
+        "--visit-gap",
+        type=float,
+        default=VISIT_MAX_GAP_MINUTES,
+        help=f"Visits: max time between consecutive photos in minutes (default: {VISIT_MAX_GAP_MINUTES})"
+    )
+    parser.add_argument(
+        "--user-cap",
+        type=int,
+        default=0,
+        metavar="K",
+        help="Keep at most K photos per user per grid cell before clustering (default: off)"
+    )
+    parser.add_argument(
+        "--user-cap-cell",
+        type=float,
+        default=USER_CAP_CELL_SIZE,
+        help=f"User cap: grid cell size in degrees (default: {USER_CAP_CELL_SIZE})"
+    )
+    parser.add_argument(
+        "--user-type",
+        type=str,
+        default=None,
+        choices=USER_TYPES[:2],
+        help="Only analyse photos by tourists or by residents (default: all users)"
+    )
+    parser.add_argument(
+        "--sqlite",
+        action="store_true",
+        help="Export clustered photos to a SQLite store with R*Tree and FTS5 indexes"
+    )
     
     args = parser.parse_args()
     
@@ -919,6 +1104,7 @@ def main():
         'min_cluster_size': args.min_cluster_size,
         'min_samples': args.min_samples,
         'eps': args.eps,
+        'eps_temporal': args.eps_temporal,
         'n_clusters': args.n_clusters,
     }
     
@@ -928,8 +1114,23 @@ def main():
             quick=args.quick,
             map_only=args.map_only,
             skip_rules=args.skip_rules,
+            rules_jobs=args.rules_jobs,
+            rules_max_len=args.rules_max_len,
             algorithm=args.algorithm,
-            algo_params=algo_params
+            algo_params=algo_params,
+            stable_ids=not args.no_stable_ids,
+            stability_runs=args.stability,
+            hierarchy=args.hierarchy,
+            visits={
+                'max_distance': args.visit_distance,
+                'max_gap_minutes': args.visit_gap
+            } if args.visits else None,
+            user_cap={
+                'max_per_cell': args.user_cap,
+                'cell_size': args.user_cap_cell
+            } if args.user_cap > 0 else None,
+            user_type=args.user_type,
+            sqlite=args.sqlite
         )
     except KeyboardInterrupt:
         print("\n\n⚠️  Pipeline interrupted by user")
@@ -11,6 +11,10 @@ from sklearn.cluster import DBSCAN, KMeans, AgglomerativeClustering
 import hdbscan
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import silhouette_score, davies_bouldin_score, calinski_harabasz_score
+from scipy.spatial import cKDTree
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.optimize import linear_sum_assignment
 from pathlib import Path
 from typing import Tuple, Optional, Dict, List
 import json
@@ -321,8 +325,10 @@ def run_hdbscan(
     min_cluster_size: int = 15,
     min_samples: int = None,
     cluster_selection_epsilon: float = 0.0,
-    cluster_selection_method: str = 'eom'
-) -> np.ndarray:
+    cluster_selection_method: str = 'eom',
+    core_dist_n_jobs: int = 4,
+    hierarchy_levels: Optional[Dict[str, int]] = None
+):
     """
     Run HDBSCAN clustering on coordinates.
     
@@ -338,21 +344,199 @@ def run_hdbscan(
         min_samples: Number of samples in neighborhood for core points (defaults to min_cluster_size)
         cluster_selection_epsilon: Distance threshold for cluster selection (0 = no threshold)
         cluster_selection_method: 'eom' (Excess of Mass) or 'leaf'
+        core_dist_n_jobs: Parallel jobs for core distances (1 = no worker processes)
+        hierarchy_levels: Optional {level name: size threshold} to also extract
+                          a multi-level labelling from the same fit
+                          (see extract_cluster_hierarchy)
     
     Returns:
-        Array of cluster labels (-1 = noise)
+        Array of cluster labels (-1 = noise), or a tuple of
+        (labels, hierarchy) when hierarchy_levels is given
     """
     clusterer = hdbscan.HDBSCAN(
         min_cluster_size=min_cluster_size,
         min_samples=min_samples,
         cluster_selection_epsilon=cluster_selection_epsilon,
         cluster_selection_method=cluster_selection_method,
-        metric='euclidean'
+        metric='euclidean',
+        core_dist_n_jobs=core_dist_n_jobs
     )
     labels = clusterer.fit_predict(coords)
+    if hierarchy_levels:
+        return labels, extract_cluster_hierarchy(clusterer, hierarchy_levels)
     return labels
 
 
+# Default zoom levels: size thresholds on the condensed tree
+# (None = the min_cluster_size of the fit)
+HIERARCHY_LEVELS = {
+    'city': 5000,
+    'district': 1000,
+    'poi': None,
+}
+
+
+def extract_cluster_hierarchy(
+    clusterer: hdbscan.HDBSCAN,
+    levels: Dict[str, int] = None
+) -> Dict:
+    """
+    Extract a multi-level labelling from a fitted HDBSCAN condensed tree.
+    
+    At each size threshold s, a split of the condensed tree is honored only
+    if both children have at least s points; otherwise the larger child is
+    treated as a continuation of its parent and the smaller one as points
+    falling out of it (the condensing rule of min_cluster_size=s, on the
+    core distances of this fit). Clusters at level s are the leaves of that
+    pruned tree, so every level comes from the same fit and nests inside
+    the coarser ones.
+    
+    This is a leaf selection, not the excess-of-mass (EOM) selection the fit
+    uses by default, and it is not what a refit with min_cluster_size=s
+    would give (min_samples and the EOM choice would change). In particular
+    the finest level, at the fit's own min_cluster_size, usually has more
+    and smaller clusters than the main labelling.
+    
+    Args:
+        clusterer: Fitted hdbscan.HDBSCAN instance
+        levels: {level name: size threshold}, default HIERARCHY_LEVELS;
+                a None threshold means clusterer.min_cluster_size
+    
+    Returns:
+        Dictionary with:
+        - 'levels': level names ordered from coarse to fine
+        - 'thresholds': {level: size threshold}
+        - 'labels': {level: array of labels (-1 = noise)}
+        - 'parents': {level: {cluster: parent cluster at the next coarser level}}
+    """
+    levels = {
+        level: clusterer.min_cluster_size if threshold is None else threshold
+        for level, threshold in (levels or HIERARCHY_LEVELS).items()
+    }
+    ordered = sorted(levels, key=levels.get, reverse=True)
+    
+    tree = clusterer.condensed_tree_.to_numpy()
+    n_points = len(clusterer.labels_)
+    root = n_points
+    ROOT = -2
+    
+    point_rows = tree['child'] < n_points
+    point_ids = tree['child'][point_rows]
+    point_parent = tree['parent'][point_rows]
+    
+    cluster_rows = ~point_rows
+    child_nodes = tree['child'][cluster_rows]
+    child_parent = tree['parent'][cluster_rows]
+    child_size = tree['child_size'][cluster_rows]
+    n_nodes = int(max(tree['parent'].max(), child_nodes.max() if len(child_nodes) else root)) + 1
+    
+    # Children of each cluster node, visited top-down (parent id < child id)
+    order = np.argsort(child_parent, kind='stable')
+    children = {}
+    for parent, child, size in zip(child_parent[order], child_nodes[order], child_size[order]):
+        children.setdefault(int(parent), []).append((int(child), int(size)))
+    
+    result = {
+        'levels': ordered,
+        'thresholds': {level: int(levels[level]) for level in ordered},
+        'labels': {},
+        'parents': {},
+    }
+    node_reps = {}
+    
+    for level in ordered:
+        threshold = levels[level]
+        # rep[node] = condensed-tree node that represents it at this level
+        # (-1 = noise, ROOT = still part of the root, which is never a cluster)
+        rep = np.full(n_nodes, -1, dtype=np.int64)
+        rep[root] = ROOT
+        # Clusters that split further down are not leaves at this level
+        interior = np.zeros(n_nodes, dtype=bool)
+        
+        for node in range(root, n_nodes):
+            kids = children.get(node, [])
+            big = [child for child, size in kids if size >= threshold]
+            if len(big) >= 2:
+                if rep[node] >= 0:
+                    interior[rep[node]] = True
+                for child in big:
+                    rep[child] = child if rep[node] != -1 else -1
+            else:
+                for child, _ in kids:
+                    rep[child] = rep[node]
+        
+        # Points belong to the leaf cluster of their node; points that fell
+        # out of an interior cluster (or the root) are noise, as in HDBSCAN
+        point_rep = np.where(rep >= 0, rep, -1)
+        point_rep[(point_rep >= 0) & interior[np.maximum(point_rep, 0)]] = -1
+        
+        raw = np.full(n_points, -1, dtype=np.int64)
+        raw[point_ids] = point_rep[point_parent]
+        
+        # Consecutive IDs, ordered top-down by condensed-tree node
+        reps = np.unique(raw[raw != -1])
+        labels = np.full(n_points, -1, dtype=int)
+        labels[raw != -1] = np.searchsorted(reps, raw[raw != -1])
+        
+        result['labels'][level] = labels
+        node_reps[level] = (np.where(interior[np.maximum(rep, 0)], -1, rep), reps)
+    
+    # Parent links: the coarser-level cluster containing each cluster's node
+    # (-1 when that part of the tree is noise at the coarser level)
+    for coarse, fine in zip(ordered[:-1], ordered[1:]):
+        coarse_rep, coarse_ids = node_reps[coarse]
+        _, fine_ids = node_reps[fine]
+        parents = {}
+        for cluster_id, node in enumerate(fine_ids):
+            parent_node = coarse_rep[node]
+            parents[cluster_id] = int(np.searchsorted(coarse_ids, parent_node)) if parent_node >= 0 else -1
+        result['parents'][fine] = parents
+    
+    return result
+
+
+def save_cluster_hierarchy(
+    hierarchy: Dict,
+    output_path: Path = None
+) -> Path:
+    """
+    Save the multi-level cluster hierarchy (sizes and parent links) to JSON.
+    
+    Args:
+        hierarchy: Output of extract_cluster_hierarchy
+        output_path: Output file path
+    
+    Returns:
+        Path to saved file
+    """
+    if output_path is None:
+        output_path = REPORTS_DIR / "cluster_hierarchy.json"
+    
+    output = {
+        'generated_at': datetime.now().isoformat(),
+        'levels': hierarchy['levels'],
+        'thresholds': hierarchy['thresholds'],
+        'clusters': {}
+    }
+    for level in hierarchy['levels']:
+        labels = hierarchy['labels'][level]
+        ids, sizes = np.unique(labels[labels != -1], return_counts=True)
+        parents = hierarchy['parents'].get(level, {})
+        output['clusters'][level] = {
+            str(cluster_id): {
+                'size': int(size),
+                'parent': parents.get(int(cluster_id))
+            }
+            for cluster_id, size in zip(ids, sizes)
+        }
+    
+    with open(output_path, 'w') as f:
+        json.dump(output, f, indent=2)
+    
+    print(f"Saved cluster hierarchy to {output_path}")
+    return output_path
+
+
 def find_optimal_hdbscan(
     coords: np.ndarray,
     min_cluster_sizes: List[int] = None,
@@ -397,6 +581,7 @@ def find_optimal_hdbscan(
             
             labels = run_hdbscan(coords, min_cluster_size=mcs, min_samples=ms)
             stats = get_cluster_stats(labels)
+            summary = summarize_clusters(coords, labels)
             
             # Calculate silhouette on sample (only for clustered points)
             mask = labels[sample_idx] != -1
@@ -412,6 +597,7 @@ def find_optimal_hdbscan(
                 'noise_pct': round(stats['noise_percentage'], 1),
                 'largest_pct': round(stats['largest_cluster'] / len(labels) * 100, 1),
                 'median_size': stats['median_cluster_size'],
+                'median_radius': round(float(summary['radius_of_gyration'].median()), 5) if len(summary) else None,
                 'silhouette': round(sil, 4) if sil else None
             }
             results.append(result)
@@ -419,6 +605,171 @@ def find_optimal_hdbscan(
     
     return results
 
+# =============================================================================
+# SPATIO-TEMPORAL DBSCAN
+# =============================================================================
+
+def run_st_dbscan(
+    coords: np.ndarray,
+    times,
+    eps_spatial: float = 0.005,
+    eps_temporal: float = 1.0,
+    min_samples: int = 10
+) -> np.ndarray:
+    """
+    Run ST-DBSCAN clustering on coordinates and capture times.
+    
+    Two photos are neighbors only if they are within eps_spatial in space
+    AND within eps_temporal in time, so a short-lived event (e.g. Fête des
+    Lumières) is separated from the permanent landmark it takes place at.
+    
+    Points are sorted by time and split into windows of width eps_temporal,
+    with one KD-tree per window. Any temporal neighbor lies in the same or
+    the next window, so each window is only queried against itself and its
+    successor, keeping the search near-linear on the full dataset.
+    
+    Args:
+        coords: Array of [lat, lon] coordinates
+        times: Capture timestamps (datetime64 array/Series, NaT = unknown)
+        eps_spatial: Maximum spatial distance between neighbors (in degrees)
+        eps_temporal: Maximum time difference between neighbors (in days)
+        min_samples: Minimum neighbors (including the point) for a core point
+    
+    Returns:
+        Array of cluster labels (-1 = noise, also for points without a timestamp)
+    """
+    coords = np.asarray(coords, dtype=float)
+    n_points = len(coords)
+    labels = np.full(n_points, -1, dtype=int)
+    
+    # Timestamps as float days; NaT rows cannot be placed in time -> noise
+    t = np.asarray(pd.to_datetime(pd.Series(np.asarray(times))), dtype='datetime64[s]')
+    valid = ~np.isnat(t)
+    days = t[valid].astype(np.int64) / 86400.0
+    valid_idx = np.flatnonzero(valid)
+    if len(valid_idx) == 0:
+        return labels
+    
+    order = np.argsort(days, kind='stable')
+    days = days[order]
+    xy = coords[valid_idx[order]]
+    n = len(days)
+    
+    # Time windows of width eps_temporal over the sorted timestamps
+    window = np.floor((days - days[0]) / eps_temporal).astype(np.int64)
+    window_ids, starts = np.unique(window, return_index=True)
+    bounds = np.append(starts, n)
+    trees = [cKDTree(xy[bounds[w]:bounds[w + 1]]) for w in range(len(window_ids))]
+    
+    rows, cols = [], []
+    for w in range(len(window_ids)):
+        lo, hi = bounds[w], bounds[w + 1]
+        # Same window (includes self-pairs, both directions)
+        pairs = trees[w].sparse_distance_matrix(trees[w], eps_spatial, output_type='ndarray')
+        i, j = pairs['i'] + lo, pairs['j'] + lo
+        keep = np.abs(days[i] - days[j]) <= eps_temporal
+        rows.append(i[keep])
+        cols.append(j[keep])
+        
+        # Next window, only if it is adjacent in time
+        if w + 1 < len(window_ids) and window_ids[w + 1] == window_ids[w] + 1:
+            nlo = bounds[w + 1]
+            pairs = trees[w].sparse_distance_matrix(trees[w + 1], eps_spatial, output_type='ndarray')
+            i, j = pairs['i'] + lo, pairs['j'] + nlo
+            keep = np.abs(days[i] - days[j]) <= eps_temporal
+            rows.extend([i[keep], j[keep]])
+            cols.extend([j[keep], i[keep]])
+    
+    rows = np.concatenate(rows)
+    cols = np.concatenate(cols)
+    
+    # Core points: neighborhood size (self included) >= min_samples
+    n_neighbors = np.bincount(rows, minlength=n)
+    core = n_neighbors >= min_samples
+    
+    # Clusters are connected components of the core-core neighbor graph
+    core_edge = core[rows] & core[cols]
+    graph = coo_matrix(
+        (np.ones(core_edge.sum(), dtype=np.int8), (rows[core_edge], cols[core_edge])),
+        shape=(n, n)
+    ).tocsr()
+    _, component = connected_components(graph, directed=False)
+    
+    sorted_labels = np.full(n, -1, dtype=int)
+    _, sorted_labels[core] = np.unique(component[core], return_inverse=True)
+    
+    # Border points join the cluster of a neighboring core point
+    border_edge = ~core[rows] & core[cols]
+    sorted_labels[rows[border_edge]] = sorted_labels[cols[border_edge]]
+    
+    labels[valid_idx[order]] = sorted_labels
+    return labels
+
+
+# =============================================================================
+# ALGORITHM DISPATCH
+# =============================================================================
+
+CLUSTERING_ALGORITHMS = ['hdbscan', 'dbscan', 'st_dbscan', 'kmeans', 'hierarchical']
+
+
+def run_clustering(
+    coords: np.ndarray,
+    algorithm: str = 'hdbscan',
+    params: Optional[Dict] = None,
+    times=None
+) -> np.ndarray:
+    """
+    Run a clustering algorithm by name with pipeline-style parameters.
+    
+    Args:
+        coords: Array of [lat, lon] coordinates (scaled for kmeans/hierarchical)
+        algorithm: One of CLUSTERING_ALGORITHMS
+        params: Dict with any of min_cluster_size, min_samples, eps,
+                eps_temporal, n_clusters, linkage, n_jobs (missing = defaults)
+        times: Capture timestamps aligned with coords (st_dbscan only)
+    
+    Returns:
+        Array of cluster labels (-1 = noise)
+    """
+    params = params or {}
+    if algorithm == 'hdbscan':
+        return run_hdbscan(
+            coords,
+            min_cluster_size=params.get('min_cluster_size', 120),
+            min_samples=params.get('min_samples', None),
+            core_dist_n_jobs=params.get('n_jobs', 4)
+        )
+    elif algorithm == 'dbscan':
+        return run_dbscan(
+            coords,
+            eps=params.get('eps', 0.005),
+            min_samples=params.get('min_samples') or 10
+        )
+    elif algorithm == 'st_dbscan':
+        if times is None:
+            raise ValueError("st_dbscan requires capture times")
+        return run_st_dbscan(
+            coords,
+            times,
+            eps_spatial=params.get('eps', 0.005),
+            eps_temporal=params.get('eps_temporal', 1.0),
+            min_samples=params.get('min_samples') or 10
+        )
+    elif algorithm == 'kmeans':
+        return run_kmeans(
+            coords,
+            n_clusters=params.get('n_clusters', 50)
+        )
+    elif algorithm == 'hierarchical':
+        return run_hierarchical(
+            coords,
+            n_clusters=params.get('n_clusters', 50),
+            linkage=params.get('linkage', 'ward')
+        )
+    raise ValueError(f"Unknown algorithm: {algorithm}")
+
+
 # =============================================================================
 # CLUSTER STATISTICS & METRICS
 # =============================================================================
@@ -433,33 +784,108 @@ def get_cluster_stats(labels: np.ndarray) -> dict:
     Returns:
         Dictionary of statistics
     """
-    unique_labels = set(labels)
-    n_clusters = len(unique_labels) - (1 if -1 in unique_labels else 0)
-    n_noise = (labels == -1).sum()
-    
+    labels = np.asarray(labels)
+
+    # One sort over the labels instead of one boolean mask per cluster
+    unique_labels, counts = np.unique(labels, return_counts=True)
+    noise_mask = unique_labels == -1
+    n_noise = int(counts[noise_mask].sum())
+    n_clusters = int((~noise_mask).sum())
+
     # Cluster size distribution (excluding noise)
-    cluster_sizes = []
-    for label in unique_labels:
-        if label != -1:
-            cluster_sizes.append(int((labels == label).sum()))
-    
-    cluster_sizes = sorted(cluster_sizes, reverse=True)
-    
+    cluster_sizes = np.sort(counts[~noise_mask])[::-1]
+
     return {
         'n_clusters': n_clusters,
         'n_noise': int(n_noise),
         'noise_percentage': float(n_noise / len(labels) * 100),
         'total_points': len(labels),
         'clustered_points': len(labels) - int(n_noise),
-        'largest_cluster': int(cluster_sizes[0]) if cluster_sizes else 0,
-        'smallest_cluster': int(cluster_sizes[-1]) if cluster_sizes else 0,
-        'median_cluster_size': int(np.median(cluster_sizes)) if cluster_sizes else 0,
-        'mean_cluster_size': float(np.mean(cluster_sizes)) if cluster_sizes else 0,
-        'std_cluster_size': float(np.std(cluster_sizes)) if cluster_sizes else 0,
+        'largest_cluster': int(cluster_sizes[0]) if len(cluster_sizes) else 0,
+        'smallest_cluster': int(cluster_sizes[-1]) if len(cluster_sizes) else 0,
+        'median_cluster_size': int(np.median(cluster_sizes)) if len(cluster_sizes) else 0,
+        'mean_cluster_size': float(np.mean(cluster_sizes)) if len(cluster_sizes) else 0,
+        'std_cluster_size': float(np.std(cluster_sizes)) if len(cluster_sizes) else 0,
         'cluster_sizes_top10': [int(x) for x in cluster_sizes[:10]]
     }
 
 
+def summarize_clusters(
+    coords: np.ndarray,
+    labels: np.ndarray,
+    include_noise: bool = False
+) -> pd.DataFrame:
+    """
+    Compute per-cluster spatial statistics in a single pass over the labels.
+
+    Sizes, centroids and second moments come from weighted `np.bincount`
+    calls (variances on coordinates centered on their cluster centroid, so
+    tight clusters keep their precision); bounding boxes from `reduceat` over the label-sorted coordinates.
+    This is O(N log N) regardless of the number of clusters, unlike looping
+    over clusters with one boolean mask each.
+
+    Args:
+        coords: Array of [lat, lon] coordinates (NOT scaled)
+        labels: Cluster labels aligned with coords
+        include_noise: Whether to keep a row for the noise label (-1)
+
+    Returns:
+        DataFrame indexed by cluster ID with columns: size, centroid_lat,
+        centroid_lon, lat_min, lat_max, lon_min, lon_max, spread_lat,
+        spread_lon (standard deviations) and radius_of_gyration (degrees)
+    """
+    coords = np.asarray(coords, dtype=float)
+    labels = np.asarray(labels)
+
+    columns = [
+        'size', 'centroid_lat', 'centroid_lon',
+        'lat_min', 'lat_max', 'lon_min', 'lon_max',
+        'spread_lat', 'spread_lon', 'radius_of_gyration'
+    ]
+
+    if not include_noise:
+        mask = labels != -1
+        coords = coords[mask]
+        labels = labels[mask]
+
+    if len(labels) == 0:
+        return pd.DataFrame(columns=columns, index=pd.Index([], name='cluster'))
+
+    # Dense 0..K-1 codes for the labels
+    cluster_ids, inverse, sizes = np.unique(labels, return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+    n = len(cluster_ids)
+    lat, lon = coords[:, 0], coords[:, 1]
+
+    # First moments, then second moments around each cluster's centroid
+    # (E[x²] - E[x]² on raw degrees would cancel most significant digits)
+    centroid_lat = np.bincount(inverse, weights=lat, minlength=n) / sizes
+    centroid_lon = np.bincount(inverse, weights=lon, minlength=n) / sizes
+    var_lat = np.bincount(inverse, weights=(lat - centroid_lat[inverse]) ** 2, minlength=n) / sizes
+    var_lon = np.bincount(inverse, weights=(lon - centroid_lon[inverse]) ** 2, minlength=n) / sizes
+
+    # Bounding boxes: sort once, then reduce over contiguous segments
+    order = np.argsort(inverse, kind='stable')
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    lat_sorted = lat[order]
+    lon_sorted = lon[order]
+
+    summary = pd.DataFrame({
+        'size': sizes.astype(int),
+        'centroid_lat': centroid_lat,
+        'centroid_lon': centroid_lon,
+        'lat_min': np.minimum.reduceat(lat_sorted, starts),
+        'lat_max': np.maximum.reduceat(lat_sorted, starts),
+        'lon_min': np.minimum.reduceat(lon_sorted, starts),
+        'lon_max': np.maximum.reduceat(lon_sorted, starts),
+        'spread_lat': np.sqrt(var_lat),
+        'spread_lon': np.sqrt(var_lon),
+        'radius_of_gyration': np.sqrt(var_lat + var_lon),
+    }, index=pd.Index(cluster_ids, name='cluster'))
+
+    return summary
+
+
 def calculate_quality_metrics(
     coords: np.ndarray, 
     labels: np.ndarray,
@@ -508,6 +934,308 @@ def calculate_quality_metrics(
     }
 
 
+# =============================================================================
+# CLUSTER INDEX
+# =============================================================================
+
+class ClusterIndex:
+    """
+    Rows of a clustered DataFrame grouped by cluster for O(1) slicing.
+
+    Rows are stably sorted by cluster once; cluster_ids[i] owns sorted rows
+    offsets[i]:offsets[i + 1]. Each cluster is then a contiguous slice of the
+    sorted frame (or of a sorted column array) instead of a boolean mask
+    over all N rows, so looping over K clusters costs O(N) instead of O(K·N).
+
+    Build it once after clustering and pass it to the map and temporal
+    functions that accept a cluster_index argument.
+    """
+
+    def __init__(self, df: pd.DataFrame, cluster_col: str = 'cluster'):
+        labels = df[cluster_col].to_numpy()
+        self.cluster_col = cluster_col
+        self.order = np.argsort(labels, kind='stable')
+        self.df = df.iloc[self.order]
+
+        self.cluster_ids, starts = np.unique(labels[self.order], return_index=True)
+        self.offsets = np.append(starts, len(labels))
+        self._positions = {cid: i for i, cid in enumerate(self.cluster_ids.tolist())}
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.cluster_ids)
+
+    def __contains__(self, cluster_id) -> bool:
+        return cluster_id in self._positions
+
+    def __iter__(self):
+        """Iterate (cluster_id, rows) pairs in cluster ID order."""
+        for i, cluster_id in enumerate(self.cluster_ids.tolist()):
+            yield cluster_id, self.df.iloc[self.offsets[i]:self.offsets[i + 1]]
+
+    @property
+    def sizes(self) -> pd.Series:
+        """Number of rows per cluster, indexed by cluster ID."""
+        return pd.Series(np.diff(self.offsets), index=self.cluster_ids, name='size')
+
+    def appearance_order(self) -> np.ndarray:
+        """Cluster IDs in order of first appearance in the original frame."""
+        first_rows = self.order[self.offsets[:-1]]
+        return self.cluster_ids[np.argsort(first_rows, kind='stable')]
+
+    def bounds(self, cluster_id) -> Tuple[int, int]:
+        """Start and end positions of a cluster in the sorted rows ((0, 0) if absent)."""
+        i = self._positions.get(cluster_id)
+        if i is None:
+            return 0, 0
+        return int(self.offsets[i]), int(self.offsets[i + 1])
+
+    def get(self, cluster_id) -> pd.DataFrame:
+        """Rows of one cluster (empty frame if the cluster does not exist)."""
+        start, end = self.bounds(cluster_id)
+        return self.df.iloc[start:end]
+
+    def values(self, column: str, cluster_id=None) -> np.ndarray:
+        """
+        Sorted values of a column, for all rows or one cluster.
+
+        The sorted column is materialized once and cached; per-cluster
+        results are views into it.
+        """
+        if column not in self._columns:
+            self._columns[column] = self.df[column].to_numpy()
+        if cluster_id is None:
+            return self._columns[column]
+        start, end = self.bounds(cluster_id)
+        return self._columns[column][start:end]
+
+
+# =============================================================================
+# REPRESENTATIVE PHOTOS
+# =============================================================================
+
+REPRESENTATIVE_METHODS = ['density', 'medoid', 'text']
+
+
+def select_representatives(
+    df: pd.DataFrame,
+    k: int = 10,
+    method: str = 'density',
+    cluster_descriptors: Optional[Dict] = None,
+    n_neighbors: int = 10
+) -> pd.DataFrame:
+    """
+    Select the top-k most representative photos of every cluster.
+    
+    Scores are computed for all photos at once, then a single lexsort by
+    (cluster, -score) ranks photos within their cluster:
+    - 'density': inverse distance to the n-th nearest photo (densest spots)
+    - 'medoid': closeness to the cluster centroid
+    - 'text': summed weights of the cluster's TF-IDF descriptor terms found
+      in the photo's tags and title
+    
+    Args:
+        df: DataFrame with 'lat', 'long' and 'cluster' columns (noise is skipped)
+        k: Number of photos per cluster
+        method: One of REPRESENTATIVE_METHODS
+        cluster_descriptors: For 'text': cluster ID -> list of terms or
+                             (term, score) tuples
+        n_neighbors: For 'density': neighbor rank used as density radius
+    
+    Returns:
+        Subset of df with 'rep_rank' (0 = best) and 'rep_score' columns,
+        ordered by cluster and rank
+    """
+    if method not in REPRESENTATIVE_METHODS:
+        raise ValueError(f"Unknown method: {method} (expected one of {REPRESENTATIVE_METHODS})")
+    
+    all_photos = df
+    clustered = (df['cluster'] != -1).to_numpy()
+    df = df[clustered]
+    if len(df) == 0:
+        return df.assign(rep_rank=pd.Series(dtype=int), rep_score=pd.Series(dtype=float))
+    
+    coords = df[['lat', 'long']].to_numpy(dtype=float)
+    cluster_ids, codes = np.unique(df['cluster'].to_numpy(), return_inverse=True)
+    codes = codes.ravel()
+    
+    if method == 'density':
+        n = min(n_neighbors + 1, len(coords))
+        distances, _ = cKDTree(coords).query(coords, k=n)
+        kth = distances[:, -1] if n > 1 else np.zeros(len(coords))
+        score = 1.0 / (kth + 1e-9)
+    elif method == 'medoid':
+        sizes = np.bincount(codes)
+        centroid_lat = np.bincount(codes, weights=coords[:, 0]) / sizes
+        centroid_lon = np.bincount(codes, weights=coords[:, 1]) / sizes
+        score = -np.hypot(coords[:, 0] - centroid_lat[codes], coords[:, 1] - centroid_lon[codes])
+    else:
+        score = _descriptor_match_scores(all_photos, clustered, cluster_ids, codes, cluster_descriptors)
+    
+    # One grouped pass: sort by cluster, then by descending score
+    order = np.lexsort((-score, codes))
+    starts = np.searchsorted(codes[order], np.arange(len(cluster_ids)))
+    rank = np.arange(len(order)) - starts[codes[order]]
+    keep = order[rank < k]
+    
+    result = df.iloc[keep].copy()
+    result['rep_rank'] = rank[rank < k]
+    result['rep_score'] = score[keep]
+    return result
+
+
+def _descriptor_match_scores(
+    df: pd.DataFrame,
+    clustered: np.ndarray,
+    cluster_ids: np.ndarray,
+    codes: np.ndarray,
+    cluster_descriptors: Optional[Dict]
+) -> np.ndarray:
+    """
+    Score each clustered photo by the descriptor terms of its own cluster it contains.
+    
+    Photo terms come from text_mining.build_photo_term_matrix over the union
+    of descriptor terms, i.e. the same cached tokens, stopwords and
+    within-photo bigrams as the TF-IDF descriptors. The binary photo × term
+    matrix is multiplied elementwise with each photo's cluster weights.
+    df is the full dataset (noise included) so the photo token cache is
+    shared with the text mining stage; clustered selects the scored rows.
+    """
+    from scipy.sparse import csr_matrix
+    from .text_mining import build_photo_term_matrix
+    
+    if not cluster_descriptors:
+        raise ValueError("method='text' requires cluster_descriptors")
+    
+    # Cluster x term weight matrix
+    rows, terms, weights = [], [], []
+    for code, cluster_id in enumerate(cluster_ids):
+        for item in cluster_descriptors.get(int(cluster_id), []):
+            term, weight = item if isinstance(item, (tuple, list)) else (item, 1.0)
+            rows.append(code)
+            terms.append(term)
+            weights.append(weight)
+    if not terms:
+        return np.zeros(len(codes))
+    vocabulary, cols = np.unique(np.array(terms, dtype=object), return_inverse=True)
+    term_weights = csr_matrix((weights, (rows, cols.ravel())), shape=(len(cluster_ids), len(vocabulary)))
+    
+    photo_terms, _ = build_photo_term_matrix(
+        df, ngram_range=(1, 2), photos=clustered, vocabulary=vocabulary
+    )
+    matches = (photo_terms[np.flatnonzero(clustered)] > 0).astype(np.float64)
+    
+    return np.asarray(matches.multiply(term_weights[codes]).sum(axis=1)).ravel()
+
+
+# =============================================================================
+# CLUSTER LABEL ALIGNMENT
+# =============================================================================
+
+def cluster_overlap(
+    labels: np.ndarray,
+    reference_labels: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the Jaccard overlap between two clusterings of the same points.
+    
+    Member overlaps are counted in a sparse contingency table (one entry per
+    co-occurring pair of labels), never an N×N co-membership matrix.
+    
+    Args:
+        labels: Cluster labels (-1 = noise)
+        reference_labels: Labels of the same points in the reference clustering
+    
+    Returns:
+        Tuple of (cluster IDs, reference cluster IDs, dense Jaccard matrix
+        of shape [n_clusters, n_reference_clusters])
+    """
+    labels = np.asarray(labels)
+    reference_labels = np.asarray(reference_labels)
+    
+    new_ids, new_sizes = np.unique(labels[labels != -1], return_counts=True)
+    ref_ids, ref_sizes = np.unique(reference_labels[reference_labels != -1], return_counts=True)
+    
+    both = (labels != -1) & (reference_labels != -1)
+    rows = np.searchsorted(new_ids, labels[both])
+    cols = np.searchsorted(ref_ids, reference_labels[both])
+    intersection = coo_matrix(
+        (np.ones(len(rows), dtype=np.int64), (rows, cols)),
+        shape=(len(new_ids), len(ref_ids))
+    ).tocsr()  # duplicates are summed
+    
+    intersection = intersection.toarray()
+    union = new_sizes[:, None] + ref_sizes[None, :] - intersection
+    jaccard = np.divide(intersection, union, out=np.zeros(union.shape), where=union > 0)
+    return new_ids, ref_ids, jaccard
+
+
+def align_cluster_labels(
+    labels: np.ndarray,
+    reference_labels: np.ndarray,
+    min_jaccard: float = 0.5
+) -> Tuple[np.ndarray, Dict]:
+    """
+    Relabel clusters so that they reuse the IDs of a previous run.
+    
+    New clusters are matched one-to-one to reference clusters by member
+    overlap (Hungarian assignment on the Jaccard matrix). Matches below
+    min_jaccard are rejected; unmatched clusters get fresh IDs above the
+    largest reference ID so that no old ID is silently reused.
+    
+    Args:
+        labels: Cluster labels from the current run (-1 = noise)
+        reference_labels: Labels of the same points in the previous run
+                          (-1 = noise or point absent from that run)
+        min_jaccard: Minimum Jaccard overlap for two clusters to share an ID
+    
+    Returns:
+        Tuple of (aligned labels, alignment info dict)
+    """
+    labels = np.asarray(labels)
+    new_ids, ref_ids, jaccard = cluster_overlap(labels, reference_labels)
+    
+    mapping = {}
+    matched = []
+    if len(new_ids) and len(ref_ids):
+        rows, cols = linear_sum_assignment(jaccard, maximize=True)
+        keep = jaccard[rows, cols] >= min_jaccard
+        matched = list(zip(rows[keep], cols[keep]))
+        for r, c in matched:
+            mapping[int(new_ids[r])] = int(ref_ids[c])
+    matched_ref = {int(ref_ids[c]) for _, c in matched}
+    
+    # Fresh IDs for unmatched clusters, in order of the original labels
+    next_id = int(ref_ids.max()) + 1 if len(ref_ids) else 0
+    new_clusters = []
+    for label in new_ids:
+        if int(label) not in mapping:
+            mapping[int(label)] = next_id
+            new_clusters.append(next_id)
+            next_id += 1
+    
+    # Vectorized relabel through the sorted new_ids
+    aligned = np.full(len(labels), -1, dtype=int)
+    clustered = labels != -1
+    lookup = np.array([mapping[int(label)] for label in new_ids], dtype=int)
+    aligned[clustered] = lookup[np.searchsorted(new_ids, labels[clustered])]
+    
+    info = {
+        'n_clusters': len(new_ids),
+        'n_reference_clusters': len(ref_ids),
+        'n_matched': len(matched),
+        'n_new': len(new_clusters),
+        'n_retired': len(ref_ids) - len(matched),
+        'min_jaccard': min_jaccard,
+        # Same member set as in the previous run: cached results still apply
+        'unchanged_clusters': sorted(int(ref_ids[c]) for r, c in matched if jaccard[r, c] == 1.0),
+        'new_clusters': new_clusters,
+        'retired_clusters': [int(c) for c in ref_ids if int(c) not in matched_ref],
+        'mapping': {str(k): v for k, v in sorted(mapping.items())}
+    }
+    return aligned, info
+
+
 # =============================================================================
 # COMPARISON UTILITIES
 # =============================================================================
@@ -557,6 +1285,7 @@ def compare_algorithms(
     dbscan_labels = run_dbscan(coords, **dbscan_params)
     dbscan_stats = get_cluster_stats(dbscan_labels)
     dbscan_metrics = calculate_quality_metrics(coords, dbscan_labels)
+    dbscan_summary = summarize_clusters(coords, dbscan_labels)
     results.append({
         'algorithm': 'DBSCAN',
         'parameters': f"eps={dbscan_params['eps']}, min_samples={dbscan_params['min_samples']}",
@@ -565,6 +1294,7 @@ def compare_algorithms(
         'largest_cluster': dbscan_stats['largest_cluster'],
         'largest_pct': round(dbscan_stats['largest_cluster'] / len(df) * 100, 1),
         'median_size': dbscan_stats['median_cluster_size'],
+        'median_radius': round(float(dbscan_summary['radius_of_gyration'].median()), 5) if len(dbscan_summary) else None,
         'silhouette': round(dbscan_metrics['silhouette'], 4) if dbscan_metrics.get('silhouette') else None,
         'davies_bouldin': round(dbscan_metrics['davies_bouldin'], 4) if dbscan_metrics.get('davies_bouldin') else None,
     })
@@ -576,6 +1306,7 @@ def compare_algorithms(
     kmeans_labels = run_kmeans(kmeans_coords, n_clusters=kmeans_k)
     kmeans_stats = get_cluster_stats(kmeans_labels)
     kmeans_metrics = calculate_quality_metrics(kmeans_coords, kmeans_labels)
+    kmeans_summary = summarize_clusters(coords, kmeans_labels)  # radius in degrees, not scaled units
     results.append({
         'algorithm': 'K-Means',
         'parameters': f"k={kmeans_k}, scaled={scale_for_kmeans}",
@@ -584,6 +1315,7 @@ def compare_algorithms(
         'largest_cluster': kmeans_stats['largest_cluster'],
         'largest_pct': round(kmeans_stats['largest_cluster'] / len(df) * 100, 1),
         'median_size': kmeans_stats['median_cluster_size'],
+        'median_radius': round(float(kmeans_summary['radius_of_gyration'].median()), 5),
         'silhouette': round(kmeans_metrics['silhouette'], 4) if kmeans_metrics.get('silhouette') else None,
         'davies_bouldin': round(kmeans_metrics['davies_bouldin'], 4) if kmeans_metrics.get('davies_bouldin') else None,
     })
@@ -605,6 +1337,7 @@ def compare_algorithms(
     hier_labels = hier_model.fit_predict(coords_hier)
     hier_stats = get_cluster_stats(hier_labels)
     hier_metrics = calculate_quality_metrics(coords_hier, hier_labels)
+    hier_summary = summarize_clusters(coords_hier, hier_labels)
     
     results.append({
         'algorithm': 'Hierarchical',
@@ -614,6 +1347,7 @@ def compare_algorithms(
         'largest_cluster': hier_stats['largest_cluster'],
         'largest_pct': round(hier_stats['largest_cluster'] / len(coords_hier) * 100, 1),
         'median_size': hier_stats['median_cluster_size'],
+        'median_radius': round(float(hier_summary['radius_of_gyration'].median()), 5),
         'silhouette': round(hier_metrics['silhouette'], 4) if hier_metrics.get('silhouette') else None,
         'davies_bouldin': round(hier_metrics['davies_bouldin'], 4) if hier_metrics.get('davies_bouldin') else None,
     })
@@ -733,6 +1467,7 @@ def run_parameter_sweep(
         
         # Get basic stats
         stats = get_cluster_stats(labels)
+        summary = summarize_clusters(coords, labels)
         
         # Get quality metrics
         metrics = calculate_quality_metrics(coords, labels)
@@ -745,6 +1480,7 @@ def run_parameter_sweep(
             'noise_pct': round(stats['noise_percentage'], 2),
             'largest_cluster_pct': round(stats['largest_cluster'] / len(labels) * 100, 1),
             'median_size': stats['median_cluster_size'],
+            'median_radius': round(float(summary['radius_of_gyration'].median()), 5) if len(summary) else None,
             'silhouette': round(metrics['silhouette'], 4) if metrics.get('silhouette') else None,
             'davies_bouldin': round(metrics['davies_bouldin'], 4) if metrics.get('davies_bouldin') else None,
         }
@@ -843,6 +1579,7 @@ def run_dbscan_grid_search(
             
             # Get statistics
             stats = get_cluster_stats(labels)
+            summary = summarize_clusters(coords, labels)
             
             # Get quality metrics (skip if too few clusters)
             metrics = calculate_quality_metrics(coords, labels)
@@ -857,6 +1594,7 @@ def run_dbscan_grid_search(
                 'largest_cluster_pct': round(stats['largest_cluster'] / len(labels) * 100, 2),
                 'median_size': stats['median_cluster_size'],
                 'mean_size': round(stats['mean_cluster_size'], 1),
+                'median_radius': round(float(summary['radius_of_gyration'].median()), 5) if len(summary) else None,
                 'silhouette': round(metrics['silhouette'], 4) if metrics.get('silhouette') else None,
                 'davies_bouldin': round(metrics['davies_bouldin'], 4) if metrics.get('davies_bouldin') else None,
                 'time_sec': round(total_time, 1)
@@ -11,6 +11,8 @@ from pathlib import Path
 from datetime import datetime
 from typing import Optional, Tuple, Dict, List
 import json
+import sqlite3
+from contextlib import closing
 
 # Project paths
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -19,7 +21,9 @@ REPORTS_DIR = PROJECT_ROOT / "reports"
 RAW_DATA_PATH = DATA_DIR / "flickr_data2.csv"
 CLEANED_DATA_PATH = DATA_DIR / "flickr_cleaned.parquet"  # Changed to Parquet
 CLEANED_CSV_PATH = DATA_DIR / "flickr_cleaned.csv"  # Keep CSV fallback
+CLEANED_PARTITIONED_DIR = DATA_DIR / "flickr_cleaned_partitioned"  # Optional Hive layout
 CLEANING_LOG_PATH = REPORTS_DIR / "cleaning_log.json"
+PHOTO_DB_PATH = DATA_DIR / "flickr_photos.sqlite"  # Optional SQLite query store
 
 # Lyon bounding box options
 # Original: Large area including suburbs (~1400 km²)
@@ -61,6 +65,29 @@ GPS_VALID_RANGE = {
     "lon_max": 180.0
 }
 
+# Parquet layout: rows in Morton (Z-order) of lat/long, written in row groups
+# of this size so each group covers a compact area and bbox reads skip the rest
+PARQUET_ROW_GROUP_SIZE = 20_000
+MORTON_BITS = 16  # grid resolution per axis (2^16 cells)
+
+# Optional Hive partitioning of the cleaned data (year=YYYY[/month=M] directories)
+PARTITION_SCHEMES = {
+    "year": ["year"],
+    "year_month": ["year", "month"],
+}
+
+# Burst collapsing: consecutive same-user photos closer than this form one visit
+VISIT_MAX_DISTANCE = 0.0005  # degrees (~50m)
+VISIT_MAX_GAP_MINUTES = 10
+
+# Per-user contribution cap: photos kept per user in each grid cell
+USER_CAP_PER_CELL = 5
+USER_CAP_CELL_SIZE = 0.001  # degrees (~100m)
+
+# Users active for less than this many days are tourists, others residents
+TOURIST_MAX_DAYS = 30
+USER_TYPES = ['tourist', 'resident', 'unknown']
+
 
 class CleaningLog:
     """Log cleaning steps and track dropped rows with reasons."""
@@ -153,48 +180,250 @@ def load_raw_data(nrows: Optional[int] = None) -> pd.DataFrame:
     return df
 
 
-def load_cleaned_data() -> pd.DataFrame:
+def _spread_bits(x: np.ndarray) -> np.ndarray:
+    """Insert a zero bit between each of the low 16 bits of x."""
+    x = x.astype(np.uint64) & np.uint64(0xFFFF)
+    x = (x | (x << np.uint64(8))) & np.uint64(0x00FF00FF)
+    x = (x | (x << np.uint64(4))) & np.uint64(0x0F0F0F0F)
+    x = (x | (x << np.uint64(2))) & np.uint64(0x33333333)
+    x = (x | (x << np.uint64(1))) & np.uint64(0x55555555)
+    return x
+
+
+def morton_key(df: pd.DataFrame, bits: int = MORTON_BITS) -> np.ndarray:
+    """
+    Compute the Morton (Z-order) key of each row's coordinates.
+
+    Coordinates are quantized to a 2^bits grid over the data's bounding
+    box and their bits interleaved, so rows close in the key order are
+    close in space.
+
+    Args:
+        df: DataFrame with 'lat' and 'long' columns
+        bits: Grid resolution per axis (at most 16)
+
+    Returns:
+        Array of uint64 keys
+    """
+    keys = []
+    for col in ['long', 'lat']:
+        values = df[col].to_numpy(dtype=float)
+        lo, hi = np.nanmin(values), np.nanmax(values)
+        scaled = (values - lo) / (hi - lo) if hi > lo else np.zeros_like(values)
+        cells = np.nan_to_num(scaled * (2 ** bits - 1)).astype(np.uint64)
+        keys.append(_spread_bits(cells))
+    return keys[0] | (keys[1] << np.uint64(1))
+
+
+def _morton_row_groups(keys: np.ndarray, max_rows: int, bits: int = MORTON_BITS) -> np.ndarray:
+    """
+    Split sorted Morton keys into row groups aligned on quadtree cells.
+
+    A cell (rows sharing a key prefix) with more than max_rows rows is split
+    into its four children; consecutive small cells are then merged while
+    they fit. Groups follow cell borders instead of cutting the curve at
+    fixed counts, where a Z-order jump would give a group a huge bbox.
+
+    Returns:
+        Row offsets of the groups (first 0, last len(keys))
+    """
+    cells = [(0, len(keys), 2 * bits)]  # (start, end, bits left below the prefix)
+    leaves = []
+    while cells:
+        start, end, shift = cells.pop()
+        if end - start <= max_rows or shift == 0:
+            leaves.append((start, end))
+            continue
+        shift -= 2
+        prefix = keys[start] >> np.uint64(shift + 2) << np.uint64(2)
+        bounds = np.searchsorted(
+            keys[start:end] >> np.uint64(shift),
+            prefix + np.arange(1, 4, dtype=np.uint64)
+        ) + start
+        edges = [start, *bounds.tolist(), end]
+        # Children pushed in reverse so they are popped in key order
+        for child_start, child_end in reversed(list(zip(edges[:-1], edges[1:]))):
+            if child_end > child_start:
+                cells.append((child_start, child_end, shift))
+
+    offsets = [0]
+    for start, end in leaves:
+        if end - offsets[-1] > max_rows and start > offsets[-1]:
+            offsets.append(start)
+    offsets.append(len(keys))
+    return np.array(offsets)
+
+
+def save_spatial_parquet(
+    df: pd.DataFrame,
+    path: Path = CLEANED_DATA_PATH,
+    row_group_size: int = PARQUET_ROW_GROUP_SIZE
+) -> Path:
+    """
+    Save a DataFrame to Parquet in Morton order of its coordinates.
+
+    Row groups hold at most row_group_size rows and are cut on quadtree
+    cell borders, so each covers a compact area and its lat/long min/max
+    statistics let bbox reads (see load_cleaned_data) skip every group
+    outside the box. Downstream stages also see spatial neighbors in
+    neighboring rows, which helps cache locality in clustering.
+
+    Args:
+        df: DataFrame with 'lat' and 'long' columns
+        path: Output Parquet path
+        row_group_size: Maximum rows per row group
+
+    Returns:
+        Path to saved file
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    keys = morton_key(df)
+    order = np.argsort(keys, kind='stable')
+    offsets = _morton_row_groups(keys[order], row_group_size)
+
+    table = pa.Table.from_pandas(df.iloc[order], preserve_index=False)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with pq.ParquetWriter(path, table.schema, write_statistics=True) as writer:
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            writer.write_table(table.slice(start, end - start), row_group_size=row_group_size)
+    return path
+
+
+def save_partitioned_parquet(
+    df: pd.DataFrame,
+    root: Path = CLEANED_PARTITIONED_DIR,
+    partition_by: str = "year"
+) -> Path:
+    """
+    Save a DataFrame as a Hive-partitioned Parquet dataset by capture date.
+
+    Partition directories (year=2012/month=12/...) are keyed on copies of
+    date_taken_year / date_taken_month, so the files keep every original
+    column. Rows stay in Morton order within each partition. Any existing
+    dataset at root is replaced.
+
+    Args:
+        df: Cleaned DataFrame with date_taken_year/date_taken_month columns
+        root: Dataset directory
+        partition_by: 'year' or 'year_month' (see PARTITION_SCHEMES)
+
+    Returns:
+        Path to the dataset directory
+    """
+    import shutil
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if partition_by not in PARTITION_SCHEMES:
+        raise ValueError(f"Unknown partition scheme: {partition_by}")
+    partition_cols = PARTITION_SCHEMES[partition_by]
+
+    order = np.argsort(morton_key(df), kind='stable')
+    df = df.iloc[order].assign(
+        year=df['date_taken_year'].values[order].astype(int),
+        month=df['date_taken_month'].values[order].astype(int)
+    )[list(df.columns) + partition_cols]
+
+    root = Path(root)
+    if root.exists():
+        shutil.rmtree(root)
+    pq.write_to_dataset(
+        pa.Table.from_pandas(df, preserve_index=False),
+        root_path=str(root),
+        partition_cols=partition_cols,
+        row_group_size=PARQUET_ROW_GROUP_SIZE
+    )
+    return root
+
+
+def load_cleaned_data(bbox=None, years=None, months=None) -> pd.DataFrame:
     """
     Load the cleaned dataset from Parquet cache (preferred) or CSV fallback.
     Falls back to raw data if no cache exists.
     
+    When years or months are given and the partitioned dataset exists
+    (see save_partitioned_parquet) and is not older than the single Parquet
+    file, only the matching partition directories are read; otherwise the
+    single Parquet file is filtered on read.
+    
+    Args:
+        bbox: Optional area to load: a LYON_BBOX_OPTIONS name ('large',
+              'metro', 'center') or a dict with lat_min/lat_max/lon_min/lon_max.
+              With the Parquet cache, row groups outside it are not read.
+        years: Optional list of capture years to load
+        months: Optional list of capture months (1-12) to load
+    
     Returns:
         DataFrame with cleaned photo data
     """
+    if isinstance(bbox, str):
+        bbox = LYON_BBOX_OPTIONS[bbox]
+    
+    filters = []
+    if bbox is not None:
+        filters += [
+            ('lat', '>=', bbox['lat_min']), ('lat', '<=', bbox['lat_max']),
+            ('long', '>=', bbox['lon_min']), ('long', '<=', bbox['lon_max']),
+        ]
+    if years is not None:
+        filters.append(('date_taken_year', 'in', [int(y) for y in years]))
+    if months is not None:
+        filters.append(('date_taken_month', 'in', [int(m) for m in months]))
+    
+    partitions_current = CLEANED_PARTITIONED_DIR.exists() and (
+        not CLEANED_DATA_PATH.exists()
+        or CLEANED_PARTITIONED_DIR.stat().st_mtime >= CLEANED_DATA_PATH.stat().st_mtime
+    )
+    if (years is not None or months is not None) and partitions_current:
+        # Filters on partition keys prune whole directories
+        if years is not None:
+            filters.append(('year', 'in', [int(y) for y in years]))
+        if months is not None and any(CLEANED_PARTITIONED_DIR.glob('year=*/month=*')):
+            filters.append(('month', 'in', [int(m) for m in months]))
+        df = pd.read_parquet(CLEANED_PARTITIONED_DIR, engine='pyarrow', filters=filters)
+        return df.drop(columns=[c for c in ['year', 'month'] if c in df.columns])
+    
     if CLEANED_DATA_PATH.exists():
-        return pd.read_parquet(CLEANED_DATA_PATH)
+        return pd.read_parquet(CLEANED_DATA_PATH, engine='pyarrow', filters=filters or None)
     elif CLEANED_CSV_PATH.exists():
         print("Warning: Parquet cache not found, loading from CSV...")
-        return pd.read_csv(CLEANED_CSV_PATH)
+        df = pd.read_csv(CLEANED_CSV_PATH)
     else:
         print("Warning: Cleaned data not found, loading raw data...")
-        return load_raw_data()
+        df = load_raw_data()
+    
+    if bbox is not None:
+        df = df[df['lat'].between(bbox['lat_min'], bbox['lat_max']) &
+                df['long'].between(bbox['lon_min'], bbox['lon_max'])]
+    if years is not None:
+        df = df[df['date_taken_year'].isin(years)]
+    if months is not None:
+        df = df[df['date_taken_month'].isin(months)]
+    return df
 
 
 def create_datetime_column(df: pd.DataFrame, prefix: str = "date_taken") -> pd.Series:
     """
     Create a datetime column from component columns.
     
+    Built in one vectorized pass; rows with missing or impossible
+    components (e.g. February 30th) become NaT.
+    
     Args:
         df: DataFrame with date component columns
         prefix: Column prefix ('date_taken' or 'date_upload')
     
     Returns:
-        Series of datetime objects
+        Series of datetime64 values
     """
-    def safe_datetime(row):
-        try:
-            return datetime(
-                int(row[f'{prefix}_year']),
-                int(row[f'{prefix}_month']),
-                int(row[f'{prefix}_day']),
-                int(row[f'{prefix}_hour']),
-                int(row[f'{prefix}_minute'])
-            )
-        except (ValueError, TypeError):
-            return pd.NaT
-    
-    return df.apply(safe_datetime, axis=1)
+    components = pd.DataFrame({
+        unit: pd.to_numeric(df[f'{prefix}_{unit}'], errors='coerce')
+        for unit in ['year', 'month', 'day', 'hour', 'minute']
+    }, index=df.index)
+    return pd.to_datetime(components, errors='coerce')
 
 
 def validate_gps_coordinates(df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
@@ -363,6 +592,328 @@ def remove_duplicates(df: pd.DataFrame, subset: Optional[list] = None) -> Tuple[
     return df_clean, removed
 
 
+def _join_visit_text(
+    column: pd.Series,
+    visit: np.ndarray,
+    first_idx: np.ndarray,
+    split: bool = False
+) -> pd.Series:
+    """
+    Merge a text column per visit, keeping each distinct value once.
+
+    Single-photo visits keep their own value; only multi-photo visits are joined.
+    With split, values are comma-separated lists (tags) deduplicated item by item.
+    """
+    text = column.iloc[first_idx].reset_index(drop=True)
+    multi = np.bincount(visit)[visit] > 1
+    if multi.any():
+        parts = pd.DataFrame({'visit': visit[multi], 'text': column.values[multi]})
+        parts = parts[parts['text'].notna()]
+        if split:
+            parts = parts.assign(text=parts['text'].astype(str).str.split(',')).explode('text')
+        parts = parts[parts['text'].astype(str).str.strip() != '']
+        parts = parts.drop_duplicates()
+        joined = parts.groupby('visit', sort=True)['text'].agg(','.join)
+        text.loc[joined.index] = joined.values
+    return text
+
+
+def build_visits(
+    df: pd.DataFrame,
+    max_distance: float = VISIT_MAX_DISTANCE,
+    max_gap_minutes: float = VISIT_MAX_GAP_MINUTES
+) -> pd.DataFrame:
+    """
+    Collapse photo bursts into visits: one record per user, place and moment.
+
+    Photos are sorted by (user, capture time). A photo joins the previous
+    photo's visit if it is from the same user, taken at most max_gap_minutes
+    later and at most max_distance away; otherwise it starts a new visit.
+    Visit IDs are the cumulative sum of these breaks, so the whole pass is
+    vectorized. Photos without a capture time or user stay single visits.
+
+    Later stages count each visit once: n_photos is informational (how big
+    the burst was) and no clustering, text or temporal step weights by it,
+    since that would bring back the burst density visits are meant to remove.
+
+    Args:
+        df: Cleaned photo DataFrame
+        max_distance: Maximum distance between consecutive photos (in degrees)
+                      0.0005 degrees ≈ ~50m at Lyon's latitude
+        max_gap_minutes: Maximum time between consecutive photos (in minutes)
+
+    Returns:
+        DataFrame with one row per visit and the same columns as df: the
+        visit's first photo (id, user, dates), mean lat/long, merged distinct
+        tags and titles, plus an n_photos column (photos in the visit)
+    """
+    n = len(df)
+    if n == 0:
+        return df.assign(n_photos=pd.Series(dtype=int))
+
+    taken = create_datetime_column(df)
+    has_time = taken.notna().values
+    minutes = taken.values.astype('datetime64[m]').astype(np.int64)
+    user_codes = pd.factorize(df['user'])[0]
+
+    order = np.lexsort((minutes, user_codes))
+    u, t, ok = user_codes[order], minutes[order], has_time[order]
+    lat = df['lat'].values[order].astype(float)
+    lon = df['long'].values[order].astype(float)
+
+    # A photo continues the previous visit only if every condition holds
+    same_visit = np.zeros(n, dtype=bool)
+    same_visit[1:] = (
+        (u[1:] == u[:-1]) & (u[1:] != -1)
+        & ok[1:] & ok[:-1]
+        & (t[1:] - t[:-1] <= max_gap_minutes)
+        & (np.hypot(lat[1:] - lat[:-1], lon[1:] - lon[:-1]) <= max_distance)
+    )
+    visit = np.cumsum(~same_visit) - 1
+    first_idx = np.flatnonzero(~same_visit)
+    n_photos = np.bincount(visit)
+
+    sorted_df = df.iloc[order]
+    visits = sorted_df.iloc[first_idx].reset_index(drop=True)
+    visits['lat'] = np.bincount(visit, weights=lat) / n_photos
+    visits['long'] = np.bincount(visit, weights=lon) / n_photos
+    for col in ['tags', 'title']:
+        if col in df.columns:
+            visits[col] = _join_visit_text(sorted_df[col], visit, first_idx, split=(col == 'tags'))
+    visits['n_photos'] = n_photos
+
+    return visits
+
+
+def cap_user_contributions(
+    df: pd.DataFrame,
+    max_per_cell: int = USER_CAP_PER_CELL,
+    cell_size: float = USER_CAP_CELL_SIZE
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Keep at most max_per_cell photos per user in each grid cell.
+
+    Heavy uploaders otherwise create dense clusters that are one person's
+    street or garden. After capping, a cell's density reflects how many
+    distinct users photograph it. Each user's earliest photos in a cell are
+    kept; photos without a capture time rank last, in dataset order.
+
+    Args:
+        df: Photo (or visit) DataFrame
+        max_per_cell: Maximum photos kept per (user, cell)
+        cell_size: Grid cell size (in degrees)
+                   0.001 degrees ≈ ~100m at Lyon's latitude
+
+    Returns:
+        Tuple of (capped DataFrame, number of photos removed)
+    """
+    taken = create_datetime_column(df)
+    cell_lat = np.floor(df['lat'].values / cell_size).astype(np.int64)
+    cell_lon = np.floor(df['long'].values / cell_size).astype(np.int64)
+
+    # Rank of each photo within its (user, cell) group, earliest first
+    order = np.argsort(taken.values, kind='stable')
+    keys = pd.DataFrame({
+        'user': df['user'].values[order],
+        'cell_lat': cell_lat[order],
+        'cell_lon': cell_lon[order],
+    })
+    rank = np.empty(len(df), dtype=np.int64)
+    rank[order] = keys.groupby(['user', 'cell_lat', 'cell_lon'], sort=False, dropna=False).cumcount().values
+
+    df_capped = df[rank < max_per_cell]
+    removed = len(df) - len(df_capped)
+
+    return df_capped, removed
+
+
+def compute_user_profiles(
+    df: pd.DataFrame,
+    tourist_max_days: float = TOURIST_MAX_DAYS
+) -> pd.DataFrame:
+    """
+    Compute per-user activity profiles in one grouped pass.
+
+    A user is a tourist if their activity span in the dataset (last minus
+    first capture date) is under tourist_max_days, a resident otherwise;
+    users without any valid capture date are 'unknown'.
+
+    Args:
+        df: Photo DataFrame with 'user' and date_taken_* columns
+        tourist_max_days: Span threshold (in days) below which a user is a tourist
+
+    Returns:
+        DataFrame indexed by user with columns: first_taken, last_taken,
+        span_days, active_days, n_photos, user_type
+    """
+    taken = create_datetime_column(df)
+    profiles = pd.DataFrame({
+        'user': df['user'].values,
+        'taken': taken.values,
+        'day': taken.dt.floor('D').values,
+    }).groupby('user', sort=False).agg(
+        first_taken=('taken', 'min'),
+        last_taken=('taken', 'max'),
+        active_days=('day', 'nunique'),
+        n_photos=('taken', 'size'),
+    )
+
+    profiles['span_days'] = (profiles['last_taken'] - profiles['first_taken']) / pd.Timedelta(days=1)
+    profiles['user_type'] = np.where(
+        profiles['span_days'].isna(), 'unknown',
+        np.where(profiles['span_days'] < tourist_max_days, 'tourist', 'resident')
+    )
+
+    return profiles[['first_taken', 'last_taken', 'span_days', 'active_days', 'n_photos', 'user_type']]
+
+
+def tag_user_types(
+    df: pd.DataFrame,
+    tourist_max_days: float = TOURIST_MAX_DAYS
+) -> pd.DataFrame:
+    """
+    Tag every photo with its user's type ('tourist', 'resident' or 'unknown').
+
+    Args:
+        df: Photo DataFrame
+        tourist_max_days: Span threshold passed to compute_user_profiles
+
+    Returns:
+        Copy of df with a 'user_type' column
+    """
+    profiles = compute_user_profiles(df, tourist_max_days=tourist_max_days)
+    df = df.copy()
+    df['user_type'] = df['user'].map(profiles['user_type']).fillna('unknown').values
+    return df
+
+
+def export_to_sqlite(df: pd.DataFrame, db_path: Path = PHOTO_DB_PATH) -> Path:
+    """
+    Export photos to a local SQLite database for ad-hoc queries.
+
+    Creates:
+    - photos: every column of df plus 'taken' (ISO capture time, indexed);
+      'cluster' is indexed too when present
+    - photos_rtree: R*Tree over (lat, long) keyed by photos.rowid
+    - photos_fts: FTS5 index over tags and title (diacritics folded, so
+      'fourviere' matches 'Fourvière')
+
+    Any existing database at db_path is replaced.
+
+    Args:
+        df: Cleaned (optionally clustered) photo DataFrame
+        db_path: Database file path
+
+    Returns:
+        Path to the database
+    """
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    if db_path.exists():
+        db_path.unlink()
+
+    photos = df.reset_index(drop=True)
+    photos['taken'] = create_datetime_column(photos).dt.strftime('%Y-%m-%d %H:%M:%S')
+    if 'tags' not in photos.columns:
+        photos['tags'] = None
+    if 'title' not in photos.columns:
+        photos['title'] = None
+
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        photos.to_sql('photos', conn, index=False, chunksize=50_000)
+        conn.execute('CREATE INDEX idx_photos_taken ON photos(taken)')
+        if 'cluster' in photos.columns:
+            conn.execute('CREATE INDEX idx_photos_cluster ON photos(cluster)')
+
+        conn.execute('CREATE VIRTUAL TABLE photos_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon)')
+        conn.execute(
+            'INSERT INTO photos_rtree SELECT rowid, lat, lat, long, long FROM photos '
+            'WHERE lat IS NOT NULL AND long IS NOT NULL'
+        )
+
+        conn.execute(
+            "CREATE VIRTUAL TABLE photos_fts USING fts5("
+            "tags, title, content='photos', content_rowid='rowid', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        conn.execute("INSERT INTO photos_fts(photos_fts) VALUES('rebuild')")
+
+    return db_path
+
+
+def query_photos(
+    bbox=None,
+    start=None,
+    end=None,
+    text: Optional[str] = None,
+    cluster: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    db_path: Path = PHOTO_DB_PATH,
+    raw_fts: bool = False
+) -> pd.DataFrame:
+    """
+    Query the SQLite photo store (see export_to_sqlite).
+
+    Filters combine with AND; the bbox goes through the R*Tree and the text
+    through FTS5, so only matching rows are read from disk.
+
+    Args:
+        bbox: LYON_BBOX_OPTIONS name or dict with lat_min/lat_max/lon_min/lon_max
+        start: Earliest capture time (inclusive), anything pd.Timestamp accepts
+        end: Latest capture time (exclusive)
+        text: Words to find in tags or title (e.g. 'fourviere', 'part-dieu');
+              every word must match. Each word is quoted as an FTS5 string,
+              so '-' or "'" inside a tag are not read as query syntax
+        cluster: Only photos of this cluster (requires a clustered export)
+        columns: Columns to return (default: all)
+        limit: Maximum number of rows
+        db_path: Database file path
+        raw_fts: Pass text to FTS5 MATCH unquoted, for operator syntax
+                 (e.g. 'lumieres OR lumiere', 'fourv*')
+
+    Returns:
+        DataFrame of matching photos
+    """
+    if isinstance(bbox, str):
+        bbox = LYON_BBOX_OPTIONS[bbox]
+
+    select = ', '.join(f'p."{c}"' for c in columns) if columns else 'p.*'
+    sql = [f'SELECT {select} FROM photos p']
+    where, params = [], []
+
+    if bbox is not None:
+        # The R*Tree stores float32 boxes rounded outwards, so it only serves
+        # as an overlap pre-filter; the exact test runs on the double columns
+        bounds = [bbox['lat_min'], bbox['lat_max'], bbox['lon_min'], bbox['lon_max']]
+        sql.append('JOIN photos_rtree r ON r.id = p.rowid')
+        where += ['r.max_lat >= ?', 'r.min_lat <= ?', 'r.max_lon >= ?', 'r.min_lon <= ?']
+        where += ['p.lat >= ?', 'p.lat <= ?', 'p.long >= ?', 'p.long <= ?']
+        params += bounds + bounds
+    if text and not raw_fts:
+        text = ' '.join('"' + term.replace('"', '""') + '"' for term in text.split())
+    if text:
+        where.append('p.rowid IN (SELECT rowid FROM photos_fts WHERE photos_fts MATCH ?)')
+        params.append(text)
+    if start is not None:
+        where.append('p.taken >= ?')
+        params.append(pd.Timestamp(start).strftime('%Y-%m-%d %H:%M:%S'))
+    if end is not None:
+        where.append('p.taken < ?')
+        params.append(pd.Timestamp(end).strftime('%Y-%m-%d %H:%M:%S'))
+    if cluster is not None:
+        where.append('p.cluster = ?')
+        params.append(int(cluster))
+
+    if where:
+        sql.append('WHERE ' + ' AND '.join(where))
+    if limit is not None:
+        sql.append(f'LIMIT {int(limit)}')
+
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        return pd.read_sql_query(' '.join(sql), conn, params=params)
+
+
 def get_data_stats(df: pd.DataFrame) -> dict:
     """
     Calculate summary statistics for the dataset.
@@ -394,7 +945,8 @@ def load_and_clean_data(
     bbox_type: str = "large",
     save_cache: bool = True,
     save_log: bool = True,
-    verbose: bool = True
+    verbose: bool = True,
+    partition_by: Optional[str] = None
 ) -> pd.DataFrame:
     """
     Load raw data and apply all cleaning steps with detailed logging.
@@ -406,12 +958,17 @@ def load_and_clean_data(
     4. Remove duplicate photos (by id)
     5. Optionally filter to Lyon bounding box
     
+    Every remaining photo is then tagged with its user's type
+    ('tourist' / 'resident', see compute_user_profiles).
+    
     Args:
         filter_bbox: Whether to filter to Lyon area (default: True)
         bbox_type: Bbox size - 'large', 'metro', or 'center' (default: 'large')
         save_cache: Whether to save cleaned data to Parquet (default: True)
         save_log: Whether to save cleaning log (default: True)
         verbose: Whether to print progress (default: True)
+        partition_by: Also save a Hive-partitioned dataset by 'year' or
+                      'year_month' (default: None, single file only)
     
     Returns:
         Cleaned DataFrame ready for analysis
@@ -505,17 +1062,34 @@ def load_and_clean_data(
     
     log.set_final(len(df))
     
+    # Tag users as tourists/residents so later stages can filter without regrouping
+    df = tag_user_types(df)
+    if verbose:
+        counts = df['user_type'].value_counts()
+        print(f"\n[TAG] User types: " + ", ".join(f"{t}: {counts.get(t, 0):,} photos" for t in USER_TYPES))
+    
     # Save to Parquet cache
     if save_cache:
         if verbose:
             print("\n[SAVE] Saving cleaned data...")
         
-        # Save to Parquet (primary - fast)
-        DATA_DIR.mkdir(parents=True, exist_ok=True)
-        df.to_parquet(CLEANED_DATA_PATH, index=False)
+        # Save to Parquet (primary - fast), Morton-ordered for bbox pruning
+        save_spatial_parquet(df, CLEANED_DATA_PATH)
         if verbose:
             print(f"       Parquet: {CLEANED_DATA_PATH}")
         
+        # Optional partitioned copy for date-restricted reads
+        if partition_by:
+            save_partitioned_parquet(df, CLEANED_PARTITIONED_DIR, partition_by=partition_by)
+            if verbose:
+                print(f"       Partitioned ({partition_by}): {CLEANED_PARTITIONED_DIR}")
+        elif CLEANED_PARTITIONED_DIR.exists():
+            # A partition set from an earlier cleaning would be stale
+            import shutil
+            shutil.rmtree(CLEANED_PARTITIONED_DIR)
+            if verbose:
+                print(f"       Removed stale partitioned data: {CLEANED_PARTITIONED_DIR}")
+        
         # Also save to CSV (backup - portable)
         df.to_csv(CLEANED_CSV_PATH, index=False)
         if verbose:
@@ -12,6 +12,7 @@ import numpy as np
 import json
 
 from .data_loader import load_cleaned_data, load_and_clean_data, LYON_BBOX, PROJECT_ROOT
+from .clustering import ClusterIndex, summarize_clusters, select_representatives
 
 # Output paths
 APP_DIR = PROJECT_ROOT / "app"
@@ -238,6 +239,7 @@ def load_cluster_names() -> dict:
         - 'name': auto-generated cluster name
         - 'method': naming method used (association_rule, tfidf, frequent_itemset, fallback)
         - 'top_tfidf_terms': list of top TF-IDF terms
+        - 'stability': bootstrap stability score (None if not computed)
     """
     # Try cluster_names.json first (combined output)
     names_path = REPORTS_DIR / "cluster_names.json"
@@ -262,13 +264,15 @@ def load_cluster_names() -> dict:
                 result[cluster_id] = {
                     'name': info.get('name', f'Cluster {cluster_id}'),
                     'method': info.get('method', info.get('naming_method', 'unknown')),
-                    'top_tfidf_terms': info.get('top_tfidf_terms', [])
+                    'top_tfidf_terms': info.get('top_tfidf_terms', []),
+                    'stability': info.get('stability')
                 }
             else:
                 result[cluster_id] = {
                     'name': f'Cluster {cluster_id}',
                     'method': 'fallback',
-                    'top_tfidf_terms': []
+                    'top_tfidf_terms': [],
+                    'stability': None
                 }
         
         return result
@@ -311,7 +315,8 @@ def add_cluster_polygons(
     min_cluster_size: int = 10,
     cluster_colors: Optional[List[str]] = None,
     cluster_descriptors: Optional[dict] = None,
-    cluster_names: Optional[dict] = None
+    cluster_names: Optional[dict] = None,
+    cluster_index: Optional[ClusterIndex] = None
 ) -> folium.Map:
     """
     Add convex hull polygons for each cluster to the map.
@@ -325,6 +330,7 @@ def add_cluster_polygons(
         cluster_colors: Optional list of colors for clusters
         cluster_descriptors: Optional dict mapping cluster ID to list of top terms
         cluster_names: Optional dict mapping cluster ID to name info
+        cluster_index: Prebuilt ClusterIndex of df (built if None)
     
     Returns:
         Map with cluster polygons added
@@ -334,6 +340,9 @@ def add_cluster_polygons(
     if 'cluster' not in df.columns:
         raise ValueError("DataFrame must have 'cluster' column")
     
+    if cluster_index is None:
+        cluster_index = ClusterIndex(df)
+    
     # Load descriptors and names if not provided
     if cluster_descriptors is None:
         cluster_descriptors = load_cluster_descriptors()
@@ -358,7 +367,7 @@ def add_cluster_polygons(
     polygon_group = folium.FeatureGroup(name="Cluster Areas")
     
     for cluster_id in valid_clusters:
-        cluster_df = df[df['cluster'] == cluster_id]
+        cluster_df = cluster_index.get(cluster_id)
         cluster_size = len(cluster_df)
         
         # Get coordinates
@@ -453,23 +462,30 @@ def add_cluster_markers(
     df: pd.DataFrame,
     min_cluster_size: int = 10,
     show_noise: bool = False,
-    sample_per_cluster: int = 200,
+    sample_per_cluster: int = 25,
     cluster_colors: Optional[List[str]] = None,
     cluster_descriptors: Optional[dict] = None,
-    cluster_names: Optional[dict] = None
+    cluster_names: Optional[dict] = None,
+    representative_method: str = 'density',
+    cluster_index: Optional[ClusterIndex] = None
 ) -> folium.Map:
     """
     Add color-coded cluster markers to the map.
     
+    Each cluster shows its most representative photos rather than a
+    random sample (see clustering.select_representatives).
+    
     Args:
         m: Folium Map object
         df: DataFrame with photo data (must have 'cluster' column)
         min_cluster_size: Minimum cluster size to display
         show_noise: Whether to show noise points (cluster=-1)
-        sample_per_cluster: Max points to show per cluster (for performance)
+        sample_per_cluster: Representative photos to show per cluster
         cluster_colors: Optional list of colors for clusters
         cluster_descriptors: Optional dict mapping cluster ID to list of top terms
         cluster_names: Optional dict mapping cluster ID to name info
+        representative_method: 'density', 'medoid' or 'text' (descriptor matches)
+        cluster_index: Prebuilt ClusterIndex of df (built if None)
     
     Returns:
         Map with cluster markers added
@@ -477,6 +493,9 @@ def add_cluster_markers(
     if 'cluster' not in df.columns:
         raise ValueError("DataFrame must have 'cluster' column")
     
+    if cluster_index is None:
+        cluster_index = ClusterIndex(df)
+    
     # Load descriptors and names if not provided
     if cluster_descriptors is None:
         cluster_descriptors = load_cluster_descriptors()
@@ -498,9 +517,18 @@ def add_cluster_markers(
     color_map = {c: cluster_colors[i % len(cluster_colors)] for i, c in enumerate(valid_clusters)}
     color_map[-1] = '#888888'  # Gray for noise
     
+    # Representative photos for all clusters in one grouped pass
+    representatives = select_representatives(
+        df[df['cluster'].isin(valid_clusters)],
+        k=sample_per_cluster,
+        method=representative_method,
+        cluster_descriptors=cluster_descriptors
+    )
+    representatives_by_cluster = dict(tuple(representatives.groupby('cluster')))
+    
     # Create feature groups for each cluster
     for cluster_id in valid_clusters:
-        cluster_df = df[df['cluster'] == cluster_id]
+        cluster_df = cluster_index.get(cluster_id)
         cluster_size = len(cluster_df)
         
         # Get cluster name (loader converts to int keys)
@@ -524,9 +552,8 @@ def add_cluster_markers(
         else:
             date_range = "Unknown"
         
-        # Sample if too many points
-        if len(cluster_df) > sample_per_cluster:
-            cluster_df = cluster_df.sample(n=sample_per_cluster, random_state=42)
+        # Most representative photos only
+        cluster_df = representatives_by_cluster.get(cluster_id, cluster_df.iloc[:0])
         
         # Use cluster name in group name
         import html
@@ -582,7 +609,7 @@ def add_cluster_markers(
     
     # Add noise points if requested
     if show_noise and -1 in df['cluster'].values:
-        noise_df = df[df['cluster'] == -1]
+        noise_df = cluster_index.get(-1)
         noise_count = len(noise_df)
         
         if len(noise_df) > sample_per_cluster:
@@ -697,13 +724,18 @@ def add_cluster_summary_panel(
     if cluster_descriptors is None:
         cluster_descriptors = load_cluster_descriptors()
     
-    # Get cluster statistics
-    cluster_stats = df[df['cluster'] != -1].groupby('cluster').agg({
-        'lat': 'mean',
-        'long': 'mean',
-        'date_taken_year': ['min', 'max', 'count']
-    }).reset_index()
-    cluster_stats.columns = ['cluster', 'lat', 'long', 'year_min', 'year_max', 'count']
+    # Get cluster statistics (centroids and sizes in one vectorized pass)
+    clustered_df = df[df['cluster'] != -1]
+    summary = summarize_clusters(clustered_df[['lat', 'long']].values, clustered_df['cluster'].values)
+    year_range = clustered_df.groupby('cluster')['date_taken_year'].agg(['min', 'max'])
+    cluster_stats = pd.DataFrame({
+        'cluster': summary.index,
+        'lat': summary['centroid_lat'].values,
+        'long': summary['centroid_lon'].values,
+        'year_min': year_range['min'].reindex(summary.index).values,
+        'year_max': year_range['max'].reindex(summary.index).values,
+        'count': summary['size'].values
+    })
     cluster_stats = cluster_stats.sort_values('count', ascending=False)
     
     # Build cluster list HTML
@@ -899,7 +931,7 @@ def create_cluster_map(
     df: pd.DataFrame,
     min_cluster_size: int = 10,
     show_noise: bool = False,
-    sample_per_cluster: int = 200,
+    sample_per_cluster: int = 25,
     include_heatmap: bool = False,
     use_polygons: bool = True,
     output_path: Optional[Path] = None
@@ -911,7 +943,7 @@ def create_cluster_map(
         df: DataFrame with photo data (must have 'cluster' column)
         min_cluster_size: Minimum cluster size to display
         show_noise: Whether to show noise points
-        sample_per_cluster: Max points per cluster for performance
+        sample_per_cluster: Representative photos per cluster
         include_heatmap: Whether to add density heatmap layer
         use_polygons: If True, show cluster areas as polygons; if False, show individual points
         output_path: Path to save HTML (None to skip saving)
@@ -923,9 +955,10 @@ def create_cluster_map(
         raise ValueError("DataFrame must have 'cluster' column. Run clustering first.")
     
     # Get cluster statistics
-    cluster_counts = df['cluster'].value_counts()
-    unique_clusters = sorted([c for c in df['cluster'].unique() if c != -1])
-    valid_clusters = [c for c in unique_clusters if cluster_counts.get(c, 0) >= min_cluster_size]
+    summary = summarize_clusters(df[['lat', 'long']].values, df['cluster'].values)
+    cluster_counts = summary['size']
+    unique_clusters = summary.index.tolist()
+    valid_clusters = summary.index[summary['size'] >= min_cluster_size].tolist()
     
     n_total = len(df)
     n_noise = (df['cluster'] == -1).sum()
@@ -961,13 +994,17 @@ def create_cluster_map(
         m = add_heatmap(m, clustered_df, name="Cluster Density")
         print("  Added heatmap layer")
     
+    # Rows grouped by cluster once, shared by the layers below
+    cluster_index = ClusterIndex(df)
+    
     # Add cluster visualization (polygons or markers)
     if use_polygons:
         m = add_cluster_polygons(
             m, df,
             min_cluster_size=min_cluster_size,
             cluster_descriptors=cluster_descriptors,
-            cluster_names=cluster_names
+            cluster_names=cluster_names,
+            cluster_index=cluster_index
         )
         print(f"  Added {len(valid_clusters)} cluster polygons")
     else:
@@ -977,7 +1014,8 @@ def create_cluster_map(
             show_noise=show_noise,
             sample_per_cluster=sample_per_cluster,
             cluster_descriptors=cluster_descriptors,
-            cluster_names=cluster_names
+            cluster_names=cluster_names,
+            cluster_index=cluster_index
         )
         print(f"  Added {len(valid_clusters)} cluster layers")
     
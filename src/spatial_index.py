@@ -0,0 +1,462 @@
+"""
+Spatial lookup index for the Grand Lyon Photo Clusters project.
+Answers "which photo cluster is at this lat/long" without rescanning the
+clustered CSV.
+
+The index combines:
+- a KD-tree over cluster centroids (nearest-cluster queries and fallback),
+- a packed R-tree (Sort-Tile-Recursive) over the cluster hull bounding boxes,
+- a vectorized ray-casting point-in-polygon test on the candidate hulls.
+"""
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Optional, Tuple
+from scipy.spatial import ConvexHull, cKDTree
+from scipy.spatial import QhullError
+
+from .data_loader import PROJECT_ROOT
+from .clustering import summarize_clusters
+
+# Output paths
+DATA_DIR = PROJECT_ROOT / "data"
+CLUSTER_INDEX_PATH = DATA_DIR / "cluster_lookup_index.npz"
+
+# R-tree node capacity
+RTREE_NODE_SIZE = 16
+
+
+# =============================================================================
+# INDEX CONSTRUCTION HELPERS
+# =============================================================================
+
+def _cluster_hulls(
+    coords: np.ndarray,
+    labels: np.ndarray,
+    cluster_ids: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute one convex hull per cluster, stored as flat vertex arrays.
+
+    Clusters with fewer than 3 distinct points (or collinear points) get
+    their bounding box as polygon, so every cluster stays queryable.
+
+    Returns:
+        Tuple of (vertices [V, 2] as lat/lon, offsets [K + 1] into vertices)
+    """
+    order = np.argsort(labels, kind='stable')
+    sorted_labels = labels[order]
+    starts = np.searchsorted(sorted_labels, cluster_ids, side='left')
+    ends = np.searchsorted(sorted_labels, cluster_ids, side='right')
+
+    polygons = []
+    for start, end in zip(starts, ends):
+        points = coords[order[start:end]]
+        try:
+            polygon = points[ConvexHull(points).vertices]
+        except (QhullError, ValueError):
+            lat_min, lon_min = points.min(axis=0)
+            lat_max, lon_max = points.max(axis=0)
+            polygon = np.array([
+                [lat_min, lon_min], [lat_min, lon_max],
+                [lat_max, lon_max], [lat_max, lon_min]
+            ])
+        polygons.append(polygon)
+
+    offsets = np.zeros(len(polygons) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(p) for p in polygons])
+    vertices = np.vstack(polygons) if polygons else np.empty((0, 2))
+    return vertices, offsets
+
+
+def _str_order(boxes: np.ndarray, node_size: int) -> np.ndarray:
+    """
+    Sort-Tile-Recursive order: slice by lat center, then sort slices by lon.
+    """
+    n = len(boxes)
+    n_nodes = int(np.ceil(n / node_size))
+    per_slice = int(np.ceil(np.sqrt(n_nodes))) * node_size
+    lat_center = (boxes[:, 0] + boxes[:, 2]) / 2
+    lon_center = (boxes[:, 1] + boxes[:, 3]) / 2
+    slice_id = np.empty(n, dtype=np.int64)
+    slice_id[np.argsort(lat_center, kind='stable')] = np.arange(n) // per_slice
+    return np.lexsort((lon_center, slice_id))
+
+
+def _pack_rtree(
+    boxes: np.ndarray,
+    node_size: int = RTREE_NODE_SIZE
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bulk-load a static R-tree with Sort-Tile-Recursive packing.
+
+    Args:
+        boxes: Entry bounding boxes [K, 4] as (lat_min, lon_min, lat_max, lon_max)
+        node_size: Maximum children per node
+
+    Returns:
+        Tuple of (entry order, node boxes [N, 4], node child ranges [N, 2],
+        nodes per level). Nodes are stored level by level, leaves first and
+        the root last; child ranges index the level below (the reordered
+        entries for leaves).
+    """
+    entry_order = _str_order(boxes, node_size)
+    items = boxes[entry_order]
+    level_boxes, level_children = [], []
+
+    while True:
+        starts = np.arange(0, len(items), node_size)
+        ends = np.minimum(starts + node_size, len(items))
+        parents = np.column_stack([
+            np.minimum.reduceat(items[:, 0], starts),
+            np.minimum.reduceat(items[:, 1], starts),
+            np.maximum.reduceat(items[:, 2], starts),
+            np.maximum.reduceat(items[:, 3], starts),
+        ])
+        children = np.column_stack([starts, ends])
+        if len(parents) > 1:
+            order = _str_order(parents, node_size)
+            parents, children = parents[order], children[order]
+        level_boxes.append(parents)
+        level_children.append(children)
+        if len(parents) == 1:
+            break
+        items = parents
+
+    return (
+        entry_order,
+        np.vstack(level_boxes),
+        np.vstack(level_children),
+        np.array([len(b) for b in level_boxes], dtype=np.int64),
+    )
+
+
+def _points_in_polygons(
+    points: np.ndarray,
+    polygon_ids: np.ndarray,
+    vertices: np.ndarray,
+    offsets: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized ray-casting test for (point, polygon) candidate pairs.
+
+    Every pair is expanded to one row per polygon edge, crossings of a ray
+    cast along +lon are counted, and parity gives inside/outside. Points on
+    the boundary are inside.
+
+    Args:
+        points: Query points [P, 2] (one per candidate pair)
+        polygon_ids: Polygon index for each pair [P]
+        vertices: Flat polygon vertices [V, 2]
+        offsets: Polygon offsets into vertices [K + 1]
+
+    Returns:
+        Boolean array [P], True if the point lies inside its polygon
+    """
+    if len(points) == 0:
+        return np.zeros(0, dtype=bool)
+
+    n_edges = offsets[polygon_ids + 1] - offsets[polygon_ids]
+    pair = np.repeat(np.arange(len(points)), n_edges)
+    first = np.repeat(offsets[polygon_ids], n_edges)
+    # Edge k of polygon p goes from vertex k to vertex (k + 1) mod n
+    position = np.arange(len(pair)) - np.repeat(np.cumsum(n_edges) - n_edges, n_edges)
+    a = vertices[first + position]
+    b = vertices[first + (position + 1) % np.repeat(n_edges, n_edges)]
+
+    lat = points[pair, 0]
+    lon = points[pair, 1]
+    straddles = (a[:, 0] > lat) != (b[:, 0] > lat)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cross_lon = a[:, 1] + (lat - a[:, 0]) * (b[:, 1] - a[:, 1]) / (b[:, 0] - a[:, 0])
+    crossings = straddles & (lon < cross_lon)
+
+    # Points exactly on an edge (e.g. the photos defining a hull) count as inside
+    cross = (b[:, 0] - a[:, 0]) * (lon - a[:, 1]) - (b[:, 1] - a[:, 1]) * (lat - a[:, 0])
+    on_edge = (
+        (np.abs(cross) <= 1e-15) &
+        (lat >= np.minimum(a[:, 0], b[:, 0])) & (lat <= np.maximum(a[:, 0], b[:, 0])) &
+        (lon >= np.minimum(a[:, 1], b[:, 1])) & (lon <= np.maximum(a[:, 1], b[:, 1]))
+    )
+
+    counts = np.bincount(pair, weights=crossings, minlength=len(points))
+    boundary = np.bincount(pair, weights=on_edge, minlength=len(points)) > 0
+    return (counts % 2).astype(bool) | boundary
+
+
+# =============================================================================
+# LOOKUP INDEX
+# =============================================================================
+
+class ClusterLookupIndex:
+    """
+    Point-to-cluster lookup over the clustered photo output.
+
+    Build it with `from_clustered_data` (or `build_cluster_lookup_index`),
+    persist it with `save`, and reopen it with `load`. A loaded index only
+    reads its arrays from disk on the first query.
+    """
+
+    _ARRAYS = [
+        'cluster_ids', 'centroids', 'entry_boxes', 'vertices', 'offsets',
+        'node_boxes', 'node_children', 'level_sizes'
+    ]
+
+    def __init__(self, path: Optional[Path] = None, **arrays):
+        self.path = Path(path) if path is not None else None
+        self._arrays = arrays or None
+        self._tree = None
+
+    # -------------------------------------------------------------------------
+    # Construction & persistence
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def from_clustered_data(
+        cls,
+        df: pd.DataFrame,
+        cluster_col: str = 'cluster',
+        min_cluster_size: int = 1
+    ) -> 'ClusterLookupIndex':
+        """
+        Build the index from a clustered DataFrame.
+
+        Args:
+            df: DataFrame with 'lat', 'long' and cluster columns
+            cluster_col: Column with cluster labels (-1 = noise)
+            min_cluster_size: Skip clusters with fewer photos
+
+        Returns:
+            ClusterLookupIndex
+        """
+        coords = df[['lat', 'long']].to_numpy(dtype=float)
+        labels = df[cluster_col].to_numpy()
+
+        summary = summarize_clusters(coords, labels)
+        summary = summary[summary['size'] >= min_cluster_size]
+        cluster_ids = summary.index.to_numpy(dtype=np.int64)
+
+        if len(cluster_ids) == 0:
+            return cls(
+                cluster_ids=cluster_ids, centroids=np.empty((0, 2)), entry_boxes=np.empty((0, 4)),
+                vertices=np.empty((0, 2)), offsets=np.zeros(1, dtype=np.int64),
+                node_boxes=np.empty((0, 4)), node_children=np.empty((0, 2), dtype=np.int64),
+                level_sizes=np.empty(0, dtype=np.int64),
+            )
+
+        keep = np.isin(labels, cluster_ids)
+        vertices, offsets = _cluster_hulls(coords[keep], labels[keep], cluster_ids)
+
+        # Hull bounding boxes, then STR packing; entries are reordered so
+        # that leaf nodes point at contiguous runs of clusters
+        boxes = np.column_stack([
+            np.minimum.reduceat(vertices[:, 0], offsets[:-1]),
+            np.minimum.reduceat(vertices[:, 1], offsets[:-1]),
+            np.maximum.reduceat(vertices[:, 0], offsets[:-1]),
+            np.maximum.reduceat(vertices[:, 1], offsets[:-1]),
+        ])
+        entry_order, node_boxes, node_children, level_sizes = _pack_rtree(boxes)
+
+        polygons = [vertices[offsets[i]:offsets[i + 1]] for i in entry_order]
+        vertices = np.vstack(polygons)
+        offsets = np.zeros(len(polygons) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(p) for p in polygons])
+
+        return cls(
+            cluster_ids=cluster_ids[entry_order],
+            centroids=summary[['centroid_lat', 'centroid_lon']].to_numpy()[entry_order],
+            entry_boxes=boxes[entry_order],
+            vertices=vertices,
+            offsets=offsets,
+            node_boxes=node_boxes,
+            node_children=node_children,
+            level_sizes=level_sizes,
+        )
+
+    def save(self, path: Path = None) -> Path:
+        """
+        Save the index to a compressed .npz file.
+
+        Args:
+            path: Output path (default: data/cluster_lookup_index.npz)
+
+        Returns:
+            Path to saved file
+        """
+        path = Path(path) if path is not None else CLUSTER_INDEX_PATH
+        np.savez_compressed(path, **self._load_arrays())
+        self.path = path
+        print(f"Saved cluster lookup index to {path}")
+        return path
+
+    @classmethod
+    def load(cls, path: Path = None) -> 'ClusterLookupIndex':
+        """
+        Open a saved index. Arrays are read lazily on the first query.
+
+        Args:
+            path: Index path (default: data/cluster_lookup_index.npz)
+
+        Returns:
+            ClusterLookupIndex
+        """
+        path = Path(path) if path is not None else CLUSTER_INDEX_PATH
+        if not path.exists():
+            raise FileNotFoundError(f"Cluster lookup index not found: {path}")
+        return cls(path=path)
+
+    def _load_arrays(self) -> dict:
+        """Return the index arrays, reading them from disk on first use."""
+        if self._arrays is None:
+            with np.load(self.path) as data:
+                self._arrays = {name: data[name] for name in self._ARRAYS}
+        return self._arrays
+
+    def _centroid_tree(self) -> cKDTree:
+        """KD-tree over cluster centroids, built on first use."""
+        if self._tree is None:
+            self._tree = cKDTree(self._load_arrays()['centroids'])
+        return self._tree
+
+    @property
+    def n_clusters(self) -> int:
+        """Number of indexed clusters."""
+        return len(self._load_arrays()['cluster_ids'])
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def _candidates(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Descend the R-tree for all points at once.
+
+        Returns:
+            Tuple of (point indices, entry indices) whose bounding boxes
+            contain the point
+        """
+        arrays = self._load_arrays()
+        node_boxes = arrays['node_boxes']
+        node_children = arrays['node_children']
+        level_sizes = arrays['level_sizes']
+        level_starts = np.concatenate(([0], np.cumsum(level_sizes)))
+
+        # (point, node) pairs, starting at the root
+        point_idx = np.arange(len(points))
+        item_idx = np.full(len(points), len(node_boxes) - 1)
+        boxes = node_boxes
+
+        for level in range(len(level_sizes) - 1, -2, -1):
+            box = boxes[item_idx]
+            p = points[point_idx]
+            inside = (
+                (p[:, 0] >= box[:, 0]) & (p[:, 1] >= box[:, 1]) &
+                (p[:, 0] <= box[:, 2]) & (p[:, 1] <= box[:, 3])
+            )
+            point_idx, item_idx = point_idx[inside], item_idx[inside]
+            if level < 0:
+                break
+
+            # Expand every surviving node into its children
+            first, last = node_children[item_idx, 0], node_children[item_idx, 1]
+            n_children = last - first
+            point_idx = np.repeat(point_idx, n_children)
+            item_idx = (np.repeat(first - (np.cumsum(n_children) - n_children), n_children)
+                        + np.arange(n_children.sum()))
+            if level > 0:
+                item_idx = item_idx + level_starts[level - 1]
+            else:
+                boxes = arrays['entry_boxes']
+
+        return point_idx, item_idx
+
+    def lookup_many(
+        self,
+        coords: np.ndarray,
+        max_distance: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Find the cluster containing each point.
+
+        Points inside several hulls go to the cluster with the nearest
+        centroid. Points outside every hull get the nearest cluster within
+        max_distance (degrees), or -1.
+
+        Args:
+            coords: Array of [lat, lon] query points
+            max_distance: Optional fallback radius to the nearest centroid
+
+        Returns:
+            Array of cluster IDs (-1 = no cluster)
+        """
+        points = np.atleast_2d(np.asarray(coords, dtype=float))
+        arrays = self._load_arrays()
+        result = np.full(len(points), -1, dtype=np.int64)
+        if self.n_clusters == 0 or len(points) == 0:
+            return result
+
+        point_idx, entry_idx = self._candidates(points)
+        inside = _points_in_polygons(points[point_idx], entry_idx, arrays['vertices'], arrays['offsets'])
+        point_idx, entry_idx = point_idx[inside], entry_idx[inside]
+
+        # Overlapping hulls: keep the hit with the nearest centroid
+        distance = np.hypot(*(points[point_idx] - arrays['centroids'][entry_idx]).T)
+        order = np.lexsort((distance, point_idx))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = point_idx[order][1:] != point_idx[order][:-1]
+        best = order[first]
+        result[point_idx[best]] = arrays['cluster_ids'][entry_idx[best]]
+
+        if max_distance is not None:
+            missing = np.flatnonzero(result == -1)
+            if len(missing):
+                dist, nearest = self._centroid_tree().query(
+                    points[missing], distance_upper_bound=max_distance
+                )
+                found = np.isfinite(dist)
+                result[missing[found]] = arrays['cluster_ids'][nearest[found]]
+
+        return result
+
+    def lookup(self, lat: float, lon: float, max_distance: Optional[float] = None) -> int:
+        """
+        Find the cluster containing a single point (-1 = no cluster).
+        """
+        return int(self.lookup_many(np.array([[lat, lon]]), max_distance=max_distance)[0])
+
+    def nearest(self, coords: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k clusters with the nearest centroids.
+
+        Args:
+            coords: Array of [lat, lon] query points
+            k: Number of clusters per point
+
+        Returns:
+            Tuple of (distances in degrees, cluster IDs)
+        """
+        distances, entries = self._centroid_tree().query(np.atleast_2d(coords), k=k)
+        return distances, self._load_arrays()['cluster_ids'][entries]
+
+
+def build_cluster_lookup_index(
+    df: pd.DataFrame,
+    output_path: Path = None,
+    cluster_col: str = 'cluster'
+) -> ClusterLookupIndex:
+    """
+    Build the lookup index from clustered data and save it to disk.
+
+    Args:
+        df: Clustered DataFrame ('lat', 'long', cluster column)
+        output_path: Output path (default: data/cluster_lookup_index.npz)
+        cluster_col: Column with cluster labels
+
+    Returns:
+        ClusterLookupIndex
+    """
+    index = ClusterLookupIndex.from_clustered_data(df, cluster_col=cluster_col)
+    index.save(output_path)
+    print(f"  Indexed {index.n_clusters} clusters")
+    return index
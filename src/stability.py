@@ -0,0 +1,271 @@
+"""
+Cluster stability module for the Grand Lyon Photo Clusters project.
+Estimates how robust each cluster is by re-clustering bootstrap resamples.
+
+For every original cluster C and resample b, the stability score is the
+best Jaccard overlap between C (restricted to the resampled photos) and any
+cluster found on that resample (Hennig, 2007). Scores are averaged over
+resamples: > 0.75 is a stable cluster, < 0.5 a cluster that dissolves.
+"""
+
+import os
+import json
+import multiprocessing
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .clustering import run_clustering, cluster_overlap
+from .data_loader import PROJECT_ROOT
+
+# Output paths
+REPORTS_DIR = PROJECT_ROOT / "reports"
+CLUSTER_STABILITY_PATH = REPORTS_DIR / "cluster_stability.json"
+
+# Jaccard thresholds from Hennig (2007)
+STABLE_THRESHOLD = 0.75
+DISSOLVED_THRESHOLD = 0.5
+
+# Arrays attached from shared memory in each worker process
+_SHARED: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+# =============================================================================
+# SHARED MEMORY HELPERS
+# =============================================================================
+
+def _share_array(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, Dict]:
+    """
+    Copy an array into a new shared memory block.
+
+    Returns:
+        Tuple of (shared memory block, spec dict to re-attach it by name)
+    """
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    view[:] = array
+    spec = {'name': block.name, 'shape': array.shape, 'dtype': array.dtype.str}
+    return block, spec
+
+
+def _attach_shared_arrays(specs: Dict[str, Dict]):
+    """
+    Worker initializer: attach the parent's shared arrays without copying.
+
+    The parent owns the blocks and unlinks them once the pool is done.
+    """
+    for key, spec in specs.items():
+        block = shared_memory.SharedMemory(name=spec['name'])
+        _SHARED[key] = (block, np.ndarray(spec['shape'], dtype=spec['dtype'], buffer=block.buf))
+
+
+def _bootstrap_worker(seed: int, algorithm: str, params: Dict) -> np.ndarray:
+    """
+    Re-cluster one bootstrap resample and score every original cluster.
+
+    Returns:
+        Array with the best Jaccard per original cluster (sorted cluster IDs),
+        NaN for clusters with no photo in the resample
+    """
+    coords = _SHARED['coords'][1]
+    reference = _SHARED['labels'][1]
+    times = _SHARED['times'][1] if 'times' in _SHARED else None
+    n_points = len(coords)
+
+    # Bootstrap draw; duplicates are dropped so they don't inflate density
+    rng = np.random.default_rng(seed)
+    idx = np.unique(rng.integers(0, n_points, n_points))
+
+    labels = run_clustering(
+        coords[idx], algorithm, params,
+        times=times[idx] if times is not None else None
+    )
+
+    cluster_ids = np.unique(reference[reference != -1])
+    new_ids, ref_ids, jaccard = cluster_overlap(labels, reference[idx])
+
+    best = np.full(len(cluster_ids), np.nan)
+    present = np.searchsorted(cluster_ids, ref_ids)
+    best[present] = jaccard.max(axis=0) if len(new_ids) else 0.0
+    return best
+
+
+# =============================================================================
+# STABILITY ANALYSIS
+# =============================================================================
+
+def compute_cluster_stability(
+    coords: np.ndarray,
+    labels: np.ndarray,
+    algorithm: str = 'hdbscan',
+    params: Optional[Dict] = None,
+    times=None,
+    n_bootstrap: int = 20,
+    n_jobs: Optional[int] = None,
+    random_state: int = 42
+) -> pd.DataFrame:
+    """
+    Compute bootstrap Jaccard stability for every cluster.
+
+    Resamples are clustered in parallel processes. Coordinates, labels and
+    times are placed once in shared memory and attached by every worker,
+    and overlaps are counted with sparse contingency tables, so memory
+    stays O(N + K²) instead of O(N²) co-membership matrices.
+
+    Args:
+        coords: Coordinates used for the original clustering
+        labels: Original cluster labels (-1 = noise)
+        algorithm: Algorithm name (see clustering.run_clustering)
+        params: Algorithm parameters used for the original clustering
+        times: Capture timestamps (st_dbscan only)
+        n_bootstrap: Number of bootstrap resamples
+        n_jobs: Number of worker processes (default: all CPUs)
+        random_state: Random seed
+
+    Returns:
+        DataFrame indexed by cluster with columns: size, stability (mean
+        Jaccard), stability_std, stable_rate and dissolved_rate
+    """
+    coords = np.ascontiguousarray(coords, dtype=np.float64)
+    labels = np.ascontiguousarray(labels, dtype=np.int64)
+    cluster_ids, sizes = np.unique(labels[labels != -1], return_counts=True)
+
+    n_jobs = min(n_jobs or os.cpu_count() or 1, n_bootstrap)
+    seeds = np.random.default_rng(random_state).integers(0, 2**32 - 1, n_bootstrap)
+
+    arrays = {'coords': coords, 'labels': labels}
+    if times is not None:
+        arrays['times'] = np.asarray(pd.to_datetime(pd.Series(np.asarray(times))), dtype='datetime64[ns]')
+
+    print(f"  Bootstrap stability: {n_bootstrap} resamples, {n_jobs} processes, "
+          f"{len(cluster_ids)} clusters")
+
+    # Parallelism comes from the process pool: one thread per resample
+    worker_params = {**(params or {}), 'n_jobs': 1}
+
+    blocks = []
+    scores = np.full((n_bootstrap, len(cluster_ids)), np.nan)
+    try:
+        specs = {}
+        for key, array in arrays.items():
+            block, specs[key] = _share_array(array)
+            blocks.append(block)
+
+        # Spawned (not forked) workers: forking after joblib/OpenMP threads
+        # have started can deadlock inside HDBSCAN
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_attach_shared_arrays,
+            initargs=(specs,)
+        ) as executor:
+            futures = {
+                executor.submit(_bootstrap_worker, int(seed), algorithm, worker_params): b
+                for b, seed in enumerate(seeds)
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                scores[futures[future]] = future.result()
+                print(f"    Resample {done}/{n_bootstrap} done")
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    # Clusters absent from every resample get NaN scores
+    with np.errstate(invalid='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        observed = ~np.isnan(scores)
+        n_observed = np.maximum(observed.sum(axis=0), 1)
+        stability = pd.DataFrame({
+            'size': sizes.astype(int),
+            'stability': np.nanmean(scores, axis=0) if n_bootstrap else np.nan,
+            'stability_std': np.nanstd(scores, axis=0) if n_bootstrap else np.nan,
+            'stable_rate': (scores >= STABLE_THRESHOLD).sum(axis=0) / n_observed,
+            'dissolved_rate': (scores < DISSOLVED_THRESHOLD).sum(axis=0) / n_observed,
+        }, index=pd.Index(cluster_ids, name='cluster'))
+
+    n_stable = int((stability['stability'] >= STABLE_THRESHOLD).sum())
+    n_dissolved = int((stability['stability'] < DISSOLVED_THRESHOLD).sum())
+    print(f"  Stable clusters (J >= {STABLE_THRESHOLD}): {n_stable}")
+    print(f"  Dissolving clusters (J < {DISSOLVED_THRESHOLD}): {n_dissolved}")
+
+    return stability
+
+
+def save_stability_json(
+    stability: pd.DataFrame,
+    metadata: Optional[Dict] = None,
+    output_path: Path = None
+) -> Path:
+    """
+    Save per-cluster stability scores to JSON.
+
+    Args:
+        stability: Output of compute_cluster_stability
+        metadata: Extra top-level fields (algorithm, params, cache key...)
+        output_path: Output file path
+
+    Returns:
+        Path to saved file
+    """
+    if output_path is None:
+        output_path = CLUSTER_STABILITY_PATH
+
+    output = {
+        "generated_at": datetime.now().isoformat(),
+        "method": "Bootstrap Jaccard (Hennig, 2007)",
+        **(metadata or {}),
+        "clusters": {
+            str(cluster_id): {
+                "size": int(row['size']),
+                **{
+                    key: None if np.isnan(row[key]) else round(float(row[key]), 4)
+                    for key in ['stability', 'stability_std', 'stable_rate', 'dissolved_rate']
+                }
+            }
+            for cluster_id, row in stability.iterrows()
+        }
+    }
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2)
+
+    print(f"Saved cluster stability to {output_path}")
+    return output_path
+
+
+def load_cluster_stability(
+    input_path: Path = None,
+    cache_key: Optional[str] = None
+) -> Dict[int, float]:
+    """
+    Load per-cluster stability scores.
+
+    Args:
+        input_path: Stability JSON path
+        cache_key: If given, only return scores computed for this clustering
+
+    Returns:
+        Dictionary mapping cluster ID to stability (empty if unavailable)
+    """
+    if input_path is None:
+        input_path = CLUSTER_STABILITY_PATH
+    if not Path(input_path).exists():
+        return {}
+
+    with open(input_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if cache_key is not None and data.get('cache_key') != cache_key:
+        return {}
+
+    return {
+        int(cluster_id): info['stability']
+        for cluster_id, info in data.get('clusters', {}).items()
+        if info.get('stability') is not None
+    }
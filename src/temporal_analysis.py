@@ -17,6 +17,7 @@ import matplotlib.dates as mdates
 import seaborn as sns
 
 from .data_loader import PROJECT_ROOT
+from .clustering import ClusterIndex
 
 # Output paths
 REPORTS_DIR = PROJECT_ROOT / "reports"
@@ -157,7 +158,8 @@ def aggregate_monthly_by_year(
 
 def compute_cluster_temporal_stats(
     df: pd.DataFrame,
-    cluster_col: str = 'cluster'
+    cluster_col: str = 'cluster',
+    cluster_index: Optional[ClusterIndex] = None
 ) -> pd.DataFrame:
     """
     Compute temporal statistics for each cluster.
@@ -173,65 +175,58 @@ def compute_cluster_temporal_stats(
     Args:
         df: DataFrame with cluster and date columns
         cluster_col: Name of cluster column
+        cluster_index: Prebuilt ClusterIndex of df (built if None)
     
     Returns:
         DataFrame with one row per cluster and temporal statistics
     """
-    df = df.copy()
+    if cluster_index is None:
+        cluster_index = ClusterIndex(df, cluster_col)
     
-    # Get monthly aggregation
-    monthly = aggregate_by_period(df, cluster_col, period='month')
+    months = cluster_index.values('date_taken_month')
+    years = cluster_index.values('date_taken_year')
     
     stats_list = []
     
-    for cluster_id in df[cluster_col].unique():
+    for cluster_id in cluster_index.appearance_order():
         if cluster_id == -1:  # Skip noise
             continue
         
-        cluster_photos = df[df[cluster_col] == cluster_id]
-        cluster_monthly = monthly[monthly[cluster_col] == cluster_id]
+        start, end = cluster_index.bounds(cluster_id)
+        cluster_months = months[start:end].astype(int)
+        cluster_years = pd.Series(years[start:end])
         
         # Basic counts
-        total_photos = len(cluster_photos)
-        n_years = cluster_photos['date_taken_year'].nunique()
-        year_min = int(cluster_photos['date_taken_year'].min())
-        year_max = int(cluster_photos['date_taken_year'].max())
-        n_months_active = len(cluster_monthly)
+        total_photos = end - start
+        n_years = cluster_years.nunique()
+        year_min = int(cluster_years.min())
+        year_max = int(cluster_years.max())
+        n_months_active = len(np.unique(cluster_months))
+        
+        # Monthly distribution (full 12-month vector)
+        in_range = (cluster_months >= 1) & (cluster_months <= 12)
+        month_counts = np.bincount(cluster_months[in_range] - 1, minlength=12)
+        
+        # Calculate stats
+        month_mean = np.mean(month_counts)
+        month_std = np.std(month_counts)
+        month_cv = month_std / month_mean if month_mean > 0 else 0
         
-        # Monthly distribution
-        if not cluster_monthly.empty:
-            # Create full 12-month vector
-            month_counts = [0] * 12
-            for _, row in cluster_monthly.iterrows():
-                month = int(row['period']) - 1  # 0-indexed
-                if 0 <= month < 12:
-                    month_counts[month] = row['count']
-            
-            # Calculate stats
-            month_mean = np.mean(month_counts) if month_counts else 0
-            month_std = np.std(month_counts) if month_counts else 0
-            month_cv = month_std / month_mean if month_mean > 0 else 0
-            
-            # Peak month
-            peak_month = np.argmax(month_counts) + 1  # 1-indexed
-            peak_count = max(month_counts)
-            peak_ratio = peak_count / total_photos if total_photos > 0 else 0
-            
-            # Special month ratios
-            december_count = month_counts[11]  # December (0-indexed = 11)
-            december_ratio = december_count / total_photos if total_photos > 0 else 0
-            
-            summer_count = month_counts[6] + month_counts[7]  # July + August
-            summer_ratio = summer_count / total_photos if total_photos > 0 else 0
-            
-            # Count months with significant activity (>5% of total)
-            threshold = total_photos * 0.05
-            months_with_activity = sum(1 for c in month_counts if c >= threshold)
-        else:
-            month_mean = month_std = month_cv = 0
-            peak_month = peak_count = peak_ratio = 0
-            december_ratio = summer_ratio = 0
-            months_with_activity = 0
+        # Peak month
+        peak_month = np.argmax(month_counts) + 1  # 1-indexed
+        peak_count = month_counts.max()
+        peak_ratio = peak_count / total_photos if total_photos > 0 else 0
+        
+        # Special month ratios
+        december_count = month_counts[11]  # December (0-indexed = 11)
+        december_ratio = december_count / total_photos if total_photos > 0 else 0
+        
+        summer_count = month_counts[6] + month_counts[7]  # July + August
+        summer_ratio = summer_count / total_photos if total_photos > 0 else 0
+        
+        # Count months with significant activity (>5% of total)
+        threshold = total_photos * 0.05
+        months_with_activity = int((month_counts >= threshold).sum())
         
         stats_list.append({
             'cluster': cluster_id,
@@ -284,7 +279,8 @@ def detect_peaks(
 def detect_monthly_peaks(
     df: pd.DataFrame,
     cluster_id: int,
-    threshold: float = 1.5
+    threshold: float = 1.5,
+    cluster_index: Optional[ClusterIndex] = None
 ) -> Dict[str, Any]:
     """
     Detect peak months for a specific cluster.
@@ -293,11 +289,15 @@ def detect_monthly_peaks(
         df: DataFrame with cluster and date columns
         cluster_id: Cluster to analyze
         threshold: Z-score threshold for peak detection
+        cluster_index: Prebuilt ClusterIndex of df (slices instead of masking)
     
     Returns:
         Dictionary with peak information
     """
-    cluster_df = df[df['cluster'] == cluster_id]
+    if cluster_index is not None:
+        cluster_df = cluster_index.get(cluster_id)
+    else:
+        cluster_df = df[df['cluster'] == cluster_id]
     
     if cluster_df.empty:
         return {'peaks': [], 'peak_months': [], 'peak_year_months': []}
@@ -383,7 +383,8 @@ def classify_cluster_type(stats: Dict[str, Any]) -> str:
 
 def classify_all_clusters(
     df: pd.DataFrame,
-    cluster_col: str = 'cluster'
+    cluster_col: str = 'cluster',
+    cluster_index: Optional[ClusterIndex] = None
 ) -> Dict[int, Dict[str, Any]]:
     """
     Classify all clusters by their temporal patterns.
@@ -391,12 +392,16 @@ def classify_all_clusters(
     Args:
         df: DataFrame with cluster and date columns
         cluster_col: Name of cluster column
+        cluster_index: Prebuilt ClusterIndex of df (built if None)
     
     Returns:
         Dictionary mapping cluster ID to classification result
     """
+    if cluster_index is None:
+        cluster_index = ClusterIndex(df, cluster_col)
+    
     print("Computing temporal statistics for all clusters...")
-    stats_df = compute_cluster_temporal_stats(df, cluster_col)
+    stats_df = compute_cluster_temporal_stats(df, cluster_col, cluster_index=cluster_index)
     
     results = {}
     type_counts = defaultdict(int)
@@ -410,7 +415,7 @@ def classify_all_clusters(
         type_counts[cluster_type] += 1
         
         # Detect events
-        peak_info = detect_monthly_peaks(df, cluster_id)
+        peak_info = detect_monthly_peaks(df, cluster_id, cluster_index=cluster_index)
         
         # Get potential event matches
         matched_events = []
@@ -441,7 +446,8 @@ def plot_cluster_timeseries(
     df: pd.DataFrame,
     cluster_ids: List[int],
     title: str = "Photo Activity Over Time",
-    figsize: Tuple[int, int] = (14, 8)
+    figsize: Tuple[int, int] = (14, 8),
+    cluster_index: Optional[ClusterIndex] = None
 ) -> plt.Figure:
     """
     Plot time series of photo counts for selected clusters.
@@ -451,18 +457,19 @@ def plot_cluster_timeseries(
         cluster_ids: List of cluster IDs to plot
         title: Plot title
         figsize: Figure size tuple
+        cluster_index: Prebuilt ClusterIndex of df (built if None)
     
     Returns:
         Matplotlib figure object
     """
     fig, ax = plt.subplots(figsize=figsize)
     
-    df = df.copy()
-    df['year_month'] = create_year_month_column(df)
+    if cluster_index is None:
+        cluster_index = ClusterIndex(df)
     
     for cluster_id in cluster_ids:
-        cluster_df = df[df['cluster'] == cluster_id]
-        ym_counts = cluster_df.groupby('year_month').size().sort_index()
+        cluster_df = cluster_index.get(cluster_id)
+        ym_counts = cluster_df.groupby(create_year_month_column(cluster_df)).size().sort_index()
         
         if not ym_counts.empty:
             ax.plot(range(len(ym_counts)), ym_counts.values, 
@@ -482,7 +489,8 @@ def plot_monthly_distribution(
     df: pd.DataFrame,
     cluster_ids: List[int],
     title: str = "Monthly Photo Distribution",
-    figsize: Tuple[int, int] = (12, 6)
+    figsize: Tuple[int, int] = (12, 6),
+    cluster_index: Optional[ClusterIndex] = None
 ) -> plt.Figure:
     """
     Plot bar chart of monthly distribution for selected clusters.
@@ -492,19 +500,23 @@ def plot_monthly_distribution(
         cluster_ids: List of cluster IDs to plot
         title: Plot title
         figsize: Figure size tuple
+        cluster_index: Prebuilt ClusterIndex of df (built if None)
     
     Returns:
         Matplotlib figure object
     """
     fig, ax = plt.subplots(figsize=figsize)
     
+    if cluster_index is None:
+        cluster_index = ClusterIndex(df)
+    
     month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
                    'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
     x = np.arange(12)
     width = 0.8 / len(cluster_ids)
     
     for i, cluster_id in enumerate(cluster_ids):
-        cluster_df = df[df['cluster'] == cluster_id]
+        cluster_df = cluster_index.get(cluster_id)
         monthly = cluster_df.groupby('date_taken_month').size()
         monthly = monthly.reindex(range(1, 13), fill_value=0)
         
@@ -650,7 +662,8 @@ def plot_classification_summary(
 def save_temporal_visualizations(
     df: pd.DataFrame,
     classifications: Dict[int, Dict[str, Any]],
-    output_dir: Path = REPORTS_DIR
+    output_dir: Path = REPORTS_DIR,
+    cluster_index: Optional[ClusterIndex] = None
 ) -> List[Path]:
     """
     Generate and save all temporal analysis visualizations.
@@ -659,6 +672,7 @@ def save_temporal_visualizations(
         df: DataFrame with cluster and date columns
         classifications: Output from classify_all_clusters()
         output_dir: Directory to save visualizations
+        cluster_index: Prebuilt ClusterIndex of df (built if None)
     
     Returns:
         List of paths to saved files
@@ -667,6 +681,9 @@ def save_temporal_visualizations(
     output_dir.mkdir(parents=True, exist_ok=True)
     saved_files = []
     
+    if cluster_index is None:
+        cluster_index = ClusterIndex(df)
+    
     print("Generating temporal visualizations...")
     
     # 1. Cluster x Month heatmap
@@ -693,7 +710,9 @@ def save_temporal_visualizations(
     )[:10]
     top_ids = [c[0] for c in top_clusters]
     
-    fig = plot_cluster_timeseries(df, top_ids, title="Top 10 Clusters: Activity Over Time")
+    fig = plot_cluster_timeseries(
+        df, top_ids, title="Top 10 Clusters: Activity Over Time", cluster_index=cluster_index
+    )
     ts_path = output_dir / "temporal_timeseries.png"
     fig.savefig(ts_path, dpi=150, bbox_inches='tight')
     plt.close(fig)
@@ -711,7 +730,8 @@ def save_temporal_visualizations(
     if example_clusters:
         fig = plot_monthly_distribution(
             df, example_clusters,
-            title="Monthly Distribution: Example Clusters by Type"
+            title="Monthly Distribution: Example Clusters by Type",
+            cluster_index=cluster_index
         )
         dist_path = output_dir / "temporal_monthly_distribution.png"
         fig.savefig(dist_path, dpi=150, bbox_inches='tight')
@@ -897,7 +917,8 @@ Z-score based peak detection identifies months with activity more than 1.5 stand
 
 def run_temporal_analysis(
     df: pd.DataFrame = None,
-    output_dir: Path = REPORTS_DIR
+    output_dir: Path = REPORTS_DIR,
+    cluster_index: Optional[ClusterIndex] = None
 ) -> Dict[str, Any]:
     """
     Run complete temporal analysis pipeline.
@@ -905,6 +926,7 @@ def run_temporal_analysis(
     Args:
         df: DataFrame with cluster and date columns (loads default if None)
         output_dir: Directory for output files
+        cluster_index: Prebuilt ClusterIndex of df (built if None)
     
     Returns:
         Dictionary with classifications and paths to generated files
@@ -919,11 +941,14 @@ def run_temporal_analysis(
     
     print(f"Analyzing {len(df):,} photos in {df['cluster'].nunique()} clusters...")
     
+    if cluster_index is None:
+        cluster_index = ClusterIndex(df)
+    
     # Run classification
-    classifications = classify_all_clusters(df)
+    classifications = classify_all_clusters(df, cluster_index=cluster_index)
     
     # Generate visualizations
-    viz_paths = save_temporal_visualizations(df, classifications, output_dir)
+    viz_paths = save_temporal_visualizations(df, classifications, output_dir, cluster_index=cluster_index)
     
     # Generate report
     report_path = output_dir / "temporal_analysis.md"
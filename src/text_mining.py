@@ -6,25 +6,38 @@ Session 2, Task 4: TF-IDF based cluster descriptions.
 Session 3, Task 2: Association rules for cluster naming.
 """
 
+import os
 import re
+import math
 import json
+import hashlib
+import multiprocessing
 import pandas as pd
 import numpy as np
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import List, Dict, Optional, Set, Tuple, Any
 from pathlib import Path
-from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
+from scipy.sparse import coo_matrix, csr_matrix
 from datetime import datetime
 
 # Association rules mining
 from mlxtend.frequent_patterns import apriori, fpgrowth, association_rules
-from mlxtend.preprocessing import TransactionEncoder
 
 from .data_loader import PROJECT_ROOT
 
 # Output paths
 REPORTS_DIR = PROJECT_ROOT / "reports"
 DATA_DIR = PROJECT_ROOT / "data"
+PHOTO_TOKENS_CACHE_PATH = DATA_DIR / "photo_tokens.parquet"
+CLUSTER_TEXT_CACHE_PATH = DATA_DIR / "cluster_text_cache.npz"
+
+# Streaming TF-IDF: size of the hashed term space and photos read per chunk
+HASH_FEATURES = 2 ** 20
+STREAMING_CHUNK_SIZE = 100_000
+
+# Bump when the preprocessing rules change, to invalidate cached tokens
+TEXT_PREPROCESSING_VERSION = 1
 
 
 # =============================================================================
@@ -223,109 +236,682 @@ def combine_text_fields(row: pd.Series) -> str:
     return preprocess_text(combined)
 
 
+# Precompiled patterns for column-wise preprocessing (same rules as clean_text).
+# Compiled patterns keep Python's Unicode-aware \w and \d semantics.
+_URL_PATTERN = re.compile(r'http\S+|www\.\S+')
+_SPECIAL_CHAR_PATTERN = re.compile(r'[^\w\s,]')
+_NUMBER_PATTERN = re.compile(r'\b\d+\b')
+_TOKEN_SEPARATOR_PATTERN = re.compile(r'[\s,]+')
+
+
+def tokenize_text_column(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tokenize the combined tags + title text of every photo at once.
+    
+    Column-wise equivalent of df.apply(combine_text_fields, axis=1): each
+    cleaning step runs once over the whole column, and tokens are split,
+    length- and stopword-filtered on one exploded Series.
+    
+    Args:
+        df: DataFrame with 'tags' and/or 'title' columns
+    
+    Returns:
+        Tuple of (offsets, tokens): the tokens of row i are
+        tokens[offsets[i]:offsets[i + 1]]
+    """
+    n = len(df)
+    empty = pd.Series([None] * n, dtype=object)
+    tags = df['tags'].reset_index(drop=True).astype(object) if 'tags' in df.columns else empty
+    title = df['title'].reset_index(drop=True).astype(object) if 'title' in df.columns else empty
+    has_tags, has_title = tags.notna(), title.notna()
+    
+    # Object dtype keeps Python's str.lower (same as clean_text) for every step
+    combined = (
+        tags.where(has_tags, '').map(str)
+        + np.where(has_tags & has_title, ', ', '')
+        + title.where(has_title, '').map(str)
+    ).astype(object)
+    
+    text = (
+        combined.str.lower()
+        .str.replace('_', ' ', regex=False)
+        .str.replace('-', ' ', regex=False)
+        .str.replace(_URL_PATTERN, '', regex=True)
+        .str.replace(_SPECIAL_CHAR_PATTERN, ' ', regex=True)
+        .str.replace(_NUMBER_PATTERN, '', regex=True)
+    )
+    
+    # One row per token, filtered in a single pass over the whole column
+    tokens = text.str.split(_TOKEN_SEPARATOR_PATTERN, regex=True).explode()
+    keep = (tokens.str.len().ge(2) & ~tokens.isin(ALL_STOPWORDS)).values
+    values = tokens.to_numpy(dtype=object)[keep]
+    rows = tokens.index.to_numpy()[keep]
+    
+    # Tokens stay in row order after explode, so offsets follow from row counts
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=offsets[1:])
+    return offsets, values
+
+
+def preprocess_text_column(df: pd.DataFrame) -> pd.Series:
+    """
+    Preprocess the combined tags + title text of every photo at once.
+    
+    Args:
+        df: DataFrame with 'tags' and/or 'title' columns
+    
+    Returns:
+        Series (aligned with df) of space-separated tokens, as produced by
+        combine_text_fields
+    """
+    offsets, values = tokenize_text_column(df)
+    processed = [' '.join(values[a:b]) for a, b in zip(offsets[:-1], offsets[1:])]
+    return pd.Series(processed, index=df.index, dtype=object)
+
+
 # =============================================================================
-# CLUSTER TEXT AGGREGATION
+# PHOTO TOKEN CACHE
 # =============================================================================
 
-def get_cluster_texts(df: pd.DataFrame) -> Dict[int, str]:
+def text_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Fingerprint the text columns of a dataset, row order included.
+    
+    Cluster labels and other columns are ignored, so reclustering the same
+    cleaned data keeps the same fingerprint. Missing values hash like empty
+    strings (they tokenize the same), so the cleaned Parquet ('' titles) and
+    its CSV round trip (NaN titles) share one fingerprint.
+    
+    Args:
+        df: DataFrame with 'tags' and/or 'title' columns
+    
+    Returns:
+        Hex digest identifying the text content
+    """
+    columns = [c for c in ('tags', 'title') if c in df.columns]
+    text = pd.DataFrame({
+        c: df[c].astype(object).where(df[c].notna(), '').map(str).astype(object)
+        for c in columns
+    })
+    row_hashes = pd.util.hash_pandas_object(text, index=False)
+    digest = hashlib.md5(row_hashes.to_numpy().tobytes())
+    digest.update(','.join(columns).encode())
+    return digest.hexdigest()[:16]
+
+
+def stopwords_version() -> str:
+    """
+    Version string of the token rules: preprocessing version + stopword set hash.
+    
+    Returns:
+        Version string, changes whenever ALL_STOPWORDS changes
+    """
+    digest = hashlib.md5('\n'.join(sorted(ALL_STOPWORDS)).encode()).hexdigest()[:8]
+    return f"{TEXT_PREPROCESSING_VERSION}-{digest}"
+
+
+def get_photo_token_arrays(
+    df: pd.DataFrame,
+    cache_path: Optional[Path] = PHOTO_TOKENS_CACHE_PATH
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the preprocessed tokens of every photo, using the on-disk cache.
+    
+    Tokens are stored as an Arrow list<string> column, keyed on the text
+    fingerprint and stopword version. TF-IDF and association rules both read
+    them, and reclustering the same data never re-tokenizes.
+    
+    Args:
+        df: DataFrame with 'tags' and/or 'title' columns
+        cache_path: Parquet cache file (None disables caching)
+    
+    Returns:
+        Tuple of (offsets, tokens) as returned by tokenize_text_column
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    cache_key = {
+        'fingerprint': text_fingerprint(df),
+        'stopwords_version': stopwords_version(),
+        'n_rows': len(df),
+    }
+    
+    offsets = None
+    if cache_path is not None and Path(cache_path).exists():
+        try:
+            metadata = pq.read_schema(cache_path).metadata or {}
+            saved_key = json.loads(metadata.get(b'photo_tokens', b'{}'))
+        except (OSError, ValueError, pa.ArrowInvalid):
+            saved_key = {}
+        if saved_key == cache_key:
+            column = pq.read_table(cache_path, columns=['tokens']).column('tokens').combine_chunks()
+            offsets = column.offsets.to_numpy()
+            offsets = offsets - offsets[0]
+            values = column.flatten().to_numpy(zero_copy_only=False)
+            print(f"✓ Loaded cached photo tokens ({cache_key['fingerprint']})")
+    
+    if offsets is None:
+        print("Tokenizing photo text...")
+        offsets, values = tokenize_text_column(df)
+        if cache_path is not None:
+            tokens = pa.ListArray.from_arrays(
+                pa.array(offsets, type=pa.int32()), pa.array(values, type=pa.string())
+            )
+            table = pa.table({'tokens': tokens}).replace_schema_metadata(
+                {'photo_tokens': json.dumps(cache_key)}
+            )
+            Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+            pq.write_table(table, cache_path)
+            print(f"  Saved photo tokens to {cache_path}")
+    
+    return offsets, values
+
+
+def get_photo_tokens(
+    df: pd.DataFrame,
+    cache_path: Optional[Path] = PHOTO_TOKENS_CACHE_PATH
+) -> pd.Series:
     """
-    Aggregate all text for each cluster into a single document.
+    Get the preprocessed token list of every photo (see get_photo_token_arrays).
+    
+    Args:
+        df: DataFrame with 'tags' and/or 'title' columns
+        cache_path: Parquet cache file (None disables caching)
+    
+    Returns:
+        Series (aligned with df) of token lists
+    """
+    offsets, values = get_photo_token_arrays(df, cache_path=cache_path)
+    token_lists = [values[a:b].tolist() for a, b in zip(offsets[:-1], offsets[1:])]
+    return pd.Series(token_lists, index=df.index, dtype=object)
+
+
+# =============================================================================
+# INCREMENTAL CLUSTER CACHE
+# =============================================================================
+
+def cluster_membership_hashes(df: pd.DataFrame) -> Dict[int, str]:
+    """
+    Hash the member photo IDs of every cluster (noise excluded).
+    
+    Args:
+        df: DataFrame with 'cluster' and 'id' columns (index used if no 'id')
+    
+    Returns:
+        Dictionary mapping cluster ID to a digest of its sorted member IDs
+    """
+    labels = df['cluster'].to_numpy()
+    ids = (df['id'].to_numpy() if 'id' in df.columns else df.index.to_numpy()).astype(np.int64)
+    clustered = labels != -1
+    labels, ids = labels[clustered], ids[clustered]
+    
+    order = np.lexsort((ids, labels))
+    labels, ids = labels[order], ids[order]
+    cluster_ids, starts = np.unique(labels, return_index=True)
+    ends = np.append(starts[1:], len(labels))
+    return {
+        int(cid): hashlib.md5(ids[a:b].tobytes()).hexdigest()[:16]
+        for cid, a, b in zip(cluster_ids, starts, ends)
+    }
+
+
+def load_cluster_text_cache(
+    df: pd.DataFrame,
+    path: Path = CLUSTER_TEXT_CACHE_PATH
+) -> Dict[str, Any]:
+    """
+    Load the per-cluster text mining cache, or an empty one if stale.
+    
+    Entries are keyed by cluster membership hash: term count rows (over the
+    cache vocabulary), association rules, itemsets and names. The cache is
+    only valid for the same text data and stopword set.
+    
+    Args:
+        df: Clustered DataFrame the cache will be used for
+        path: Cache file (.npz)
+    
+    Returns:
+        Cache dictionary with 'key', 'vocabulary', 'counts', 'rules',
+        'itemsets', 'names' and the current 'hashes'
+    """
+    key = {'fingerprint': text_fingerprint(df), 'stopwords_version': stopwords_version()}
+    cache = {'key': key, 'vocabulary': None, 'counts': {}, 'rules': {}, 'itemsets': {}, 'names': {}}
+    
+    if Path(path).exists():
+        try:
+            with np.load(path, allow_pickle=False) as f:
+                meta = json.loads(str(f['meta']))
+                if meta.get('key') == key:
+                    vocabulary = str(f['vocabulary'])
+                    cache['vocabulary'] = np.array(vocabulary.split('\n') if vocabulary else [], dtype=object)
+                    indptr, indices, data = f['indptr'], f['indices'], f['data']
+                    cache['counts'] = {
+                        h: (indices[indptr[i]:indptr[i + 1]], data[indptr[i]:indptr[i + 1]])
+                        for i, h in enumerate(meta['hashes'])
+                    }
+                    cache['rules'] = meta['rules']
+                    cache['itemsets'] = meta['itemsets']
+                    cache['names'] = meta['names']
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: ignoring unreadable cluster text cache: {e}")
+    
+    cache['hashes'] = cluster_membership_hashes(df)
+    return cache
+
+
+def save_cluster_text_cache(cache: Dict[str, Any], path: Path = CLUSTER_TEXT_CACHE_PATH) -> Path:
+    """
+    Save the cluster text cache, keeping only entries of current clusters.
+    
+    Args:
+        cache: Cache dictionary from load_cluster_text_cache
+        path: Cache file (.npz)
+    
+    Returns:
+        Path to saved file
+    """
+    current = set(cache['hashes'].values())
+    hashes = [h for h in cache['counts'] if h in current]
+    rows = [cache['counts'][h] for h in hashes]
+    lengths = np.array([len(indices) for indices, _ in rows], dtype=np.int64)
+    
+    def current_only(entries):
+        return {k: v for k, v in entries.items() if k.split(':', 1)[0] in current}
+    
+    meta = {
+        'key': cache['key'],
+        'hashes': hashes,
+        'rules': current_only(cache['rules']),
+        'itemsets': current_only(cache['itemsets']),
+        'names': current_only(cache['names']),
+    }
+    vocabulary = cache['vocabulary'] if cache['vocabulary'] is not None else []
+    
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        path,
+        meta=np.array(json.dumps(meta, default=float)),
+        vocabulary=np.array('\n'.join(vocabulary)),
+        indptr=np.concatenate([[0], np.cumsum(lengths)]),
+        indices=np.concatenate([indices for indices, _ in rows]) if rows else np.array([], dtype=np.int64),
+        data=np.concatenate([data for _, data in rows]) if rows else np.array([], dtype=np.int64),
+    )
+    return path
+
+
+def cached_cluster_term_counts(
+    df: pd.DataFrame,
+    cache: Dict[str, Any]
+) -> Tuple[np.ndarray, csr_matrix, np.ndarray]:
+    """
+    Cluster × term counts, recomputing only clusters missing from the cache.
+    
+    Only the photos of changed clusters are counted (over the cached
+    vocabulary). The stacked rows then give document frequencies and IDF
+    for all clusters without touching unchanged clusters' photos.
     
     Args:
         df: DataFrame with 'cluster', 'tags', and 'title' columns
+        cache: Cache dictionary from load_cluster_text_cache (updated in place)
     
     Returns:
-        Dictionary mapping cluster ID to aggregated text
+        Tuple of (sorted cluster IDs, CSR count matrix, vocabulary)
+    """
+    labels = df['cluster'].to_numpy()
+    hashes = cache['hashes']
+    cluster_ids = np.array(sorted(hashes), dtype=np.int64)
+    changed = [cid for cid in cluster_ids if hashes[cid] not in cache['counts']]
+    
+    if changed:
+        photos = np.isin(labels, changed)
+        if cache['vocabulary'] is None:
+            photos = None  # First run: the vocabulary covers all photos
+        photo_terms, vocabulary = build_photo_term_matrix(
+            df, ngram_range=(1, 2), photos=photos, vocabulary=cache['vocabulary']
+        )
+        cache['vocabulary'] = vocabulary
+        changed_ids, counts = cluster_term_counts(photo_terms, np.where(np.isin(labels, changed), labels, -1))
+        for cid, row in zip(changed_ids, counts):
+            cache['counts'][hashes[cid]] = (row.indices.astype(np.int64), row.data.astype(np.int64))
+    
+    print(f"  Term counts: {len(changed)} of {len(cluster_ids)} clusters recomputed "
+          f"({len(cluster_ids) - len(changed)} unchanged, from cache)")
+    
+    rows = [cache['counts'][hashes[cid]] for cid in cluster_ids]
+    lengths = [len(indices) for indices, _ in rows]
+    vocabulary = cache['vocabulary'] if cache['vocabulary'] is not None else np.array([], dtype=object)
+    counts = csr_matrix(
+        (
+            np.concatenate([data for _, data in rows]) if rows else np.array([], dtype=np.int64),
+            np.concatenate([indices for indices, _ in rows]) if rows else np.array([], dtype=np.int64),
+            np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+        ),
+        shape=(len(cluster_ids), len(vocabulary))
+    )
+    return cluster_ids, counts, vocabulary
+
+
+def _json_safe(value: Any) -> Any:
+    """Round-trip a value through JSON (numpy scalars become Python floats)."""
+    return json.loads(json.dumps(value, default=float))
+
+
+def cached_per_cluster(
+    cache: Dict[str, Any],
+    section: str,
+    params: str,
+    cluster_ids: List[int],
+    compute
+) -> Dict[int, Any]:
     """
-    print("Preprocessing text for all photos...")
+    Look up per-cluster results in the cache, computing only missing ones.
     
-    # Preprocess text for each row
-    df = df.copy()
-    df['processed_text'] = df.apply(combine_text_fields, axis=1)
+    Args:
+        cache: Cache dictionary from load_cluster_text_cache (updated in place)
+        section: Cache section ('rules' or 'itemsets')
+        params: Parameter string the results depend on
+        cluster_ids: Clusters to return results for
+        compute: Function mapping a list of cluster IDs to {cluster_id: result}
     
-    # Group by cluster and concatenate
-    cluster_texts = {}
-    for cluster_id, group in df.groupby('cluster'):
-        # Skip noise cluster (-1) if present
-        if cluster_id == -1:
-            continue
-        
-        texts = group['processed_text'].tolist()
-        combined = ' '.join([t for t in texts if t])
-        cluster_texts[cluster_id] = combined
+    Returns:
+        Dictionary mapping cluster ID to its (JSON-safe) result
+    """
+    entries = cache[section]
+    keys = {cid: f"{cache['hashes'][cid]}:{params}" for cid in cluster_ids}
+    missing = [cid for cid in cluster_ids if keys[cid] not in entries]
+    print(f"  {section.capitalize()}: {len(missing)} of {len(cluster_ids)} clusters recomputed")
     
-    print(f"Aggregated text for {len(cluster_texts)} clusters")
-    return cluster_texts
+    if missing:
+        for cid, result in compute(missing).items():
+            entries[keys[cid]] = _json_safe(result)
+    return {cid: entries[keys[cid]] for cid in cluster_ids}
+
+
+# =============================================================================
+# CLUSTER TEXT AGGREGATION
+# =============================================================================
+
+# Terms kept by the TF-IDF vectorizer: ASCII words of 2+ letters
+_TFIDF_TERM_PATTERN = re.compile(r'[a-zA-Z]{2,}')
+
+
+def photo_ngrams(
+    offsets: np.ndarray,
+    values: np.ndarray,
+    ngram_range: Tuple[int, int] = (1, 2),
+    ascii_only: bool = True,
+    photos: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    List the terms (tokens and their within-photo n-grams) of every photo.
+    
+    Args:
+        offsets: Token offsets per photo (see tokenize_text_column)
+        values: Flat token array
+        ngram_range: (min_n, max_n) n-gram sizes
+        ascii_only: Keep only tokens made of 2+ ASCII letters
+        photos: Optional boolean mask of photos to keep
+    
+    Returns:
+        Tuple of (terms, photo row of each term)
+    """
+    rows = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    if photos is not None:
+        selected = np.asarray(photos, dtype=bool)[rows]
+        values, rows = values[selected], rows[selected]
+    if ascii_only and len(values):
+        keep = pd.Series(values, dtype=object).str.fullmatch(_TFIDF_TERM_PATTERN).to_numpy(dtype=bool)
+        values, rows = values[keep], rows[keep]
+    
+    min_n, max_n = ngram_range
+    terms, term_rows = [np.array([], dtype=object)], [np.array([], dtype=np.int64)]
+    for size in range(min_n, max_n + 1):
+        n_grams = len(values) - size + 1
+        if n_grams <= 0:
+            break
+        # n-grams never span two photos
+        same_photo = rows[size - 1:] == rows[:n_grams]
+        grams = values[:n_grams]
+        for k in range(1, size):
+            grams = grams + ' ' + values[k:k + n_grams]
+        terms.append(grams[same_photo])
+        term_rows.append(rows[:n_grams][same_photo])
+    
+    return np.concatenate(terms), np.concatenate(term_rows)
+
+
+def build_photo_term_matrix(
+    df: pd.DataFrame,
+    ngram_range: Tuple[int, int] = (1, 2),
+    ascii_only: bool = True,
+    photos: Optional[np.ndarray] = None,
+    vocabulary: Optional[np.ndarray] = None
+) -> Tuple[csr_matrix, np.ndarray]:
+    """
+    Build a sparse photo × term count matrix over a global vocabulary.
+    
+    Terms are the cached photo tokens (restricted to ASCII words when
+    ascii_only, like the TF-IDF token pattern) and their n-grams within
+    each photo. Cluster × term counts are then a sparse product with the
+    cluster labels (see cluster_term_counts), so reclustering never
+    rebuilds any text.
+    
+    Args:
+        df: DataFrame with 'tags' and/or 'title' columns
+        ngram_range: (min_n, max_n) n-gram sizes
+        ascii_only: Keep only tokens made of 2+ ASCII letters
+        photos: Optional boolean mask; other photos get empty rows
+        vocabulary: Optional sorted term array to count into (other terms
+                    are ignored); built from the data if None
+    
+    Returns:
+        Tuple of (CSR matrix of shape (n_photos, n_terms), sorted term array)
+    """
+    offsets, values = get_photo_token_arrays(df)
+    terms, term_rows = photo_ngrams(offsets, values, ngram_range, ascii_only, photos=photos)
+    
+    if vocabulary is not None:
+        vocabulary = np.asarray(vocabulary, dtype=object)
+        codes = np.searchsorted(vocabulary, terms)
+        found = codes < len(vocabulary)
+        found[found] = vocabulary[codes[found]] == terms[found]
+        codes, term_rows = codes[found], term_rows[found]
+    elif not len(terms):
+        return csr_matrix((len(df), 0), dtype=np.int64), np.array([], dtype=object)
+    else:
+        codes, vocabulary = pd.factorize(terms, sort=True)
+        vocabulary = np.asarray(vocabulary, dtype=object)
+    
+    matrix = coo_matrix(
+        (np.ones(len(codes), dtype=np.int64), (term_rows, codes)),
+        shape=(len(df), len(vocabulary))
+    ).tocsr()  # duplicates are summed
+    return matrix, vocabulary
+
+
+def cluster_term_counts(
+    photo_terms: csr_matrix,
+    labels: np.ndarray
+) -> Tuple[np.ndarray, csr_matrix]:
+    """
+    Sum photo term counts per cluster with a sparse indicator product.
+    
+    Args:
+        photo_terms: Output matrix of build_photo_term_matrix
+        labels: Cluster label of each photo (-1 = noise, excluded)
+    
+    Returns:
+        Tuple of (sorted cluster IDs, CSR matrix of shape (n_clusters, n_terms))
+    """
+    labels = np.asarray(labels)
+    clustered = np.flatnonzero(labels != -1)
+    cluster_ids, codes = np.unique(labels[clustered], return_inverse=True)
+    indicator = csr_matrix(
+        (np.ones(len(clustered), dtype=np.int64), (codes, clustered)),
+        shape=(len(cluster_ids), len(labels))
+    )
+    return cluster_ids, (indicator @ photo_terms).tocsr()
 
 
 # =============================================================================
 # TF-IDF ANALYSIS
 # =============================================================================
 
-def compute_tfidf_descriptors(
-    cluster_texts: Dict[int, str],
+def extract_top_terms(
+    tfidf_matrix: csr_matrix,
+    feature_names: np.ndarray,
+    cluster_ids: List[int],
+    top_n: int = 10
+) -> Dict[int, List[Tuple[str, float]]]:
+    """
+    Extract the top-scoring terms of each cluster row of a TF-IDF matrix.
+    
+    Works on the CSR arrays directly: all nonzero entries are sorted once by
+    (row, score descending, column), and the first top_n of each row segment
+    are kept. Ties are broken by column order (alphabetical).
+    
+    Args:
+        tfidf_matrix: Sparse matrix with one row per cluster
+        feature_names: Term of each column
+        cluster_ids: Cluster ID of each row
+        top_n: Number of top terms to extract per cluster
+    
+    Returns:
+        Dictionary mapping cluster ID to list of (term, score) tuples
+    """
+    tfidf_matrix = csr_matrix(tfidf_matrix)
+    n_rows = tfidf_matrix.shape[0]
+    rows = np.repeat(np.arange(n_rows), np.diff(tfidf_matrix.indptr))
+    scores, columns = tfidf_matrix.data, tfidf_matrix.indices
+    
+    positive = scores > 0
+    rows, scores, columns = rows[positive], scores[positive], columns[positive]
+    order = np.lexsort((columns, -scores, rows))
+    rows, scores, columns = rows[order], scores[order], columns[order]
+    
+    # Rank of each entry within its row segment
+    row_starts = np.searchsorted(rows, np.arange(n_rows))
+    rank = np.arange(len(rows)) - row_starts[rows]
+    top = rank < top_n
+    rows, scores, columns = rows[top], scores[top], columns[top]
+    bounds = np.searchsorted(rows, np.arange(n_rows + 1))
+    
+    feature_names = np.asarray(feature_names)
+    descriptors = {}
+    for idx, cluster_id in enumerate(cluster_ids):
+        a, b = bounds[idx], bounds[idx + 1]
+        descriptors[cluster_id] = [
+            (feature_names[c], float(score))
+            for c, score in zip(columns[a:b], scores[a:b])
+        ]
+    
+    return descriptors
+
+
+def tfidf_from_counts(
+    counts: csr_matrix,
+    vocabulary: np.ndarray,
+    min_df: int = 2,
+    max_df: float = 0.8,
+    max_features: Optional[int] = 5000
+) -> Tuple[csr_matrix, np.ndarray]:
+    """
+    Apply TfidfVectorizer's term pruning and weighting to a count matrix.
+    
+    Same rules as TfidfVectorizer with default settings: terms outside
+    [min_df, max_df] document frequency are dropped, the max_features most
+    frequent are kept, then smoothed IDF weighting and L2 row normalization.
+    
+    Args:
+        counts: Sparse document × term count matrix
+        vocabulary: Sorted term of each column
+        min_df: Minimum document frequency (int: count, float: ratio)
+        max_df: Maximum document frequency (int: count, float: ratio)
+        max_features: Maximum number of terms kept (None = all)
+    
+    Returns:
+        Tuple of (TF-IDF CSR matrix, kept terms)
+    
+    Raises:
+        ValueError: If no terms remain after pruning
+    """
+    counts = csr_matrix(counts, dtype=np.float64)
+    n_docs = counts.shape[0]
+    doc_freq = np.bincount(counts.indices, minlength=counts.shape[1])
+    
+    max_doc_count = max_df if isinstance(max_df, (int, np.integer)) else max_df * n_docs
+    min_doc_count = min_df if isinstance(min_df, (int, np.integer)) else min_df * n_docs
+    if max_doc_count < min_doc_count:
+        raise ValueError("max_df corresponds to < documents than min_df")
+    
+    mask = (doc_freq > 0) & (doc_freq <= max_doc_count) & (doc_freq >= min_doc_count)
+    if max_features is not None and mask.sum() > max_features:
+        term_freq = np.asarray(counts.sum(axis=0)).ravel()
+        kept = np.flatnonzero(mask)[(-term_freq[mask]).argsort()[:max_features]]
+        mask = np.zeros(len(mask), dtype=bool)
+        mask[kept] = True
+    if not mask.any():
+        raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+    
+    counts = counts[:, np.flatnonzero(mask)]
+    doc_freq = doc_freq[mask]
+    idf = np.log((1 + n_docs) / (1 + doc_freq)) + 1
+    
+    tfidf = csr_matrix(counts.multiply(idf))
+    norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    tfidf = csr_matrix(tfidf.multiply(1 / norms[:, None]))
+    return tfidf, vocabulary[mask]
+
+
+def compute_cluster_tfidf_descriptors(
+    df: pd.DataFrame,
     top_n: int = 10,
     min_df: int = 2,
-    max_df: float = 0.8
+    max_df: float = 0.8,
+    cache: Optional[Dict[str, Any]] = None
 ) -> Dict[int, List[Tuple[str, float]]]:
     """
-    Compute TF-IDF descriptors for each cluster.
+    Compute TF-IDF descriptors for each cluster from the photo term matrix.
+    
+    Same weighting as scikit-learn's TfidfVectorizer over one document per
+    cluster, except that bigrams are only formed within a photo, never
+    across the boundary between two photos' texts.
     
     Args:
-        cluster_texts: Dictionary mapping cluster ID to aggregated text
+        df: DataFrame with 'cluster', 'tags', and 'title' columns
         top_n: Number of top terms to extract per cluster
         min_df: Minimum document frequency (ignore rare terms)
         max_df: Maximum document frequency ratio (ignore too common terms)
+        cache: Optional cluster text cache (see load_cluster_text_cache);
+               term counts are then only computed for clusters whose
+               membership changed
     
     Returns:
         Dictionary mapping cluster ID to list of (term, score) tuples
     """
     print(f"Computing TF-IDF (top {top_n} terms per cluster)...")
+    labels = df['cluster'].to_numpy()
     
-    # Prepare documents and maintain cluster ID mapping
-    cluster_ids = sorted(cluster_texts.keys())
-    documents = [cluster_texts[cid] for cid in cluster_ids]
-    
-    # Create TF-IDF vectorizer
-    vectorizer = TfidfVectorizer(
-        min_df=min_df,
-        max_df=max_df,
-        max_features=5000,
-        ngram_range=(1, 2),  # Include bigrams for more context
-        token_pattern=r'(?u)\b[a-zA-Z]{2,}\b'  # Only words, min 2 chars
-    )
+    if cache is not None:
+        cluster_ids, counts, vocabulary = cached_cluster_term_counts(df, cache)
+    else:
+        photo_terms, vocabulary = build_photo_term_matrix(df, ngram_range=(1, 2))
+        cluster_ids, counts = cluster_term_counts(photo_terms, labels)
+        print(f"Term matrix: {photo_terms.shape[0]:,} photos × {photo_terms.shape[1]:,} terms")
     
     try:
-        tfidf_matrix = vectorizer.fit_transform(documents)
+        tfidf_matrix, feature_names = tfidf_from_counts(counts, vocabulary, min_df=min_df, max_df=max_df)
     except ValueError as e:
         print(f"Warning: TF-IDF failed with error: {e}")
         print("Trying with relaxed parameters...")
-        vectorizer = TfidfVectorizer(
-            min_df=1,
-            max_df=1.0,
-            max_features=5000
-        )
-        tfidf_matrix = vectorizer.fit_transform(documents)
+        photo_terms, vocabulary = build_photo_term_matrix(df, ngram_range=(1, 1), ascii_only=False)
+        cluster_ids, counts = cluster_term_counts(photo_terms, labels)
+        tfidf_matrix, feature_names = tfidf_from_counts(counts, vocabulary, min_df=1, max_df=1.0)
     
-    feature_names = vectorizer.get_feature_names_out()
-    
-    # Extract top terms for each cluster
-    descriptors = {}
-    for idx, cluster_id in enumerate(cluster_ids):
-        # Get TF-IDF scores for this cluster
-        scores = tfidf_matrix[idx].toarray().flatten()
-        
-        # Get indices of top terms
-        top_indices = scores.argsort()[-top_n:][::-1]
-        
-        # Build list of (term, score) tuples
-        top_terms = [
-            (feature_names[i], float(scores[i]))
-            for i in top_indices
-            if scores[i] > 0
-        ]
-        
-        descriptors[cluster_id] = top_terms
+    descriptors = extract_top_terms(tfidf_matrix, feature_names, cluster_ids.tolist(), top_n=top_n)
     
     print(f"Generated descriptors for {len(descriptors)} clusters")
     return descriptors
@@ -356,14 +942,221 @@ def get_simple_term_frequencies(
     return term_freqs
 
 
+# =============================================================================
+# STREAMING TF-IDF
+# =============================================================================
+
+def iter_cluster_text_chunks(
+    path: Path,
+    chunk_size: int = STREAMING_CHUNK_SIZE
+):
+    """
+    Read the cluster, tags and title columns of a clustered file in chunks.
+    
+    Args:
+        path: Clustered photos as Parquet or CSV
+        chunk_size: Number of photos per chunk
+    
+    Yields:
+        DataFrames with 'cluster', 'tags' and 'title' columns
+    """
+    path = Path(path)
+    if path.suffix == '.parquet':
+        import pyarrow.parquet as pq
+        
+        parquet_file = pq.ParquetFile(path)
+        columns = [c for c in ('cluster', 'tags', 'title') if c in parquet_file.schema_arrow.names]
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(
+            path,
+            usecols=lambda c: c in ('cluster', 'tags', 'title'),
+            dtype={'tags': object, 'title': object},
+            chunksize=chunk_size
+        )
+
+
+def hash_terms(terms: np.ndarray, n_features: int = HASH_FEATURES) -> np.ndarray:
+    """
+    Map terms to columns of a fixed-size hashed feature space.
+    
+    Args:
+        terms: Term strings
+        n_features: Number of hashed columns
+    
+    Returns:
+        Column index of each term
+    """
+    return (pd.util.hash_array(np.asarray(terms, dtype=object)) % np.uint64(n_features)).astype(np.int64)
+
+
+def stream_cluster_term_counts(
+    path: Path,
+    n_features: int = HASH_FEATURES,
+    chunk_size: int = STREAMING_CHUNK_SIZE,
+    ngram_range: Tuple[int, int] = (1, 2)
+) -> Tuple[np.ndarray, csr_matrix, np.ndarray, Dict[int, int]]:
+    """
+    Accumulate cluster × hashed term counts over a file read in chunks.
+    
+    Each chunk is tokenized on its own and its terms are hashed into
+    n_features columns, so memory depends on the chunk size, the number of
+    clusters and n_features, never on the corpus size. Each column keeps
+    one surface term for display: the term seen most often in a chunk, with
+    its running count (a bounded heavy-hitter map, at most n_features terms).
+    
+    Args:
+        path: Clustered photos as Parquet or CSV
+        n_features: Number of hashed columns
+        chunk_size: Number of photos per chunk
+        ngram_range: (min_n, max_n) n-gram sizes
+    
+    Returns:
+        Tuple of (sorted cluster IDs, CSR count matrix over the used columns,
+        surface term of each used column (sorted), photos per cluster)
+    """
+    cluster_index: Dict[int, int] = {}
+    cluster_sizes: Dict[int, int] = {}
+    counts = csr_matrix((0, n_features), dtype=np.int64)
+    feature_terms = np.full(n_features, None, dtype=object)
+    feature_counts = np.zeros(n_features, dtype=np.int64)
+    n_photos = 0
+    
+    for chunk in iter_cluster_text_chunks(path, chunk_size=chunk_size):
+        n_photos += len(chunk)
+        labels = chunk['cluster'].to_numpy()
+        for cid, size in zip(*np.unique(labels[labels != -1], return_counts=True)):
+            cluster_index.setdefault(int(cid), len(cluster_index))
+            cluster_sizes[int(cid)] = cluster_sizes.get(int(cid), 0) + int(size)
+        
+        offsets, values = tokenize_text_column(chunk)
+        terms, term_rows = photo_ngrams(offsets, values, ngram_range, photos=labels != -1)
+        if not len(terms):
+            continue
+        features = hash_terms(terms, n_features)
+        rows = pd.Series(labels[term_rows]).map(cluster_index).to_numpy(dtype=np.int64)
+        
+        counts.resize((len(cluster_index), n_features))
+        counts = counts + coo_matrix(
+            (np.ones(len(features), dtype=np.int64), (rows, features)),
+            shape=(len(cluster_index), n_features)
+        ).tocsr()  # duplicates are summed
+        
+        # Most frequent term of each column in this chunk
+        term_counts = pd.Series(terms).value_counts(sort=False)
+        top = pd.DataFrame({
+            'term': term_counts.index.to_numpy(dtype=object),
+            'count': term_counts.to_numpy(),
+            'feature': hash_terms(term_counts.index.to_numpy(dtype=object), n_features),
+        }).sort_values(['count', 'term'], ascending=[False, True]).drop_duplicates('feature')
+        col, term, count = top['feature'].to_numpy(), top['term'].to_numpy(dtype=object), top['count'].to_numpy()
+        same = feature_terms[col] == term
+        feature_counts[col[same]] += count[same]
+        replace = ~same & (count > feature_counts[col])
+        feature_terms[col[replace]] = term[replace]
+        feature_counts[col[replace]] = count[replace]
+    
+    print(f"Streamed {n_photos:,} photos into {n_features:,} hashed term columns")
+    
+    # Keep used columns only, ordered by surface term like a vocabulary
+    used = np.flatnonzero(np.bincount(counts.indices, minlength=n_features) > 0)
+    used = used[np.argsort(feature_terms[used].astype(str), kind='stable')]
+    
+    cluster_ids = np.array(sorted(cluster_index), dtype=np.int64)
+    order = np.array([cluster_index[cid] for cid in cluster_ids], dtype=np.int64)
+    counts = counts[order][:, used].tocsr()
+    
+    cluster_sizes = {cid: cluster_sizes[cid] for cid in cluster_ids.tolist()}
+    return cluster_ids, counts, feature_terms[used], cluster_sizes
+
+
+def compute_streaming_tfidf_descriptors(
+    path: Path,
+    top_n: int = 10,
+    min_df: int = 2,
+    max_df: float = 0.8,
+    n_features: int = HASH_FEATURES,
+    chunk_size: int = STREAMING_CHUNK_SIZE
+) -> Tuple[Dict[int, List[Tuple[str, float]]], Dict[int, int]]:
+    """
+    Compute TF-IDF descriptors without loading the whole corpus.
+    
+    Same weighting as compute_cluster_tfidf_descriptors, over hashed term
+    columns accumulated chunk by chunk (see stream_cluster_term_counts).
+    Terms sharing a column are merged and shown under the dominant one.
+    
+    Args:
+        path: Clustered photos as Parquet or CSV
+        top_n: Number of top terms to extract per cluster
+        min_df: Minimum document frequency (ignore rare terms)
+        max_df: Maximum document frequency ratio (ignore too common terms)
+        n_features: Number of hashed term columns
+        chunk_size: Number of photos read per chunk
+    
+    Returns:
+        Tuple of (descriptors per cluster, photos per cluster)
+    """
+    print(f"Computing streaming TF-IDF (top {top_n} terms per cluster, chunks of {chunk_size:,})...")
+    cluster_ids, counts, vocabulary, cluster_sizes = stream_cluster_term_counts(
+        path, n_features=n_features, chunk_size=chunk_size
+    )
+    
+    try:
+        tfidf_matrix, feature_names = tfidf_from_counts(counts, vocabulary, min_df=min_df, max_df=max_df)
+    except ValueError as e:
+        print(f"Warning: TF-IDF failed with error: {e}")
+        print("Trying with relaxed parameters...")
+        tfidf_matrix, feature_names = tfidf_from_counts(counts, vocabulary, min_df=1, max_df=1.0)
+    
+    descriptors = extract_top_terms(tfidf_matrix, feature_names, cluster_ids.tolist(), top_n=top_n)
+    
+    print(f"Generated descriptors for {len(descriptors)} clusters")
+    return descriptors, cluster_sizes
+
+
 # =============================================================================
 # ASSOCIATION RULES MINING
 # =============================================================================
 
+def build_transaction_matrix(
+    df: pd.DataFrame,
+    min_terms: int = 2
+) -> Tuple[csr_matrix, np.ndarray, np.ndarray]:
+    """
+    Encode every photo as a sparse transaction over integer term ids.
+    
+    Duplicate tokens within a photo are dropped. Each stored value is the
+    1-based position of the token's first occurrence in the photo, which
+    keeps the term order needed for frequency ties in filter_top_terms.
+    
+    Args:
+        df: DataFrame with 'tags' and/or 'title' columns
+        min_terms: Minimum number of distinct terms for a valid transaction
+    
+    Returns:
+        Tuple of (CSR matrix of shape (n_photos, n_terms), sorted term
+        array, boolean mask of valid transactions)
+    """
+    offsets, values = get_photo_token_arrays(df)
+    codes, vocabulary = pd.factorize(values, sort=True)
+    vocabulary = np.asarray(vocabulary, dtype=object)
+    rows = np.repeat(np.arange(len(df)), np.diff(offsets))
+    
+    # First occurrence of each (photo, term) pair
+    _, first = np.unique(rows * max(len(vocabulary), 1) + codes, return_index=True)
+    rows, codes = rows[first], codes[first]
+    positions = first - offsets[rows] + 1
+    
+    matrix = csr_matrix((positions, (rows, codes)), shape=(len(df), len(vocabulary)))
+    valid = np.diff(matrix.indptr) >= min_terms
+    return matrix, vocabulary, valid
+
+
 def get_cluster_transactions(
     df: pd.DataFrame,
     min_terms: int = 2
-) -> Dict[int, List[List[str]]]:
+) -> Tuple[Dict[int, csr_matrix], np.ndarray]:
     """
     Convert cluster data into transactions for association rules mining.
     Each photo becomes a transaction with its terms as items.
@@ -373,76 +1166,111 @@ def get_cluster_transactions(
         min_terms: Minimum number of terms required for a valid transaction
     
     Returns:
-        Dictionary mapping cluster ID to list of transactions (term lists)
+        Tuple of (dictionary mapping cluster ID to a sparse transaction
+        matrix, see build_transaction_matrix; shared term array)
     """
     print("Converting cluster data to transactions...")
     
-    df = df.copy()
-    df['processed_text'] = df.apply(combine_text_fields, axis=1)
+    matrix, vocabulary, valid = build_transaction_matrix(df, min_terms=min_terms)
+    labels = df['cluster'].to_numpy()
     
-    cluster_transactions = {}
+    # Valid, non-noise photos grouped by cluster (photo order kept)
+    rows = np.flatnonzero(valid & (labels != -1))
+    rows = rows[np.argsort(labels[rows], kind='stable')]
+    cluster_ids, starts = np.unique(labels[rows], return_index=True)
+    ends = np.append(starts[1:], len(rows))
     
-    for cluster_id, group in df.groupby('cluster'):
-        if cluster_id == -1:  # Skip noise
-            continue
-        
-        transactions = []
-        for text in group['processed_text']:
-            if text:
-                tokens = text.split()
-                # Remove duplicates within a transaction
-                unique_tokens = list(dict.fromkeys(tokens))
-                if len(unique_tokens) >= min_terms:
-                    transactions.append(unique_tokens)
-        
-        if transactions:
-            cluster_transactions[cluster_id] = transactions
+    cluster_transactions = {
+        cluster_id: matrix[rows[a:b]]
+        for cluster_id, a, b in zip(cluster_ids.tolist(), starts, ends)
+    }
     
     print(f"Created transactions for {len(cluster_transactions)} clusters")
-    return cluster_transactions
+    return cluster_transactions, vocabulary
+
+
+def encode_transactions(transactions: List[List[str]]) -> Tuple[csr_matrix, np.ndarray]:
+    """
+    Encode term-list transactions in the sparse format of get_cluster_transactions.
+    
+    Args:
+        transactions: List of transactions (each is a list of distinct terms)
+    
+    Returns:
+        Tuple of (sparse transaction matrix, sorted term array)
+    """
+    lengths = np.array([len(t) for t in transactions], dtype=np.int64)
+    values = np.array([term for t in transactions for term in t], dtype=object)
+    codes, vocabulary = pd.factorize(values, sort=True)
+    positions = np.arange(len(values)) - np.repeat(np.cumsum(lengths) - lengths, lengths) + 1
+    matrix = csr_matrix(
+        (positions, (np.repeat(np.arange(len(transactions)), lengths), codes)),
+        shape=(len(transactions), len(vocabulary))
+    )
+    return matrix, np.asarray(vocabulary, dtype=object)
+
+
+def filter_top_terms(
+    transactions: csr_matrix,
+    max_terms: int = 100
+) -> Tuple[csr_matrix, np.ndarray]:
+    """
+    Keep the max_terms most frequent terms and the transactions still non-empty.
+    
+    Frequency ties are broken by first occurrence (transaction order, then
+    position in the photo), like Counter.most_common on the term lists.
+    
+    Args:
+        transactions: Sparse transaction matrix (values = term positions)
+        max_terms: Maximum number of terms to keep
+    
+    Returns:
+        Tuple of (binary CSR matrix of the kept rows × kept terms, kept term
+        ids in ascending order)
+    """
+    transactions = csr_matrix(transactions)
+    counts = np.bincount(transactions.indices, minlength=transactions.shape[1])
+    
+    rows = np.repeat(np.arange(transactions.shape[0]), np.diff(transactions.indptr))
+    order_key = rows * (int(transactions.data.max(initial=0)) + 1) + transactions.data
+    first_seen = np.full(transactions.shape[1], np.iinfo(np.int64).max)
+    np.minimum.at(first_seen, transactions.indices, order_key)
+    
+    present = np.flatnonzero(counts)
+    top = present[np.lexsort((first_seen[present], -counts[present]))[:max_terms]]
+    term_ids = np.sort(top)
+    
+    filtered = transactions[:, term_ids]
+    filtered = filtered[np.diff(filtered.indptr) > 0]
+    filtered.data = np.ones_like(filtered.data, dtype=bool)
+    return filtered, term_ids
 
 
 def get_cluster_term_matrix(
-    transactions: List[List[str]],
+    transactions: csr_matrix,
+    vocabulary: np.ndarray,
     max_terms: int = 100
 ) -> pd.DataFrame:
     """
-    Convert transactions to a binary term matrix suitable for apriori/fpgrowth.
+    Convert transactions to a sparse boolean term matrix for apriori/fpgrowth.
     
     Args:
-        transactions: List of transactions (each is a list of terms)
+        transactions: Sparse transaction matrix of one cluster
+        vocabulary: Term of each column
         max_terms: Maximum number of terms to consider (by frequency)
     
     Returns:
-        Binary DataFrame with terms as columns
+        Boolean DataFrame (pandas sparse dtype) with terms as columns
     """
-    if not transactions:
+    if transactions.shape[0] == 0:
         return pd.DataFrame()
     
-    # Get term frequencies to filter
-    all_terms = []
-    for t in transactions:
-        all_terms.extend(t)
-    term_counts = Counter(all_terms)
-    
-    # Keep only top terms
-    top_terms = {term for term, _ in term_counts.most_common(max_terms)}
-    
-    # Filter transactions
-    filtered_transactions = [
-        [term for term in t if term in top_terms]
-        for t in transactions
-    ]
-    filtered_transactions = [t for t in filtered_transactions if t]
+    filtered, term_ids = filter_top_terms(transactions, max_terms=max_terms)
     
-    if not filtered_transactions:
+    if filtered.shape[0] == 0:
         return pd.DataFrame()
     
-    # Encode transactions
-    te = TransactionEncoder()
-    te_array = te.fit_transform(filtered_transactions)
-    
-    return pd.DataFrame(te_array, columns=te.columns_)
+    return pd.DataFrame.sparse.from_spmatrix(filtered, columns=list(vocabulary[term_ids]))
 
 
 def compute_frequent_itemsets(
@@ -519,147 +1347,718 @@ def compute_association_rules(
         return pd.DataFrame()
 
 
+# =============================================================================
+# BITSET ITEMSET MINER
+# =============================================================================
+
+ITEMSET_MINERS = ['bitset', 'mlxtend']
+
+
+def encode_transaction_bitsets(
+    transactions: csr_matrix,
+    vocabulary: np.ndarray,
+    max_terms: int = 100
+) -> Tuple[List[str], np.ndarray, int]:
+    """
+    Pack each term's transaction set into a bit array.
+    
+    Same term selection as get_cluster_term_matrix (see filter_top_terms);
+    bits are set straight from the sparse entries.
+    
+    Args:
+        transactions: Sparse transaction matrix of one cluster
+        vocabulary: Term of each column
+        max_terms: Maximum number of terms to consider (by frequency)
+    
+    Returns:
+        Tuple of (sorted terms, uint64 array of shape (n_terms, n_words)
+        where bit t of row i is set if transaction t contains terms[i],
+        number of transactions)
+    """
+    filtered, term_ids = filter_top_terms(transactions, max_terms=max_terms)
+    n_transactions = filtered.shape[0]
+    
+    coo = filtered.tocoo()
+    bits = np.zeros((len(term_ids), -(-n_transactions // 64)), dtype=np.uint64)
+    np.bitwise_or.at(
+        bits,
+        (coo.col, coo.row // 64),
+        np.left_shift(np.uint64(1), (coo.row % 64).astype(np.uint64))
+    )
+    return list(vocabulary[term_ids]), bits, n_transactions
+
+
+# Bits set in each byte value, for popcount on numpy < 2.0 (no np.bitwise_count)
+_BYTE_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+
+def _popcount_rows(words: np.ndarray) -> np.ndarray:
+    """Number of set bits in each row of a uint64 array."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    as_bytes = np.ascontiguousarray(words).view(np.uint8).reshape(len(words), -1)
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=1, dtype=np.int64)
+
+
+def _support_counts(bits: np.ndarray, *itemsets: np.ndarray, chunk_size: int = 4096) -> np.ndarray:
+    """Popcount of the AND of the given term rows, one itemset per position."""
+    counts = np.empty(len(itemsets[0]), dtype=np.int64)
+    for start in range(0, len(counts), chunk_size):
+        chunk = slice(start, start + chunk_size)
+        joint = bits[itemsets[0][chunk]]
+        for items in itemsets[1:]:
+            joint = joint & bits[items[chunk]]
+        counts[chunk] = _popcount_rows(joint)
+    return counts
+
+
+def mine_bitset_itemsets(
+    bits: np.ndarray,
+    n_transactions: int,
+    min_support: float,
+    max_len: int = 3
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Find frequent 1-, 2- and 3-itemsets by vectorized AND + popcount.
+    
+    Uses the same support test as mlxtend's fpgrowth, so the itemsets are
+    identical to compute_frequent_itemsets(..., max_len=max_len).
+    
+    Args:
+        bits: Term bit arrays from encode_transaction_bitsets
+        n_transactions: Number of transactions
+        min_support: Minimum support threshold (0-1)
+        max_len: Maximum itemset length (2 or 3)
+    
+    Returns:
+        List of (items, supports) per itemset length 1..3, where items is an
+        int array of shape (n_itemsets, length) with ascending term indices
+        (the 3-itemset level is empty when max_len is 2)
+    """
+    min_count = math.ceil(min_support * n_transactions)
+    
+    def frequent(counts):
+        return (counts >= min_count) & (counts / float(n_transactions) >= min_support)
+    
+    n_terms = len(bits)
+    singles = np.arange(n_terms)
+    counts = _support_counts(bits, singles)
+    keep = frequent(counts)
+    levels = [(singles[keep][:, None], counts[keep] / float(n_transactions))]
+    
+    # Pairs of frequent terms
+    first, second = np.triu_indices(keep.sum(), k=1)
+    a, b = singles[keep][first], singles[keep][second]
+    counts = _support_counts(bits, a, b)
+    keep = frequent(counts)
+    a, b = a[keep], b[keep]
+    levels.append((np.column_stack([a, b]), counts[keep] / float(n_transactions)))
+    if max_len < 3:
+        levels.append((np.empty((0, 3), dtype=np.int64), np.empty(0)))
+        return levels
+    
+    # Triples whose three pairs are all frequent
+    frequent_pair = np.zeros((n_terms, n_terms), dtype=bool)
+    frequent_pair[a, b] = True
+    candidates = frequent_pair[a] & frequent_pair[b]
+    pair_idx, c = np.nonzero(candidates)
+    a, b = a[pair_idx], b[pair_idx]
+    counts = _support_counts(bits, a, b, c)
+    keep = frequent(counts)
+    levels.append((np.column_stack([a[keep], b[keep], c[keep]]), counts[keep] / float(n_transactions)))
+    
+    return levels
+
+
+def bitset_association_rules(
+    levels: List[Tuple[np.ndarray, np.ndarray]],
+    n_terms: int,
+    min_confidence: float = 0.5
+) -> Dict[str, np.ndarray]:
+    """
+    Derive association rules (confidence, lift) from bitset itemsets.
+    
+    Every split of a frequent 2- or 3-itemset into antecedent -> consequent
+    is scored with mlxtend's formulas, so values match association_rules().
+    
+    Args:
+        levels: Output of mine_bitset_itemsets
+        n_terms: Number of terms
+        min_confidence: Minimum confidence threshold
+    
+    Returns:
+        Dictionary of equal-length arrays: antecedent and consequent (term
+        indices padded with -1 to 2 columns), support, confidence, lift
+    """
+    # Support lookup by itemset
+    support_1 = np.zeros(n_terms)
+    support_2 = np.zeros((n_terms, n_terms))
+    (single, s1), (pairs, s2), (triples, s3) = levels
+    support_1[single[:, 0]] = s1
+    support_2[pairs[:, 0], pairs[:, 1]] = s2
+    num_itemsets = len(s1) + len(s2) + len(s3)
+    
+    pad = lambda items: np.column_stack([items, np.full(len(items), -1)])
+    a, b = pairs[:, 0], pairs[:, 1]
+    x, y, z = triples[:, 0], triples[:, 1], triples[:, 2]
+    # (antecedent, consequent, sAC, sA, sC) for each way to split an itemset
+    splits = [
+        (pad(a), pad(b), s2, support_1[a], support_1[b]),
+        (pad(b), pad(a), s2, support_1[b], support_1[a]),
+        (pad(x), np.column_stack([y, z]), s3, support_1[x], support_2[y, z]),
+        (pad(y), np.column_stack([x, z]), s3, support_1[y], support_2[x, z]),
+        (pad(z), np.column_stack([x, y]), s3, support_1[z], support_2[x, y]),
+        (np.column_stack([x, y]), pad(z), s3, support_2[x, y], support_1[z]),
+        (np.column_stack([x, z]), pad(y), s3, support_2[x, z], support_1[y]),
+        (np.column_stack([y, z]), pad(x), s3, support_2[y, z], support_1[x]),
+    ]
+    
+    antecedent = np.concatenate([split[0] for split in splits]).reshape(-1, 2)
+    consequent = np.concatenate([split[1] for split in splits]).reshape(-1, 2)
+    support_ac, support_a, support_c = (np.concatenate([split[i] for split in splits]) for i in (2, 3, 4))
+    
+    # mlxtend scales both supports by the itemset count before dividing
+    confidence = (support_ac * num_itemsets) / (support_a * num_itemsets)
+    lift = confidence / support_c
+    keep = confidence >= min_confidence
+    
+    return {
+        'antecedent': antecedent[keep],
+        'consequent': consequent[keep],
+        'support': support_ac[keep],
+        'confidence': confidence[keep],
+        'lift': lift[keep],
+    }
+
+
+def _term_names(terms: List[str], items: np.ndarray) -> List[str]:
+    """Term names of a -1 padded index row."""
+    return [terms[i] for i in items if i >= 0]
+
+
+def _top_itemsets(
+    levels: List[Tuple[np.ndarray, np.ndarray]],
+    top_n: int,
+    min_length: int = 1
+) -> List[Tuple[np.ndarray, float]]:
+    """Top itemsets of at least min_length items by support (ties: sorted items)."""
+    items = np.concatenate([
+        np.column_stack([level, np.full((len(level), 3 - level.shape[1]), -1)])
+        for level, _ in levels[min_length - 1:]
+    ])
+    supports = np.concatenate([support for _, support in levels[min_length - 1:]])
+    order = np.lexsort((items[:, 2], items[:, 1], items[:, 0], -supports))[:top_n]
+    return [(items[i], supports[i]) for i in order]
+
+
+# =============================================================================
+# PAIR CO-OCCURRENCE RULES
+# =============================================================================
+
+def compute_pair_rules(
+    cluster_transactions: Dict[int, csr_matrix],
+    vocabulary: np.ndarray,
+    min_confidence: float = 0.3,
+    top_n_rules: int = 10,
+    max_terms: int = 50,
+    min_transactions: int = 10
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Mine 1 -> 1 association rules for all clusters in one vectorized pass.
+    
+    Per-cluster term selection, adaptive support and rule scoring are the
+    same as mine_cluster_rules(..., max_len=2), but nothing loops over
+    clusters: every (cluster, term) gets its own column, so Yᵀ Y of the
+    photo × (cluster, term) indicator matrix Y is block diagonal and holds
+    the pair co-occurrence counts of all clusters at once.
+    
+    Args:
+        cluster_transactions: Dictionary mapping cluster ID to sparse transactions
+        vocabulary: Term of each transaction column
+        min_confidence: Minimum confidence for rules
+        top_n_rules: Maximum number of rules (or fallback itemsets) per cluster
+        max_terms: Most frequent terms kept per cluster
+        min_transactions: Clusters with fewer transactions get no rules
+    
+    Returns:
+        Dictionary mapping cluster ID to list of rule dictionaries
+    """
+    from scipy.sparse import vstack, triu
+    
+    cluster_ids = list(cluster_transactions)
+    cluster_rules = {cluster_id: [] for cluster_id in cluster_ids}
+    blocks = [cluster_transactions[cid] for cid in cluster_ids]
+    n_rows = np.array([block.shape[0] for block in blocks], dtype=np.int64)
+    if not blocks or n_rows.sum() == 0:
+        return cluster_rules
+    
+    matrix = csr_matrix(vstack(blocks, format='csr'))
+    n_terms = matrix.shape[1]
+    row_cluster = np.repeat(np.arange(len(blocks)), n_rows)
+    local_row = np.arange(len(row_cluster)) - np.repeat(np.cumsum(n_rows) - n_rows, n_rows)
+    
+    # One entry per (photo, term); key identifies the (cluster, term) column
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    cluster = row_cluster[rows]
+    key = cluster * n_terms + matrix.indices
+    order_key = local_row[rows] * (int(matrix.data.max(initial=0)) + 1) + matrix.data
+    
+    # Per-cluster top terms, ties by first occurrence (as filter_top_terms)
+    keys, inverse, counts = np.unique(key, return_inverse=True, return_counts=True)
+    first_seen = np.full(len(keys), np.iinfo(np.int64).max)
+    np.minimum.at(first_seen, inverse, order_key)
+    key_cluster, term = np.divmod(keys, n_terms)
+    ranked = np.lexsort((first_seen, -counts, key_cluster))
+    rank = np.empty(len(keys), dtype=np.int64)
+    rank[ranked] = np.arange(len(keys)) - np.searchsorted(key_cluster[ranked], key_cluster[ranked])
+    top_term = rank < max_terms
+    
+    # Transactions left with at least one top term, per cluster
+    kept = top_term[inverse]
+    row_kept = np.bincount(rows[kept], minlength=matrix.shape[0]) > 0
+    n_transactions = np.bincount(row_cluster[row_kept], minlength=len(blocks))
+    
+    # Adaptive support (as mine_cluster_rules) and fpgrowth's support test
+    min_support = np.maximum(0.02, np.minimum(0.1, 5 / np.maximum(n_rows, 1)))
+    min_count = np.ceil(min_support * n_transactions)
+    eligible = (n_rows >= min_transactions) & (n_transactions > 0)
+    
+    def frequent(counts, clusters):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            support = counts / n_transactions[clusters].astype(float)
+        ok = eligible[clusters] & (counts >= min_count[clusters]) & (support >= min_support[clusters])
+        return ok, support
+    
+    single_ok, single_support = frequent(counts, key_cluster)
+    single_ok &= top_term
+    
+    # Pair counts from the block-diagonal Gram matrix of frequent single columns
+    columns = np.flatnonzero(single_ok)
+    entry_column = np.searchsorted(columns, inverse)
+    in_columns = single_ok[inverse]
+    indicator = csr_matrix(
+        (np.ones(in_columns.sum(), dtype=np.int64), (rows[in_columns], entry_column[in_columns])),
+        shape=(matrix.shape[0], len(columns))
+    )
+    pairs = triu(indicator.T @ indicator, k=1).tocoo()
+    a, b, pair_counts = columns[pairs.row], columns[pairs.col], pairs.data
+    pair_cluster = key_cluster[a]
+    pair_ok, pair_support = frequent(pair_counts, pair_cluster)
+    a, b, pair_cluster, pair_support = a[pair_ok], b[pair_ok], pair_cluster[pair_ok], pair_support[pair_ok]
+    
+    n_itemsets = (
+        np.bincount(key_cluster[single_ok], minlength=len(blocks))
+        + np.bincount(pair_cluster, minlength=len(blocks))
+    )
+    
+    # Both directions of every frequent pair; mlxtend's confidence formula
+    antecedent = np.concatenate([a, b])
+    consequent = np.concatenate([b, a])
+    rule_cluster = np.concatenate([pair_cluster, pair_cluster])
+    support_ac = np.concatenate([pair_support, pair_support])
+    n_sets = n_itemsets[rule_cluster]
+    confidence = (support_ac * n_sets) / (single_support[antecedent] * n_sets)
+    lift = confidence / single_support[consequent]
+    keep = (confidence >= min_confidence) & (n_itemsets[rule_cluster] >= 2)
+    antecedent, consequent, rule_cluster = antecedent[keep], consequent[keep], rule_cluster[keep]
+    support_ac, confidence, lift = support_ac[keep], confidence[keep], lift[keep]
+    
+    # Top rules per cluster: lift, confidence, then items (keys sort by term)
+    order = np.lexsort((consequent, antecedent, -confidence, -lift, rule_cluster))
+    rule_rank = np.arange(len(order)) - np.searchsorted(rule_cluster[order], rule_cluster[order])
+    for i in order[rule_rank < top_n_rules]:
+        cluster_rules[cluster_ids[rule_cluster[i]]].append({
+            'antecedent': [vocabulary[term[antecedent[i]]]],
+            'consequent': [vocabulary[term[consequent[i]]]],
+            'support': support_ac[i],
+            'confidence': confidence[i],
+            'lift': lift[i],
+            'type': 'rule'
+        })
+    
+    # Fallback for clusters without rules: top frequent itemsets by support
+    has_rules = np.zeros(len(blocks), dtype=bool)
+    has_rules[rule_cluster] = True
+    singles = np.flatnonzero(single_ok & ~has_rules[key_cluster])
+    pair_fallback = ~has_rules[pair_cluster]
+    item_cluster = np.concatenate([key_cluster[singles], pair_cluster[pair_fallback]])
+    item_first = np.concatenate([singles, a[pair_fallback]])
+    item_second = np.concatenate([np.full(len(singles), -1), b[pair_fallback]])
+    item_support = np.concatenate([single_support[singles], pair_support[pair_fallback]])
+    
+    order = np.lexsort((item_second, item_first, -item_support, item_cluster))
+    item_rank = np.arange(len(order)) - np.searchsorted(item_cluster[order], item_cluster[order])
+    for i in order[item_rank < top_n_rules]:
+        items = [item_first[i]] + ([item_second[i]] if item_second[i] >= 0 else [])
+        cluster_rules[cluster_ids[item_cluster[i]]].append({
+            'itemset': [vocabulary[term[item]] for item in items],
+            'support': item_support[i],
+            'type': 'itemset'
+        })
+    
+    return cluster_rules
+
+
+def _sort_by_score(
+    frame: pd.DataFrame,
+    score_columns: List[str],
+    itemset_columns: List[str]
+) -> pd.DataFrame:
+    """
+    Sort itemsets/rules by descending scores, ties broken by sorted items.
+    
+    Frozenset iteration order depends on the per-process string hash seed,
+    so this keeps results identical across runs and worker processes.
+    """
+    keys = {f'_key_{col}': frame[col].map(lambda items: tuple(sorted(items))) for col in itemset_columns}
+    ordered = frame.assign(**keys).sort_values(
+        score_columns + list(keys),
+        ascending=[False] * len(score_columns) + [True] * len(keys),
+        kind='mergesort'
+    )
+    return ordered.drop(columns=list(keys))
+
+
+def mine_cluster_rules(
+    transactions: csr_matrix,
+    vocabulary: np.ndarray,
+    min_confidence: float = 0.3,
+    top_n_rules: int = 10,
+    miner: str = 'bitset',
+    max_len: int = 3
+) -> List[Dict[str, Any]]:
+    """
+    Mine the top association rules (or itemsets, as fallback) of one cluster.
+    
+    Args:
+        transactions: Sparse transaction matrix of the cluster
+        vocabulary: Term of each column
+        min_confidence: Minimum confidence for rules
+        top_n_rules: Maximum number of rules to return
+        miner: 'bitset' (native AND + popcount) or 'mlxtend' (fpgrowth);
+               both give the same rules
+        max_len: Maximum itemset length (2 or 3)
+    
+    Returns:
+        List of rule dictionaries (empty if the cluster is too small)
+    """
+    n_transactions = transactions.shape[0]
+    if n_transactions < 10:  # Need enough transactions
+        return []
+    
+    # Adjust min_support based on cluster size
+    adaptive_support = max(0.02, min(0.1, 5 / n_transactions))
+    
+    if miner == 'bitset':
+        return _mine_cluster_rules_bitset(
+            transactions, vocabulary, adaptive_support, min_confidence, top_n_rules, max_len
+        )
+    
+    # Build term matrix
+    term_matrix = get_cluster_term_matrix(transactions, vocabulary, max_terms=50)
+    
+    if term_matrix.empty:
+        return []
+    
+    # Get frequent itemsets
+    itemsets = compute_frequent_itemsets(
+        term_matrix,
+        min_support=adaptive_support,
+        max_len=max_len
+    )
+    
+    if itemsets.empty:
+        return []
+    
+    # Generate rules
+    rules = compute_association_rules(itemsets, min_confidence=min_confidence)
+    
+    if rules.empty:
+        # Fallback: use frequent itemsets as descriptors
+        top_itemsets = _sort_by_score(itemsets, ['support'], ['itemsets']).head(top_n_rules)
+        return [
+            {
+                'itemset': sorted(row['itemsets']),
+                'support': row['support'],
+                'type': 'itemset'
+            }
+            for _, row in top_itemsets.iterrows()
+        ]
+    
+    # Sort by lift, then confidence
+    rules = _sort_by_score(rules, ['lift', 'confidence'], ['antecedents', 'consequents'])
+    top_rules = rules.head(top_n_rules)
+    
+    return [
+        {
+            'antecedent': sorted(row['antecedents']),
+            'consequent': sorted(row['consequents']),
+            'support': row['support'],
+            'confidence': row['confidence'],
+            'lift': row['lift'],
+            'type': 'rule'
+        }
+        for _, row in top_rules.iterrows()
+    ]
+
+
+def _mine_cluster_rules_bitset(
+    transactions: csr_matrix,
+    vocabulary: np.ndarray,
+    min_support: float,
+    min_confidence: float,
+    top_n_rules: int,
+    max_len: int = 3
+) -> List[Dict[str, Any]]:
+    """Bitset version of the mlxtend path of mine_cluster_rules."""
+    terms, bits, n_transactions = encode_transaction_bitsets(transactions, vocabulary, max_terms=50)
+    if n_transactions == 0:
+        return []
+    
+    levels = mine_bitset_itemsets(bits, n_transactions, min_support, max_len=max_len)
+    n_itemsets = sum(len(support) for _, support in levels)
+    if n_itemsets == 0:
+        return []
+    
+    # compute_association_rules needs at least two itemsets
+    rules = bitset_association_rules(levels, len(terms), min_confidence) if n_itemsets >= 2 else None
+    
+    if rules is None or len(rules['support']) == 0:
+        # Fallback: use frequent itemsets as descriptors
+        return [
+            {
+                'itemset': _term_names(terms, items),
+                'support': support,
+                'type': 'itemset'
+            }
+            for items, support in _top_itemsets(levels, top_n_rules)
+        ]
+    
+    # Sort by lift, then confidence (ties: sorted items, as _sort_by_score)
+    antecedent, consequent = rules['antecedent'], rules['consequent']
+    order = np.lexsort((
+        consequent[:, 1], consequent[:, 0], antecedent[:, 1], antecedent[:, 0],
+        -rules['confidence'], -rules['lift']
+    ))[:top_n_rules]
+    
+    return [
+        {
+            'antecedent': _term_names(terms, antecedent[i]),
+            'consequent': _term_names(terms, consequent[i]),
+            'support': rules['support'][i],
+            'confidence': rules['confidence'][i],
+            'lift': rules['lift'][i],
+            'type': 'rule'
+        }
+        for i in order
+    ]
+
+
+def mine_cluster_itemsets(
+    transactions: csr_matrix,
+    vocabulary: np.ndarray,
+    top_n: int = 5,
+    miner: str = 'bitset'
+) -> List[Tuple[frozenset, float]]:
+    """
+    Get the top frequent itemsets of one cluster, preferring 2+ items.
+    
+    Args:
+        transactions: Sparse transaction matrix of the cluster
+        vocabulary: Term of each column
+        top_n: Number of top itemsets to return
+        miner: 'bitset' or 'mlxtend' (same itemsets)
+    
+    Returns:
+        List of (itemset, support) tuples (empty if the cluster is too small)
+    """
+    n_transactions = transactions.shape[0]
+    if n_transactions < 5:
+        return []
+    
+    adaptive_support = max(0.02, min(0.15, 3 / n_transactions))
+    
+    if miner == 'bitset':
+        terms, bits, n_transactions = encode_transaction_bitsets(transactions, vocabulary, max_terms=30)
+        if n_transactions == 0:
+            return []
+        levels = mine_bitset_itemsets(bits, n_transactions, adaptive_support)
+        if sum(len(support) for _, support in levels) == 0:
+            return []
+        # Prefer itemsets with 2+ items (more meaningful)
+        min_length = 2 if len(levels[1][1]) or len(levels[2][1]) else 1
+        return [
+            (frozenset(_term_names(terms, items)), support)
+            for items, support in _top_itemsets(levels, top_n, min_length=min_length)
+        ]
+    term_matrix = get_cluster_term_matrix(transactions, vocabulary, max_terms=30)
+    
+    if term_matrix.empty:
+        return []
+    
+    itemsets = compute_frequent_itemsets(
+        term_matrix,
+        min_support=adaptive_support,
+        max_len=3
+    )
+    
+    if itemsets.empty:
+        return []
+    
+    # Filter for itemsets with 2+ items (more meaningful)
+    multi_item = itemsets[itemsets['itemsets'].apply(len) >= 2]
+    if not multi_item.empty:
+        top = _sort_by_score(multi_item, ['support'], ['itemsets']).head(top_n)
+    else:
+        top = _sort_by_score(itemsets, ['support'], ['itemsets']).head(top_n)
+    
+    return [
+        (row['itemsets'], row['support'])
+        for _, row in top.iterrows()
+    ]
+
+
+def _mine_batch(func, batch: List[Tuple[int, csr_matrix]], kwargs: Dict[str, Any]) -> List[Tuple[int, Any]]:
+    """Worker: apply a per-cluster mining function to a batch of clusters."""
+    return [(cluster_id, func(transactions, **kwargs)) for cluster_id, transactions in batch]
+
+
+def map_clusters(
+    func,
+    cluster_transactions: Dict[int, csr_matrix],
+    n_jobs: Optional[int] = 1,
+    batch_size: Optional[int] = None,
+    **kwargs
+) -> Dict[int, Any]:
+    """
+    Apply a per-cluster mining function to every cluster, optionally in parallel.
+    
+    With n_jobs > 1, clusters are sorted largest first and cut into batches
+    submitted to a process pool, so the biggest clusters start first and
+    small ones fill the gaps. Results are returned in the input cluster
+    order whatever the completion order.
+    
+    Args:
+        func: Module-level function (transactions, **kwargs) -> result
+        cluster_transactions: Dictionary mapping cluster ID to sparse transactions
+        n_jobs: Number of worker processes (1 = serial, None = all CPUs)
+        batch_size: Clusters per batch (default: ~4 batches per worker)
+        **kwargs: Extra arguments passed to func
+    
+    Returns:
+        Dictionary mapping cluster ID to func's result
+    """
+    items = list(cluster_transactions.items())
+    n_jobs = min(n_jobs or os.cpu_count() or 1, max(len(items), 1))
+    
+    if n_jobs <= 1:
+        return {cluster_id: func(transactions, **kwargs) for cluster_id, transactions in items}
+    
+    # Largest clusters first for load balancing
+    items.sort(key=lambda item: item[1].shape[0], reverse=True)
+    batch_size = batch_size or max(1, -(-len(items) // (n_jobs * 4)))
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    
+    results = {}
+    # Spawned workers, as in stability.py (no fork after BLAS/OpenMP threads start)
+    with ProcessPoolExecutor(
+        max_workers=n_jobs,
+        mp_context=multiprocessing.get_context('spawn')
+    ) as executor:
+        futures = [executor.submit(_mine_batch, func, batch, kwargs) for batch in batches]
+        for future in as_completed(futures):
+            results.update(future.result())
+    
+    return {cluster_id: results[cluster_id] for cluster_id in cluster_transactions}
+
+
 def extract_cluster_rules(
-    cluster_transactions: Dict[int, List[List[str]]],
+    cluster_transactions: Dict[int, csr_matrix],
+    vocabulary: np.ndarray,
     min_support: float = 0.05,
     min_confidence: float = 0.3,
-    top_n_rules: int = 10
+    top_n_rules: int = 10,
+    n_jobs: Optional[int] = 1,
+    miner: str = 'bitset',
+    max_len: int = 3
 ) -> Dict[int, List[Dict[str, Any]]]:
     """
     Extract association rules for each cluster.
     
+    With max_len=2, all clusters are mined at once by the sparse pair
+    co-occurrence engine (compute_pair_rules) instead of one by one.
+    
     Args:
-        cluster_transactions: Dictionary mapping cluster ID to transactions
+        cluster_transactions: Dictionary mapping cluster ID to sparse transactions
+        vocabulary: Term of each transaction column
         min_support: Minimum support for frequent itemsets
         min_confidence: Minimum confidence for rules
         top_n_rules: Maximum number of rules to return per cluster
+        n_jobs: Number of worker processes (1 = serial, None = all CPUs)
+        miner: Itemset miner, one of ITEMSET_MINERS
+        max_len: Maximum itemset length (2 = pair rules only, 3 = default)
     
     Returns:
         Dictionary mapping cluster ID to list of rule dictionaries
     """
     print(f"Extracting association rules (support={min_support}, confidence={min_confidence})...")
+    if max_len == 2:
+        print("  Pair rules for all clusters from sparse co-occurrence counts")
+        cluster_rules = compute_pair_rules(
+            cluster_transactions, vocabulary,
+            min_confidence=min_confidence, top_n_rules=top_n_rules
+        )
+        total_rules = sum(len(rules) for rules in cluster_rules.values())
+        print(f"Extracted {total_rules} rules/itemsets across {len(cluster_rules)} clusters")
+        return cluster_rules
     
-    cluster_rules = {}
-    total_rules = 0
+    if n_jobs != 1:
+        print(f"  Mining clusters in parallel ({n_jobs or os.cpu_count()} processes)")
     
-    for cluster_id, transactions in cluster_transactions.items():
-        if len(transactions) < 10:  # Need enough transactions
-            cluster_rules[cluster_id] = []
-            continue
-        
-        # Adjust min_support based on cluster size
-        adaptive_support = max(0.02, min(0.1, 5 / len(transactions)))
-        
-        # Build term matrix
-        term_matrix = get_cluster_term_matrix(transactions, max_terms=50)
-        
-        if term_matrix.empty:
-            cluster_rules[cluster_id] = []
-            continue
-        
-        # Get frequent itemsets
-        itemsets = compute_frequent_itemsets(
-            term_matrix,
-            min_support=adaptive_support,
-            max_len=3
-        )
-        
-        if itemsets.empty:
-            cluster_rules[cluster_id] = []
-            continue
-        
-        # Generate rules
-        rules = compute_association_rules(itemsets, min_confidence=min_confidence)
-        
-        if rules.empty:
-            # Fallback: use frequent itemsets as descriptors
-            top_itemsets = itemsets.nlargest(top_n_rules, 'support')
-            cluster_rules[cluster_id] = [
-                {
-                    'itemset': list(row['itemsets']),
-                    'support': row['support'],
-                    'type': 'itemset'
-                }
-                for _, row in top_itemsets.iterrows()
-            ]
-        else:
-            # Sort by lift, then confidence
-            rules = rules.sort_values(['lift', 'confidence'], ascending=False)
-            top_rules = rules.head(top_n_rules)
-            
-            cluster_rules[cluster_id] = [
-                {
-                    'antecedent': list(row['antecedents']),
-                    'consequent': list(row['consequents']),
-                    'support': row['support'],
-                    'confidence': row['confidence'],
-                    'lift': row['lift'],
-                    'type': 'rule'
-                }
-                for _, row in top_rules.iterrows()
-            ]
-        
-        total_rules += len(cluster_rules[cluster_id])
+    cluster_rules = map_clusters(
+        mine_cluster_rules,
+        cluster_transactions,
+        n_jobs=n_jobs,
+        vocabulary=vocabulary,
+        min_confidence=min_confidence,
+        top_n_rules=top_n_rules,
+        miner=miner,
+        max_len=max_len
+    )
+    total_rules = sum(len(rules) for rules in cluster_rules.values())
     
     print(f"Extracted {total_rules} rules/itemsets across {len(cluster_rules)} clusters")
     return cluster_rules
 
 
 def get_cluster_itemsets_summary(
-    cluster_transactions: Dict[int, List[List[str]]],
+    cluster_transactions: Dict[int, csr_matrix],
+    vocabulary: np.ndarray,
     min_support: float = 0.05,
-    top_n: int = 5
+    top_n: int = 5,
+    n_jobs: Optional[int] = 1,
+    miner: str = 'bitset'
 ) -> Dict[int, List[Tuple[frozenset, float]]]:
     """
     Get top frequent itemsets for each cluster (simpler than full rules).
     
     Args:
-        cluster_transactions: Dictionary mapping cluster ID to transactions
+        cluster_transactions: Dictionary mapping cluster ID to sparse transactions
+        vocabulary: Term of each transaction column
         min_support: Minimum support threshold
         top_n: Number of top itemsets to return per cluster
+        n_jobs: Number of worker processes (1 = serial, None = all CPUs)
+        miner: Itemset miner, one of ITEMSET_MINERS
     
     Returns:
         Dictionary mapping cluster ID to list of (itemset, support) tuples
     """
     print("Extracting top frequent itemsets per cluster...")
     
-    cluster_itemsets = {}
-    
-    for cluster_id, transactions in cluster_transactions.items():
-        if len(transactions) < 5:
-            cluster_itemsets[cluster_id] = []
-            continue
-        
-        adaptive_support = max(0.02, min(0.15, 3 / len(transactions)))
-        term_matrix = get_cluster_term_matrix(transactions, max_terms=30)
-        
-        if term_matrix.empty:
-            cluster_itemsets[cluster_id] = []
-            continue
-        
-        itemsets = compute_frequent_itemsets(
-            term_matrix,
-            min_support=adaptive_support,
-            max_len=3
-        )
-        
-        if itemsets.empty:
-            cluster_itemsets[cluster_id] = []
-            continue
-        
-        # Filter for itemsets with 2+ items (more meaningful)
-        multi_item = itemsets[itemsets['itemsets'].apply(len) >= 2]
-        if not multi_item.empty:
-            top = multi_item.nlargest(top_n, 'support')
-        else:
-            top = itemsets.nlargest(top_n, 'support')
-        
-        cluster_itemsets[cluster_id] = [
-            (row['itemsets'], row['support'])
-            for _, row in top.iterrows()
-        ]
-    
-    return cluster_itemsets
+    return map_clusters(
+        mine_cluster_itemsets, cluster_transactions, n_jobs=n_jobs,
+        vocabulary=vocabulary, top_n=top_n, miner=miner
+    )
 
 
 # =============================================================================
@@ -779,7 +2178,8 @@ def generate_all_cluster_names(
     tfidf_descriptors: Dict[int, List[Tuple[str, float]]] = None,
     cluster_rules: Dict[int, List[Dict[str, Any]]] = None,
     cluster_itemsets: Dict[int, List[Tuple[frozenset, float]]] = None,
-    cluster_sizes: Dict[int, int] = None
+    cluster_sizes: Dict[int, int] = None,
+    cache: Optional[Dict[str, Any]] = None
 ) -> Dict[int, Dict[str, Any]]:
     """
     Generate names and metadata for all clusters.
@@ -789,6 +2189,8 @@ def generate_all_cluster_names(
         cluster_rules: Association rules per cluster
         cluster_itemsets: Frequent itemsets per cluster
         cluster_sizes: Number of photos per cluster
+        cache: Optional cluster text cache; names are only regenerated for
+               clusters whose membership or naming inputs changed
     
     Returns:
         Dictionary mapping cluster ID to name and metadata
@@ -804,6 +2206,7 @@ def generate_all_cluster_names(
         all_cluster_ids.update(cluster_itemsets.keys())
     
     cluster_names = {}
+    n_cached = 0
     
     for cluster_id in sorted(all_cluster_ids):
         tfidf = tfidf_descriptors.get(cluster_id, []) if tfidf_descriptors else []
@@ -811,6 +2214,18 @@ def generate_all_cluster_names(
         itemsets = cluster_itemsets.get(cluster_id, []) if cluster_itemsets else []
         size = cluster_sizes.get(cluster_id, 0) if cluster_sizes else 0
         
+        cache_key = None
+        if cache is not None and cluster_id in cache['hashes']:
+            inputs = json.dumps(
+                [int(cluster_id), size, tfidf, rules, [[sorted(i), s] for i, s in itemsets]],
+                default=float
+            )
+            cache_key = f"{cache['hashes'][cluster_id]}:{hashlib.md5(inputs.encode('utf-8')).hexdigest()[:16]}"
+            if cache_key in cache['names']:
+                cluster_names[cluster_id] = cache['names'][cache_key]
+                n_cached += 1
+                continue
+        
         # Generate name - now returns (name, method) tuple
         name, method = generate_cluster_name(
             cluster_id=cluster_id,
@@ -836,6 +2251,11 @@ def generate_all_cluster_names(
                 list(itemset) for itemset, _ in itemsets[:3]
             ] if itemsets else []
         }
+        if cache_key is not None:
+            cache['names'][cache_key] = _json_safe(cluster_names[cluster_id])
+    
+    if cache is not None:
+        print(f"  Names: {len(cluster_names) - n_cached} of {len(cluster_names)} clusters regenerated")
     
     # Statistics
     methods = Counter(info['method'] for info in cluster_names.values())
@@ -851,10 +2271,14 @@ def generate_all_cluster_names(
 def save_association_rules_json(
     cluster_rules: Dict[int, List[Dict[str, Any]]],
     cluster_names: Dict[int, Dict[str, Any]] = None,
-    output_path: Path = None
+    output_path: Path = None,
+    cluster_stability: Dict[int, float] = None
 ) -> Path:
     """
     Save association rules to JSON file.
+    
+    If cluster_stability is given, each cluster gets a 'stability' field
+    (bootstrap Jaccard score, see src/stability.py).
     """
     if output_path is None:
         output_path = REPORTS_DIR / "association_rules.json"
@@ -873,6 +2297,8 @@ def save_association_rules_json(
         if cluster_names and cluster_id in cluster_names:
             cluster_data["name"] = cluster_names[cluster_id]["name"]
             cluster_data["naming_method"] = cluster_names[cluster_id]["method"]
+        if cluster_stability and cluster_id in cluster_stability:
+            cluster_data["stability"] = cluster_stability[cluster_id]
         
         output["clusters"][str(cluster_id)] = cluster_data
     
@@ -1084,15 +2510,17 @@ def save_descriptors_json(
 def generate_summary_report(
     descriptors: Dict[int, List[Tuple[str, float]]],
     df: pd.DataFrame,
-    output_path: Path = None
+    output_path: Path = None,
+    cluster_sizes: Dict[int, int] = None
 ) -> Path:
     """
     Generate a markdown summary report of cluster descriptors.
     
     Args:
         descriptors: TF-IDF descriptors
-        df: Original DataFrame with cluster info
+        df: Original DataFrame with cluster info (unused if cluster_sizes given)
         output_path: Output file path
+        cluster_sizes: Optional number of photos per cluster
     
     Returns:
         Path to saved file
@@ -1101,7 +2529,8 @@ def generate_summary_report(
         output_path = REPORTS_DIR / "text_mining_summary.md"
     
     # Calculate cluster sizes
-    cluster_sizes = df[df['cluster'] != -1].groupby('cluster').size()
+    if cluster_sizes is None:
+        cluster_sizes = df[df['cluster'] != -1].groupby('cluster').size()
     
     lines = [
         "# Cluster Text Analysis Summary",
@@ -1176,7 +2605,10 @@ def generate_summary_report(
 def run_text_mining(
     df: pd.DataFrame = None,
     top_n: int = 10,
-    save_results: bool = True
+    save_results: bool = True,
+    use_cache: bool = True,
+    streaming: bool = False,
+    data_path: Path = None
 ) -> Dict[int, List[Tuple[str, float]]]:
     """
     Run the complete text mining pipeline on clustered data.
@@ -1185,6 +2617,11 @@ def run_text_mining(
         df: DataFrame with clustered photos (loads from file if None)
         top_n: Number of top terms per cluster
         save_results: Whether to save outputs to files
+        use_cache: Reuse cluster term counts whose membership is unchanged
+                   (CLUSTER_TEXT_CACHE_PATH)
+        streaming: Read data_path in chunks and hash terms instead of
+                   loading the corpus (see compute_streaming_tfidf_descriptors)
+        data_path: Clustered photos file (Parquet or CSV) for streaming mode
     
     Returns:
         Dictionary of cluster descriptors
@@ -1193,6 +2630,20 @@ def run_text_mining(
     print("TEXT MINING: Generating Cluster Descriptors")
     print("=" * 60)
     
+    if streaming:
+        if data_path is None:
+            data_path = DATA_DIR / "flickr_clustered.csv"
+        print(f"Streaming data from {data_path}...")
+        descriptors, cluster_sizes = compute_streaming_tfidf_descriptors(data_path, top_n=top_n)
+        
+        if save_results:
+            save_descriptors_json(descriptors)
+            generate_summary_report(descriptors, None, cluster_sizes=cluster_sizes)
+        
+        print("=" * 60)
+        print("Text mining complete!")
+        return descriptors
+    
     # Load data if not provided
     if df is None:
         data_path = DATA_DIR / "flickr_clustered.csv"
@@ -1201,11 +2652,11 @@ def run_text_mining(
     
     print(f"Dataset: {len(df)} photos, {df['cluster'].nunique()} clusters")
     
-    # Aggregate text by cluster
-    cluster_texts = get_cluster_texts(df)
-    
-    # Compute TF-IDF descriptors
-    descriptors = compute_tfidf_descriptors(cluster_texts, top_n=top_n)
+    # Compute TF-IDF descriptors from the sparse photo × term matrix
+    cache = load_cluster_text_cache(df) if use_cache else None
+    descriptors = compute_cluster_tfidf_descriptors(df, top_n=top_n, cache=cache)
+    if cache is not None:
+        save_cluster_text_cache(cache)
     
     # Save results
     if save_results:
@@ -1223,7 +2674,12 @@ def run_association_rules_mining(
     min_support: float = 0.08,
     min_confidence: float = 0.3,
     save_results: bool = True,
-    tfidf_descriptors: Dict[int, List] = None
+    tfidf_descriptors: Dict[int, List] = None,
+    cluster_stability: Dict[int, float] = None,
+    n_jobs: Optional[int] = 1,
+    miner: str = 'bitset',
+    max_len: int = 3,
+    use_cache: bool = True
 ) -> Tuple[Dict[int, List[Dict[str, Any]]], Dict[int, Dict[str, Any]]]:
     """
     Run association rules mining on clustered data.
@@ -1234,6 +2690,12 @@ def run_association_rules_mining(
         min_confidence: Minimum confidence for rules
         save_results: Whether to save outputs to files
         tfidf_descriptors: Pre-computed TF-IDF descriptors (avoids recomputation)
+        cluster_stability: Optional cluster ID -> bootstrap stability score
+        n_jobs: Worker processes for per-cluster mining (1 = serial, None = all CPUs)
+        miner: Itemset miner, one of ITEMSET_MINERS
+        max_len: Maximum itemset length (2 = pair rules for all clusters at once)
+        use_cache: Only mine and name clusters whose membership changed
+                   (CLUSTER_TEXT_CACHE_PATH)
     
     Returns:
         Tuple of (cluster_rules, cluster_names)
@@ -1254,22 +2716,51 @@ def run_association_rules_mining(
     cluster_sizes = df[df['cluster'] != -1].groupby('cluster').size().to_dict()
     
     # Convert to transactions
-    cluster_transactions = get_cluster_transactions(df)
+    cluster_transactions, vocabulary = get_cluster_transactions(df)
+    cache = load_cluster_text_cache(df) if use_cache else None
     
     # Extract association rules
-    cluster_rules = extract_cluster_rules(
-        cluster_transactions,
-        min_support=min_support,
-        min_confidence=min_confidence
-    )
+    def mine_rules(cluster_ids):
+        return extract_cluster_rules(
+            {cid: cluster_transactions[cid] for cid in cluster_ids},
+            vocabulary,
+            min_support=min_support,
+            min_confidence=min_confidence,
+            n_jobs=n_jobs,
+            miner=miner,
+            max_len=max_len
+        )
+    
+    if cache is not None:
+        cluster_rules = cached_per_cluster(
+            cache, 'rules', f"{miner}:{max_len}:{min_support}:{min_confidence}",
+            list(cluster_transactions), mine_rules
+        )
+    else:
+        cluster_rules = mine_rules(list(cluster_transactions))
     
     # Get frequent itemsets for naming (simplified - skip if we have TF-IDF)
     if tfidf_descriptors is None:
-        cluster_itemsets = get_cluster_itemsets_summary(cluster_transactions)
+        def mine_itemsets(cluster_ids):
+            itemsets = get_cluster_itemsets_summary(
+                {cid: cluster_transactions[cid] for cid in cluster_ids},
+                vocabulary, n_jobs=n_jobs, miner=miner
+            )
+            return {cid: [(sorted(i), s) for i, s in sets] for cid, sets in itemsets.items()}
+        
+        if cache is not None:
+            cluster_itemsets = cached_per_cluster(
+                cache, 'itemsets', miner, list(cluster_transactions), mine_itemsets
+            )
+        else:
+            cluster_itemsets = mine_itemsets(list(cluster_transactions))
+        cluster_itemsets = {
+            cid: [(frozenset(items), support) for items, support in sets]
+            for cid, sets in cluster_itemsets.items()
+        }
         # Compute TF-IDF for fallback naming
         print("Computing TF-IDF for naming fallback...")
-        cluster_texts = get_cluster_texts(df)
-        tfidf_descriptors = compute_tfidf_descriptors(cluster_texts, top_n=10)
+        tfidf_descriptors = compute_cluster_tfidf_descriptors(df, top_n=10, cache=cache)
     else:
         # Skip itemset summary when we already have TF-IDF (primary naming source)
         print("Using pre-computed TF-IDF descriptors (skipping redundant computation)")
@@ -1280,12 +2771,15 @@ def run_association_rules_mining(
         tfidf_descriptors=tfidf_descriptors,
         cluster_rules=cluster_rules,
         cluster_itemsets=cluster_itemsets,
-        cluster_sizes=cluster_sizes
+        cluster_sizes=cluster_sizes,
+        cache=cache
     )
+    if cache is not None:
+        save_cluster_text_cache(cache)
     
     # Save results
     if save_results:
-        save_association_rules_json(cluster_rules, cluster_names)
+        save_association_rules_json(cluster_rules, cluster_names, cluster_stability=cluster_stability)
         generate_association_rules_report(cluster_rules, cluster_names, df)
     
     print("=" * 60)
@@ -1359,13 +2853,17 @@ if __name__ == "__main__":
     parser.add_argument("--no-save", action="store_true", help="Don't save results to files")
     parser.add_argument("--mode", choices=["tfidf", "rules", "full"], default="full",
                         help="Pipeline mode: tfidf, rules, or full")
+    parser.add_argument("--streaming", type=Path, metavar="PATH",
+                        help="tfidf mode: stream this clustered Parquet/CSV file in chunks")
     
     args = parser.parse_args()
     
     if args.mode == "tfidf":
         descriptors = run_text_mining(
             top_n=args.top_n,
-            save_results=not args.no_save
+            save_results=not args.no_save,
+            streaming=args.streaming is not None,
+            data_path=args.streaming
         )
         # Print sample results
         print("\nSample cluster descriptors:")
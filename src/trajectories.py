@@ -0,0 +1,290 @@
+"""
+Trajectory mining module for the Grand Lyon Photo Clusters project.
+Describes how photographers move between clusters (e.g. Vieux Lyon -> Fourvière).
+
+Each user's clustered photos are ordered by capture time and split into
+trips on long time gaps. Consecutive photos in the same cluster are merged
+into one stop, and consecutive stops give cluster-to-cluster transitions.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix, csr_matrix
+
+from .clustering import summarize_clusters
+from .data_loader import PROJECT_ROOT, create_datetime_column
+
+# Output paths
+REPORTS_DIR = PROJECT_ROOT / "reports"
+CLUSTER_TRANSITIONS_PATH = REPORTS_DIR / "cluster_transitions.json"
+
+# A gap longer than this between two photos of a user starts a new trip
+TRIP_GAP_HOURS = 8
+
+
+# =============================================================================
+# TRIPS & STOPS
+# =============================================================================
+
+def build_cluster_stops(
+    df: pd.DataFrame,
+    trip_gap_hours: float = TRIP_GAP_HOURS
+) -> pd.DataFrame:
+    """
+    Turn clustered photos into per-trip sequences of cluster stops.
+
+    Noise photos and photos without a capture time are ignored. Photos are
+    sorted by (user, time); a new trip starts when the user changes or the
+    gap to the previous photo exceeds trip_gap_hours, and a new stop when
+    the trip or the cluster changes. Both are cumulative sums over break
+    flags, so there is no per-user loop.
+
+    Args:
+        df: DataFrame with 'user', 'cluster' and date_taken_* columns
+        trip_gap_hours: Maximum gap (in hours) between photos of one trip
+
+    Returns:
+        DataFrame with one row per stop, in trip order: trip, user, cluster,
+        start, end, n_photos
+    """
+    taken = create_datetime_column(df)
+    valid = (df['cluster'].values != -1) & taken.notna().values
+
+    users = pd.factorize(df['user'].values[valid])[0]
+    clusters = df['cluster'].values[valid].astype(np.int64)
+    minutes = taken.values[valid].astype('datetime64[m]').astype(np.int64)
+
+    order = np.lexsort((minutes, users))
+    users, clusters, minutes = users[order], clusters[order], minutes[order]
+    n = len(order)
+
+    new_trip = np.ones(n, dtype=bool)
+    new_trip[1:] = (users[1:] != users[:-1]) | (minutes[1:] - minutes[:-1] > trip_gap_hours * 60)
+    new_stop = new_trip.copy()
+    new_stop[1:] |= clusters[1:] != clusters[:-1]
+
+    trip = np.cumsum(new_trip) - 1
+    stop = np.cumsum(new_stop) - 1
+    starts = np.flatnonzero(new_stop)
+    ends = np.append(starts[1:], n) - 1
+
+    return pd.DataFrame({
+        'trip': trip[starts],
+        'user': df['user'].values[valid][order][starts],
+        'cluster': clusters[starts],
+        'start': minutes[starts].astype('datetime64[m]'),
+        'end': minutes[ends].astype('datetime64[m]'),
+        'n_photos': np.bincount(stop, minlength=len(starts)),
+    })
+
+
+# =============================================================================
+# TRANSITIONS & PATHS
+# =============================================================================
+
+def compute_transition_matrix(stops: pd.DataFrame) -> Tuple[np.ndarray, csr_matrix]:
+    """
+    Count cluster-to-cluster transitions between consecutive stops of a trip.
+
+    Args:
+        stops: Output of build_cluster_stops
+
+    Returns:
+        Tuple of (sorted cluster IDs, sparse K×K matrix where entry [i, j]
+        counts moves from cluster_ids[i] to cluster_ids[j])
+    """
+    cluster_ids, codes = np.unique(stops['cluster'].values, return_inverse=True)
+    trip = stops['trip'].values
+    same_trip = trip[1:] == trip[:-1]
+
+    k = len(cluster_ids)
+    matrix = coo_matrix(
+        (np.ones(same_trip.sum(), dtype=np.int64), (codes[:-1][same_trip], codes[1:][same_trip])),
+        shape=(k, k)
+    ).tocsr()  # duplicates are summed
+
+    return cluster_ids, matrix
+
+
+def find_frequent_paths(
+    stops: pd.DataFrame,
+    length: int = 3,
+    top_n: int = 20
+) -> List[Dict[str, Any]]:
+    """
+    Find the most frequent paths of consecutive stops within trips.
+
+    Args:
+        stops: Output of build_cluster_stops
+        length: Number of clusters per path (2 = single transitions)
+        top_n: Number of paths to return
+
+    Returns:
+        List of dicts with 'path' (cluster IDs), 'count' and 'users'
+        (distinct users who took it), most frequent first
+    """
+    n_windows = len(stops) - length + 1
+    if n_windows <= 0:
+        return []
+
+    trip = stops['trip'].values
+    clusters = stops['cluster'].values
+    # Windows of `length` consecutive stops that all belong to the same trip
+    in_trip = trip[length - 1:] == trip[:n_windows]
+    windows = np.column_stack([clusters[i:i + n_windows] for i in range(length)])[in_trip]
+    if len(windows) == 0:
+        return []
+
+    paths, inverse, counts = np.unique(windows, axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+    users = pd.factorize(stops['user'].values[:n_windows][in_trip])[0]
+    n_users = pd.DataFrame({'path': inverse, 'user': users}).drop_duplicates()['path'].value_counts()
+
+    top = np.lexsort((-n_users.reindex(range(len(paths)), fill_value=0).values, -counts))[:top_n]
+    return [
+        {
+            'path': [int(c) for c in paths[p]],
+            'count': int(counts[p]),
+            'users': int(n_users.get(p, 0)),
+        }
+        for p in top
+    ]
+
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+def save_transitions_json(
+    cluster_ids: np.ndarray,
+    matrix: csr_matrix,
+    centroids: pd.DataFrame,
+    frequent_paths: Dict[int, List[Dict[str, Any]]],
+    metadata: Dict[str, Any] = None,
+    output_path: Path = None
+) -> Path:
+    """
+    Save transitions and frequent paths to JSON for the map.
+
+    Args:
+        cluster_ids: Cluster IDs indexing the matrix rows/columns
+        matrix: Sparse transition matrix from compute_transition_matrix
+        centroids: DataFrame indexed by cluster with centroid_lat/centroid_lon
+        frequent_paths: Mapping of path length to find_frequent_paths output
+        metadata: Extra top-level fields (trip gap, counts...)
+        output_path: Output file path
+
+    Returns:
+        Path to saved file
+    """
+    if output_path is None:
+        output_path = CLUSTER_TRANSITIONS_PATH
+
+    coo = matrix.tocoo()
+    order = np.argsort(-coo.data, kind='stable')
+    transitions = [
+        {
+            'from': int(cluster_ids[coo.row[i]]),
+            'to': int(cluster_ids[coo.col[i]]),
+            'count': int(coo.data[i]),
+        }
+        for i in order
+    ]
+
+    output = {
+        "generated_at": datetime.now().isoformat(),
+        **(metadata or {}),
+        "centroids": {
+            str(cid): [round(float(row['centroid_lat']), 6), round(float(row['centroid_lon']), 6)]
+            for cid, row in centroids.loc[centroids.index.isin(cluster_ids)].iterrows()
+        },
+        "transitions": transitions,
+        "frequent_paths": {str(length): paths for length, paths in frequent_paths.items()},
+    }
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2)
+
+    print(f"Saved cluster transitions to {output_path}")
+    return output_path
+
+
+def run_trajectory_analysis(
+    df: pd.DataFrame = None,
+    trip_gap_hours: float = TRIP_GAP_HOURS,
+    top_n: int = 20,
+    output_path: Path = None
+) -> Dict[str, Any]:
+    """
+    Run the trajectory mining pipeline and export it to JSON.
+
+    Args:
+        df: DataFrame with user, cluster, lat/long and date columns (loads default if None)
+        trip_gap_hours: Maximum gap (in hours) between photos of one trip
+        top_n: Number of frequent paths kept per path length
+        output_path: Output JSON path
+
+    Returns:
+        Dictionary with stops, cluster_ids, matrix, frequent_paths and output_path
+    """
+    if df is None:
+        print("Loading clustered data...")
+        df = pd.read_csv(PROJECT_ROOT / "data" / "flickr_clustered.csv")
+
+    stops = build_cluster_stops(df, trip_gap_hours=trip_gap_hours)
+    cluster_ids, matrix = compute_transition_matrix(stops)
+    frequent_paths = {
+        length: find_frequent_paths(stops, length=length, top_n=top_n)
+        for length in (2, 3)
+    }
+
+    n_trips = stops['trip'].nunique()
+    n_moving = int((stops.groupby('trip').size() > 1).sum())
+    print(f"  Trips: {n_trips:,} ({n_moving:,} visiting 2+ clusters)")
+    print(f"  Transitions: {int(matrix.sum()):,} between {matrix.nnz:,} cluster pairs")
+
+    centroids = summarize_clusters(df[['lat', 'long']].values, df['cluster'].values)
+    output_path = save_transitions_json(
+        cluster_ids, matrix, centroids, frequent_paths,
+        metadata={
+            'trip_gap_hours': trip_gap_hours,
+            'n_trips': int(n_trips),
+            'n_multi_cluster_trips': n_moving,
+            'n_transitions': int(matrix.sum()),
+        },
+        output_path=output_path
+    )
+
+    return {
+        'stops': stops,
+        'cluster_ids': cluster_ids,
+        'matrix': matrix,
+        'frequent_paths': frequent_paths,
+        'output_path': output_path,
+    }
+
+
+def main():
+    """Run trajectory mining from command line."""
+    print("=" * 60)
+    print("TRAJECTORY MINING - Grand Lyon Photo Clusters")
+    print("=" * 60)
+
+    result = run_trajectory_analysis()
+
+    print("\n" + "=" * 60)
+    print("✅ Trajectory mining complete!")
+    for path in result['frequent_paths'][2][:5]:
+        print(f"   {' -> '.join(map(str, path['path']))}: {path['count']} ({path['users']} users)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
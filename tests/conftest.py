@@ -0,0 +1,54 @@
+"""
+Shared fixtures for the Grand Lyon Photo Clusters test suite.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src import text_mining  # noqa: E402
+
+# Words per synthetic cluster (plus shared and noise words)
+CLUSTER_WORDS = [
+    ['fourviere', 'basilique', 'colline', 'notre', 'dame'],
+    ['bellecour', 'place', 'statue', 'louis', 'cheval'],
+    ['confluence', 'musee', 'orange', 'cube', 'quai'],
+    ['terreaux', 'hotel', 'ville', 'fontaine', 'bartholdi'],
+    ['croix', 'rousse', 'traboule', 'canut', 'mur'],
+    ['parc', 'tete', 'lac', 'zoo', 'roseraie'],
+]
+SHARED_WORDS = ['lyon', 'france', 'rhone', 'saone', 'nuit', 'pont', 'fête', 'lumières']
+
+
+@pytest.fixture(autouse=True)
+def isolated_token_cache(tmp_path, monkeypatch):
+    """Keep the photo token cache out of data/ during tests."""
+    original = text_mining.get_photo_token_arrays
+    cache_path = tmp_path / "photo_tokens.parquet"
+
+    def get_photo_token_arrays(df, cache_path=cache_path):
+        return original(df, cache_path=cache_path)
+
+    monkeypatch.setattr(text_mining, 'get_photo_token_arrays', get_photo_token_arrays)
+    return cache_path
+
+
+@pytest.fixture
+def photo_texts() -> pd.DataFrame:
+    """Small clustered dataset with tags/titles drawn from per-cluster words."""
+    rng = np.random.default_rng(42)
+    rows = []
+    for photo_id in range(600):
+        cluster = int(rng.integers(-1, len(CLUSTER_WORDS)))
+        words = CLUSTER_WORDS[cluster] if cluster != -1 else SHARED_WORDS
+        tags = ' '.join(rng.choice(words, size=rng.integers(1, 5)))
+        tags += ' ' + ' '.join(rng.choice(SHARED_WORDS, size=rng.integers(0, 3)))
+        title = rng.choice([None, '', 'IMG_2041', 'Vue de Lyon', 'Sortie_au-Parc', tags.title()])
+        rows.append({'id': 1000 + photo_id, 'cluster': cluster, 'tags': tags, 'title': title})
+    return pd.DataFrame(rows)
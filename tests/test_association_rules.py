@@ -0,0 +1,64 @@
+"""
+Tests for the bitset itemset miner and the sparse pair-rule engine
+against the mlxtend-based per-cluster mining.
+"""
+
+import numpy as np
+import pytest
+
+from src.text_mining import (
+    compute_pair_rules, get_cluster_transactions, mine_cluster_itemsets,
+    mine_cluster_rules
+)
+
+
+@pytest.fixture
+def cluster_transactions(photo_texts):
+    return get_cluster_transactions(photo_texts)
+
+
+@pytest.mark.parametrize('max_len', [2, 3])
+def test_bitset_rules_match_mlxtend(cluster_transactions, max_len):
+    transactions, vocabulary = cluster_transactions
+    n_rules = 0
+
+    for cluster_id, matrix in transactions.items():
+        expected = mine_cluster_rules(matrix, vocabulary, miner='mlxtend', max_len=max_len)
+        rules = mine_cluster_rules(matrix, vocabulary, miner='bitset', max_len=max_len)
+
+        assert rules == expected, cluster_id
+        n_rules += len(rules)
+    assert n_rules > 0
+
+
+def test_bitset_itemsets_match_mlxtend(cluster_transactions):
+    transactions, vocabulary = cluster_transactions
+
+    for matrix in transactions.values():
+        expected = mine_cluster_itemsets(matrix, vocabulary, miner='mlxtend')
+        itemsets = mine_cluster_itemsets(matrix, vocabulary, miner='bitset')
+
+        assert [items for items, _ in itemsets] == [items for items, _ in expected]
+        np.testing.assert_allclose([s for _, s in itemsets], [s for _, s in expected])
+
+
+def test_bitset_rules_without_bitwise_count(cluster_transactions, monkeypatch):
+    transactions, vocabulary = cluster_transactions
+    matrix = next(iter(transactions.values()))
+    expected = mine_cluster_rules(matrix, vocabulary, miner='bitset')
+
+    # numpy < 2.0 has no np.bitwise_count
+    monkeypatch.delattr(np, 'bitwise_count', raising=False)
+
+    assert mine_cluster_rules(matrix, vocabulary, miner='bitset') == expected
+
+
+def test_pair_rules_match_per_cluster_mining(cluster_transactions):
+    transactions, vocabulary = cluster_transactions
+
+    rules = compute_pair_rules(transactions, vocabulary)
+
+    assert list(rules) == list(transactions)
+    for cluster_id, matrix in transactions.items():
+        expected = mine_cluster_rules(matrix, vocabulary, miner='mlxtend', max_len=2)
+        assert rules[cluster_id] == expected, cluster_id
@@ -0,0 +1,183 @@
+"""
+Tests for clustering utilities (src/clustering.py).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import CLUSTER_WORDS
+from src.clustering import (
+    align_cluster_labels, run_hdbscan, run_st_dbscan, select_representatives, summarize_clusters
+)
+from src.text_mining import get_photo_tokens
+
+
+@pytest.fixture
+def blobs():
+    """Three tight Lyon-like blobs plus scattered noise."""
+    rng = np.random.default_rng(0)
+    centers = np.array([[45.7623, 4.8271], [45.7578, 4.8320], [45.7640, 4.8357]])
+    sizes = [120, 80, 40]
+    coords = np.vstack([c + rng.normal(0, 5e-4, (n, 2)) for c, n in zip(centers, sizes)])
+    labels = np.repeat([0, 1, 2], sizes)
+    noise = rng.uniform([45.70, 4.78], [45.82, 4.90], (30, 2))
+    return np.vstack([coords, noise]), np.concatenate([labels, np.full(30, -1)])
+
+
+def test_summarize_clusters_matches_per_cluster_loop(blobs):
+    coords, labels = blobs
+
+    summary = summarize_clusters(coords, labels)
+
+    assert summary.index.tolist() == [0, 1, 2]
+    for cluster_id, row in summary.iterrows():
+        points = coords[labels == cluster_id]
+        assert row['size'] == len(points)
+        np.testing.assert_allclose(row[['centroid_lat', 'centroid_lon']], points.mean(axis=0))
+        np.testing.assert_allclose(row[['lat_min', 'lon_min']], points.min(axis=0))
+        np.testing.assert_allclose(row[['lat_max', 'lon_max']], points.max(axis=0))
+        np.testing.assert_allclose(row[['spread_lat', 'spread_lon']], points.std(axis=0))
+        np.testing.assert_allclose(row['radius_of_gyration'], np.sqrt(points.var(axis=0).sum()))
+
+
+def test_summarize_clusters_keeps_precision_for_tight_clusters():
+    rng = np.random.default_rng(1)
+    coords = np.array([45.7623, 4.8271]) + rng.normal(0, 1e-8, (50, 2))
+
+    summary = summarize_clusters(coords, np.zeros(50, dtype=int))
+
+    np.testing.assert_allclose(summary.loc[0, ['spread_lat', 'spread_lon']], coords.std(axis=0), rtol=1e-6)
+
+
+def test_summarize_clusters_noise_row(blobs):
+    coords, labels = blobs
+
+    assert -1 not in summarize_clusters(coords, labels).index
+    assert summarize_clusters(coords, labels, include_noise=True).loc[-1, 'size'] == 30
+    assert summarize_clusters(coords[labels == -1], labels[labels == -1]).empty
+
+
+def test_st_dbscan_matches_brute_force_neighborhoods(blobs):
+    coords, _ = blobs
+    rng = np.random.default_rng(2)
+    # Two bursts a week apart at the same places, plus scattered times
+    days = np.where(rng.random(len(coords)) < 0.5, 0.0, 7.0) + rng.uniform(0, 0.8, len(coords))
+    days[::17] = rng.uniform(0, 30, len(days[::17]))
+    times = pd.Timestamp('2019-12-05') + pd.to_timedelta(np.round(days * 86400), unit='s')
+    times = times.to_series().reset_index(drop=True)
+    times[5] = pd.NaT
+    eps, eps_temporal, min_samples = 1e-3, 1.0, 8
+
+    labels = run_st_dbscan(coords, times, eps_spatial=eps, eps_temporal=eps_temporal, min_samples=min_samples)
+
+    # Brute-force ST-DBSCAN neighborhoods (NaT rows have no neighbors)
+    t = times.to_numpy(dtype='datetime64[s]').astype(np.int64) / 86400.0
+    valid = times.notna().to_numpy()
+    spatial = np.hypot(*(coords[:, None, :] - coords[None, :, :]).transpose(2, 0, 1)) <= eps
+    temporal = np.abs(t[:, None] - t[None, :]) <= eps_temporal
+    neighbors = spatial & temporal & valid[:, None] & valid[None, :]
+    core = neighbors.sum(axis=1) >= min_samples
+
+    assert labels[5] == -1
+    # Core points: same cluster iff connected through core neighbors
+    reach = (neighbors & core[:, None] & core[None, :]).astype(int)
+    for _ in range(len(coords)):
+        grown = (reach @ reach > 0).astype(int)
+        if (grown == reach).all():
+            break
+        reach = grown
+    same = labels[:, None] == labels[None, :]
+    np.testing.assert_array_equal(same[np.ix_(core, core)], reach[np.ix_(core, core)] > 0)
+    assert (labels[core] != -1).all()
+    # Border points join a neighboring core point's cluster; the rest is noise
+    for i in np.flatnonzero(~core):
+        core_neighbors = np.flatnonzero(neighbors[i] & core)
+        if len(core_neighbors):
+            assert labels[i] in set(labels[core_neighbors])
+        else:
+            assert labels[i] == -1
+    assert len(set(labels[core])) > 3
+
+
+def test_align_cluster_labels_reuses_previous_ids():
+    reference = np.array([5, 5, 5, 5, 7, 7, 7, 9, 9, -1, -1])
+    # Same clusters renumbered, cluster 9 dropped, a new cluster appears
+    labels = np.array([1, 1, 1, 1, 0, 0, 0, -1, -1, 2, 2])
+
+    aligned, info = align_cluster_labels(labels, reference)
+
+    assert aligned.tolist() == [5, 5, 5, 5, 7, 7, 7, -1, -1, 10, 10]
+    assert info['n_matched'] == 2
+    assert info['unchanged_clusters'] == [5, 7]
+    assert info['new_clusters'] == [10]
+    assert info['retired_clusters'] == [9]
+    assert info['mapping'] == {'0': 7, '1': 5, '2': 10}
+
+
+def test_align_cluster_labels_rejects_weak_matches():
+    reference = np.array([0, 0, 0, 0, 1, 1, 1, 1])
+    # Jaccard overlaps: cluster 3 vs 0 = 3/4, cluster 4 vs 1 = 4/5
+    labels = np.array([3, 3, 3, 4, 4, 4, 4, 4])
+
+    aligned, info = align_cluster_labels(labels, reference, min_jaccard=0.9)
+
+    assert set(aligned) == {2, 3}
+    assert info['n_matched'] == 0 and info['n_retired'] == 2
+
+    aligned, info = align_cluster_labels(labels, reference, min_jaccard=0.75)
+
+    assert aligned.tolist() == [0, 0, 0, 1, 1, 1, 1, 1]
+    assert info['unchanged_clusters'] == []
+
+
+def test_align_cluster_labels_keeps_partition(blobs):
+    _, labels = blobs
+    rng = np.random.default_rng(3)
+    permuted = np.where(labels == -1, -1, rng.permutation(10)[np.maximum(labels, 0)])
+
+    aligned, info = align_cluster_labels(permuted, labels)
+
+    np.testing.assert_array_equal(aligned, labels)
+    assert info['unchanged_clusters'] == [0, 1, 2]
+
+
+def test_cluster_hierarchy_levels_nest():
+    rng = np.random.default_rng(4)
+    # Two districts of three POIs each
+    districts = np.array([[45.76, 4.83], [45.74, 4.86]])
+    pois = np.vstack([d + rng.normal(0, 4e-3, (3, 2)) for d in districts])
+    coords = np.vstack([p + rng.normal(0, 4e-4, (80, 2)) for p in pois])
+
+    labels, hierarchy = run_hdbscan(
+        coords, min_cluster_size=40, core_dist_n_jobs=1,
+        hierarchy_levels={'district': 200, 'poi': None}
+    )
+
+    assert hierarchy['levels'] == ['district', 'poi']
+    assert hierarchy['thresholds'] == {'district': 200, 'poi': 40}
+    district, poi = hierarchy['labels']['district'], hierarchy['labels']['poi']
+    assert district.max() + 1 == 2
+    assert poi.max() + 1 == 6
+    for cluster_id, parent in hierarchy['parents']['poi'].items():
+        assert set(district[poi == cluster_id]) == {parent}
+
+
+def test_text_representatives_match_descriptor_terms(photo_texts):
+    rng = np.random.default_rng(5)
+    df = photo_texts.assign(lat=rng.uniform(45.7, 45.8, len(photo_texts)), long=rng.uniform(4.8, 4.9, len(photo_texts)))
+    # 'lyon' is a stopword and never matches; bigrams only count within a photo
+    descriptors = {
+        cluster_id: [(words[0], 3.0), (f"{words[1]} {words[2]}", 2.0), ('lyon', 5.0)]
+        for cluster_id, words in enumerate(CLUSTER_WORDS)
+    }
+
+    result = select_representatives(df, k=1000, method='text', cluster_descriptors=descriptors)
+
+    tokens = get_photo_tokens(df)
+    for idx, row in result.iterrows():
+        words = tokens[idx]
+        terms = set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+        expected = sum(w for t, w in descriptors[row['cluster']] if t in terms)
+        assert row['rep_score'] == expected
+    assert (result['rep_score'] > 0).any()
@@ -0,0 +1,139 @@
+"""
+Tests for the per-user photo filters in src/data_loader.py (visits, caps, user types).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_loader import build_visits, cap_user_contributions, compute_user_profiles, tag_user_types
+
+
+def photo_frame(rows, columns):
+    """DataFrame of hand-built photos with a 'taken' column split into date_taken_*."""
+    df = pd.DataFrame(rows, columns=columns)
+    taken = pd.to_datetime(df.pop('taken'))
+    return df.assign(
+        date_taken_year=taken.dt.year,
+        date_taken_month=taken.dt.month,
+        date_taken_day=taken.dt.day,
+        date_taken_hour=taken.dt.hour,
+        date_taken_minute=taken.dt.minute,
+    )
+
+
+# (id, user, lat, long, capture time, tags, title); None = unknown time
+VISIT_PHOTOS = [
+    (1, 'alice', 45.7600, 4.8300, '2019-12-06 10:00', 'fourviere,basilique', 'Fourvière'),
+    (2, 'alice', 45.7602, 4.8302, '2019-12-06 10:05', 'fourviere', None),
+    (3, 'alice', 45.7604, 4.8301, '2019-12-06 10:15', 'basilique,nuit', 'Fourvière'),
+    (4, 'alice', 45.7604, 4.8301, '2019-12-06 10:26', 'fourviere', None),
+    (5, 'alice', 45.7610, 4.8301, '2019-12-06 10:30', 'fourviere', None),
+    (6, 'bob', 45.7604, 4.8301, '2019-12-06 10:27', 'fourviere', None),
+    (7, 'alice', 45.7604, 4.8301, None, 'fourviere', None),
+]
+
+
+def test_build_visits():
+    photos = photo_frame(VISIT_PHOTOS, ['id', 'user', 'lat', 'long', 'taken', 'tags', 'title'])
+
+    visits = build_visits(photos, max_distance=0.0005, max_gap_minutes=10).sort_values('id')
+
+    # 1-3: within 10 minutes (gap of exactly 10 included) and 50m of the previous photo;
+    # 4: 11 minutes later; 5: 60m away; 6: another user; 7: no capture time
+    assert visits['id'].tolist() == [1, 4, 5, 6, 7]
+    assert visits['n_photos'].tolist() == [3, 1, 1, 1, 1]
+    assert visits['user'].tolist() == ['alice', 'alice', 'alice', 'bob', 'alice']
+    first = visits.iloc[0]
+    assert first['lat'] == pytest.approx(np.mean([45.7600, 45.7602, 45.7604]))
+    assert first['long'] == pytest.approx(np.mean([4.8300, 4.8302, 4.8301]))
+    assert first['tags'] == 'fourviere,basilique,nuit'
+    assert first['title'] == 'Fourvière'
+    assert first['date_taken_minute'] == 0
+    assert visits['tags'].iloc[1:].tolist() == ['fourviere'] * 4
+    assert visits['n_photos'].sum() == len(photos)
+
+
+def test_build_visits_empty():
+    photos = photo_frame([], ['id', 'user', 'lat', 'long', 'taken', 'tags', 'title'])
+
+    visits = build_visits(photos)
+
+    assert visits.empty
+    assert 'n_photos' in visits.columns
+
+
+# (id, user, lat, long, capture time); cells of 0.001 degrees
+CAP_PHOTOS = [
+    (1, 'alice', 45.7605, 4.8305, '2019-12-06 12:00'),
+    (2, 'alice', 45.7606, 4.8306, None),
+    (3, 'alice', 45.7607, 4.8307, '2019-12-06 09:00'),
+    (4, 'alice', 45.7608, 4.8308, '2019-12-06 10:00'),
+    (5, 'alice', 45.7615, 4.8305, '2019-12-06 13:00'),
+    (6, 'bob', 45.7605, 4.8305, '2019-12-06 14:00'),
+    (7, 'bob', 45.7606, 4.8306, None),
+    (8, 'bob', 45.7607, 4.8307, None),
+]
+
+
+def test_cap_user_contributions():
+    photos = photo_frame(CAP_PHOTOS, ['id', 'user', 'lat', 'long', 'taken'])
+
+    capped, removed = cap_user_contributions(photos, max_per_cell=2, cell_size=0.001)
+
+    # Alice keeps her two earliest photos in the first cell and her only one
+    # in the next; photos without a time come last, in dataset order
+    assert capped['id'].tolist() == [3, 4, 5, 6, 7]
+    assert removed == 3
+    assert capped.index.tolist() == [2, 3, 4, 5, 6]
+
+
+def test_cap_user_contributions_keeps_everything_under_cap():
+    photos = photo_frame(CAP_PHOTOS, ['id', 'user', 'lat', 'long', 'taken'])
+
+    capped, removed = cap_user_contributions(photos, max_per_cell=4, cell_size=0.001)
+
+    assert removed == 0
+    assert capped['id'].tolist() == photos['id'].tolist()
+
+
+# (user, capture time); None = unknown time
+PROFILE_PHOTOS = [
+    ('ana', '2019-12-06 10:00'),
+    ('ana', '2019-12-06 18:00'),
+    ('ana', '2019-12-08 09:00'),
+    ('ben', '2019-01-01 00:00'),
+    ('ben', '2019-01-31 00:00'),
+    ('cleo', '2019-01-01 00:00'),
+    ('cleo', '2019-01-30 23:59'),
+    ('dan', None),
+    ('dan', None),
+    ('eve', None),
+    ('eve', '2018-05-01 12:00'),
+    ('eve', '2020-05-01 12:00'),
+]
+
+
+def test_compute_user_profiles():
+    photos = photo_frame(PROFILE_PHOTOS, ['user', 'taken'])
+
+    profiles = compute_user_profiles(photos, tourist_max_days=30)
+
+    assert profiles.index.tolist() == ['ana', 'ben', 'cleo', 'dan', 'eve']
+    # A span of exactly tourist_max_days is a resident
+    assert profiles['user_type'].tolist() == ['tourist', 'resident', 'tourist', 'unknown', 'resident']
+    assert profiles['span_days'].iloc[:3].tolist() == pytest.approx([47 / 24, 30.0, 30 - 1 / 1440])
+    assert np.isnan(profiles.loc['dan', 'span_days'])
+    assert profiles['active_days'].tolist() == [2, 2, 2, 0, 2]
+    assert profiles['n_photos'].tolist() == [3, 2, 2, 2, 3]
+    assert profiles.loc['ana', 'first_taken'] == pd.Timestamp('2019-12-06 10:00')
+    assert profiles.loc['ana', 'last_taken'] == pd.Timestamp('2019-12-08 09:00')
+
+
+def test_tag_user_types():
+    photos = photo_frame(PROFILE_PHOTOS, ['user', 'taken'])
+
+    tagged = tag_user_types(photos, tourist_max_days=30)
+
+    assert 'user_type' not in photos.columns
+    assert tagged['user_type'].tolist() == ['tourist'] * 3 + ['resident'] * 2 + ['tourist'] * 2 + ['unknown'] * 2 + ['resident'] * 3
@@ -0,0 +1,174 @@
+"""
+Tests for the cleaned-data storage helpers (src/data_loader.py).
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from src import data_loader
+from src.data_loader import MORTON_BITS, export_to_sqlite, morton_key, query_photos, save_spatial_parquet
+
+
+@pytest.fixture
+def photos() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 400
+    return pd.DataFrame({
+        'id': np.arange(n),
+        'user': rng.choice(['a', 'b', 'c'], n),
+        'lat': np.round(rng.uniform(45.70, 45.82, n), 4),
+        'long': np.round(rng.uniform(4.78, 4.90, n), 4),
+        'tags': rng.choice(['fourviere', 'bellecour', 'confluence'], n),
+        'title': None,
+        'date_taken_year': rng.choice([2018, 2019], n),
+        'date_taken_month': rng.integers(1, 13, n),
+        'date_taken_day': rng.integers(1, 29, n),
+        'date_taken_hour': rng.integers(0, 24, n),
+        'date_taken_minute': rng.integers(0, 60, n),
+    })
+
+
+def test_query_photos_bbox_includes_boundary_points(photos, tmp_path):
+    db_path = export_to_sqlite(photos, tmp_path / "photos.sqlite")
+    # Box edges exactly on photo coordinates (not representable in float32)
+    edge = photos.iloc[:40]
+    bbox = {
+        'lat_min': edge['lat'].min(), 'lat_max': edge['lat'].max(),
+        'lon_min': edge['long'].min(), 'lon_max': edge['long'].max(),
+    }
+    inside = (
+        photos['lat'].between(bbox['lat_min'], bbox['lat_max'])
+        & photos['long'].between(bbox['lon_min'], bbox['lon_max'])
+    )
+
+    result = query_photos(bbox=bbox, columns=['id'], db_path=db_path)
+
+    assert sorted(result['id']) == sorted(photos.loc[inside, 'id'])
+    assert set(edge['id']) <= set(result['id'])
+
+
+def test_query_photos_combines_filters(photos, tmp_path):
+    db_path = export_to_sqlite(photos, tmp_path / "photos.sqlite")
+
+    result = query_photos(text='fourviere', start='2019-01-01', columns=['id'], db_path=db_path)
+
+    expected = photos[(photos['tags'] == 'fourviere') & (photos['date_taken_year'] == 2019)]
+    assert sorted(result['id']) == sorted(expected['id'])
+
+
+def test_query_photos_text_with_punctuation(photos, tmp_path):
+    photos['tags'] = np.where(photos.index % 3 == 0, 'part-dieu gare', np.where(photos.index % 3 == 1, "l'hotel", 'bellecour'))
+    db_path = export_to_sqlite(photos, tmp_path / "photos.sqlite")
+
+    part_dieu = query_photos(text='part-dieu', columns=['id'], db_path=db_path)
+    hotel = query_photos(text="l'hotel", columns=['id'], db_path=db_path)
+    either = query_photos(text='gare OR bellecour', columns=['id'], db_path=db_path, raw_fts=True)
+
+    assert sorted(part_dieu['id']) == sorted(photos.loc[photos.index % 3 == 0, 'id'])
+    assert sorted(hotel['id']) == sorted(photos.loc[photos.index % 3 == 1, 'id'])
+    assert sorted(either['id']) == sorted(photos.loc[photos.index % 3 != 1, 'id'])
+
+
+def test_load_cleaned_data_ignores_stale_partitions(photos, tmp_path, monkeypatch):
+    parquet_path = tmp_path / "flickr_cleaned.parquet"
+    partitioned_dir = tmp_path / "flickr_cleaned_partitioned"
+    monkeypatch.setattr(data_loader, 'CLEANED_DATA_PATH', parquet_path)
+    monkeypatch.setattr(data_loader, 'CLEANED_PARTITIONED_DIR', partitioned_dir)
+
+    # Partitions from an older cleaning with fewer photos
+    data_loader.save_partitioned_parquet(photos.iloc[:100], partitioned_dir)
+    data_loader.save_spatial_parquet(photos, parquet_path)
+    os.utime(partitioned_dir, (1_000_000, 1_000_000))
+
+    loaded = data_loader.load_cleaned_data(years=[2019])
+    assert sorted(loaded['id']) == sorted(photos.loc[photos['date_taken_year'] == 2019, 'id'])
+
+    # Fresh partitions are used (and pruned by year)
+    data_loader.save_partitioned_parquet(photos, partitioned_dir)
+    loaded = data_loader.load_cleaned_data(years=[2019])
+    assert 'year' not in loaded.columns
+    assert sorted(loaded['id']) == sorted(photos.loc[photos['date_taken_year'] == 2019, 'id'])
+
+
+@pytest.fixture
+def dense_photos() -> pd.DataFrame:
+    """Photos around thirty hot spots plus uniform background."""
+    rng = np.random.default_rng(1)
+    n = 20_000
+    centers = rng.uniform([45.70, 4.78], [45.82, 4.90], (30, 2))
+    points = np.vstack([
+        centers[rng.integers(0, 30, n // 2)] + rng.normal(0, 3e-3, (n // 2, 2)),
+        rng.uniform([45.70, 4.78], [45.82, 4.90], (n // 2, 2)),
+    ])
+    return pd.DataFrame({'id': np.arange(n), 'lat': points[:, 0], 'long': points[:, 1]})
+
+
+def row_group_bounds(path):
+    """Row count and lat/long min/max statistics of each row group."""
+    metadata = pq.ParquetFile(path).metadata
+    bounds = []
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        stats = {row_group.column(j).path_in_schema: row_group.column(j).statistics for j in range(row_group.num_columns)}
+        bounds.append((row_group.num_rows, stats['lat'].min, stats['lat'].max, stats['long'].min, stats['long'].max))
+    return pd.DataFrame(bounds, columns=['rows', 'lat_min', 'lat_max', 'lon_min', 'lon_max'])
+
+
+def cell_rows(keys, row, shift):
+    """First row and row count of the quadtree cell holding row (sorted keys, prefix = key >> shift)."""
+    cells = keys >> np.uint64(shift)
+    first = np.searchsorted(cells, cells[row], 'left')
+    return first, np.searchsorted(cells, cells[row], 'right') - first
+
+
+def test_morton_key_interleaves_long_and_lat():
+    corners = pd.DataFrame({'lat': [0.0, 0.0, 1.0, 1.0], 'long': [0.0, 1.0, 0.0, 1.0]})
+
+    assert morton_key(corners, bits=1).tolist() == [0, 1, 2, 3]
+    assert morton_key(corners).tolist() == [0, 0x55555555, 0xAAAAAAAA, 0xFFFFFFFF]
+
+
+def test_spatial_parquet_row_groups_follow_quadtree_cells(dense_photos, tmp_path):
+    max_rows = 1000
+    path = save_spatial_parquet(dense_photos, tmp_path / "photos.parquet", row_group_size=max_rows)
+
+    stored = pd.read_parquet(path)
+    groups = row_group_bounds(path)
+    keys = morton_key(stored)
+
+    assert sorted(stored['id']) == list(dense_photos['id'])
+    assert (np.diff(keys.astype(np.int64)) >= 0).all()
+    assert groups['rows'].max() <= max_rows
+    # Every group starts a quadtree cell that fits while its parent does not
+    for start in np.cumsum(groups['rows'])[:-1]:
+        assert any(
+            cell_rows(keys, start, shift) == (start, n) and n <= max_rows < cell_rows(keys, start, shift + 2)[1]
+            for shift in range(0, 2 * MORTON_BITS, 2)
+            for n in [cell_rows(keys, start, shift)[1]]
+        ), start
+
+
+def test_load_cleaned_data_bbox_prunes_row_groups(dense_photos, tmp_path, monkeypatch):
+    parquet_path = save_spatial_parquet(dense_photos, tmp_path / "flickr_cleaned.parquet", row_group_size=1000)
+    monkeypatch.setattr(data_loader, 'CLEANED_DATA_PATH', parquet_path)
+    monkeypatch.setattr(data_loader, 'CLEANED_PARTITIONED_DIR', tmp_path / "missing")
+    bbox = {'lat_min': 45.75, 'lat_max': 45.77, 'lon_min': 4.82, 'lon_max': 4.84}
+
+    loaded = data_loader.load_cleaned_data(bbox=bbox)
+
+    groups = row_group_bounds(parquet_path)
+    touched = (
+        (groups['lat_max'] >= bbox['lat_min']) & (groups['lat_min'] <= bbox['lat_max'])
+        & (groups['lon_max'] >= bbox['lon_min']) & (groups['lon_min'] <= bbox['lon_max'])
+    )
+    assert touched.sum() < len(groups) / 4
+    inside = (
+        dense_photos['lat'].between(bbox['lat_min'], bbox['lat_max'])
+        & dense_photos['long'].between(bbox['lon_min'], bbox['lon_max'])
+    )
+    assert inside.sum() > 0
+    assert sorted(loaded['id']) == sorted(dense_photos.loc[inside, 'id'])
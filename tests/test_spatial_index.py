@@ -0,0 +1,80 @@
+"""
+Tests for the point-to-cluster lookup index (src/spatial_index.py).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.spatial import Delaunay
+
+from src.spatial_index import ClusterLookupIndex
+
+
+@pytest.fixture
+def clustered():
+    """Forty blobs of varying size and spread, some overlapping, plus noise."""
+    rng = np.random.default_rng(0)
+    centers = rng.uniform([45.70, 4.78], [45.82, 4.90], (40, 2))
+    frames = []
+    for cluster_id, center in enumerate(centers):
+        n = int(rng.integers(5, 60))
+        points = center + rng.normal(0, rng.uniform(5e-4, 5e-3), (n, 2))
+        frames.append(pd.DataFrame({'lat': points[:, 0], 'long': points[:, 1], 'cluster': cluster_id}))
+    noise = rng.uniform([45.70, 4.78], [45.82, 4.90], (50, 2))
+    frames.append(pd.DataFrame({'lat': noise[:, 0], 'long': noise[:, 1], 'cluster': -1}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def brute_force_lookup(df, points, max_distance=None):
+    """Nearest-centroid cluster among the convex hulls containing each point."""
+    members = df[df['cluster'] != -1].groupby('cluster')[['lat', 'long']]
+    centroids = members.mean()
+    hulls = {cid: Delaunay(group.to_numpy()) for cid, group in members}
+
+    result = []
+    for point in points:
+        distance = np.hypot(*(centroids.to_numpy() - point).T)
+        inside = [i for i, cid in enumerate(centroids.index) if hulls[cid].find_simplex(point) >= 0]
+        if inside:
+            result.append(centroids.index[min(inside, key=lambda i: distance[i])])
+        elif max_distance is not None and distance.min() <= max_distance:
+            result.append(centroids.index[distance.argmin()])
+        else:
+            result.append(-1)
+    return np.array(result)
+
+
+def test_lookup_many_matches_brute_force(clustered):
+    rng = np.random.default_rng(1)
+    points = np.vstack([
+        clustered[['lat', 'long']].sample(300, random_state=2).to_numpy() + rng.normal(0, 2e-4, (300, 2)),
+        rng.uniform([45.70, 4.78], [45.82, 4.90], (300, 2)),
+    ])
+    index = ClusterLookupIndex.from_clustered_data(clustered)
+
+    result = index.lookup_many(points)
+
+    np.testing.assert_array_equal(result, brute_force_lookup(clustered, points))
+    assert (result != -1).sum() > 200
+
+
+def test_lookup_fallback_to_nearest_centroid(clustered):
+    rng = np.random.default_rng(3)
+    points = rng.uniform([45.70, 4.78], [45.82, 4.90], (300, 2))
+    index = ClusterLookupIndex.from_clustered_data(clustered)
+
+    result = index.lookup_many(points, max_distance=0.01)
+
+    np.testing.assert_array_equal(result, brute_force_lookup(clustered, points, max_distance=0.01))
+
+
+def test_lookup_after_save_and_load(clustered, tmp_path):
+    index = ClusterLookupIndex.from_clustered_data(clustered)
+    path = index.save(tmp_path / "index.npz")
+
+    loaded = ClusterLookupIndex.load(path)
+    centroid = clustered[clustered['cluster'] == 7][['lat', 'long']].mean()
+
+    assert loaded.n_clusters == 40
+    assert loaded.lookup(centroid['lat'], centroid['long']) == index.lookup(centroid['lat'], centroid['long'])
+    assert loaded.lookup(0.0, 0.0) == -1
@@ -0,0 +1,69 @@
+"""
+Tests for bootstrap cluster stability (src/stability.py).
+"""
+
+import numpy as np
+import pytest
+
+from src.stability import compute_cluster_stability, load_cluster_stability, save_stability_json
+
+N_BOOTSTRAP = 4
+RANDOM_STATE = 1  # its resamples all miss some noise photos
+PARAMS = {'eps': 1e-3, 'min_samples': 5}
+
+
+def resample_indices(n_points):
+    """Photos drawn by each of the stability resamples (same seeds as the module)."""
+    seeds = np.random.default_rng(RANDOM_STATE).integers(0, 2**32 - 1, N_BOOTSTRAP)
+    return [np.unique(np.random.default_rng(int(seed)).integers(0, n_points, n_points)) for seed in seeds]
+
+
+@pytest.fixture(scope='module')
+def clustered():
+    """Two well-separated blobs, scattered photos labelled as a cluster, and a singleton."""
+    rng = np.random.default_rng(0)
+    blobs = [center + rng.normal(0, 2e-4, (100, 2)) for center in ([45.76, 4.83], [45.74, 4.86])]
+    scattered = rng.uniform([45.70, 4.78], [45.82, 4.90], (60, 2))
+    noise = rng.uniform([45.70, 4.78], [45.82, 4.90], (40, 2))
+    coords = np.vstack(blobs + [scattered, noise])
+    labels = np.repeat([0, 1, 2, -1], [100, 100, 60, 40])
+
+    # Turn a noise photo that no resample draws into its own cluster
+    drawn = np.zeros(len(coords), dtype=bool)
+    for idx in resample_indices(len(coords)):
+        drawn[idx] = True
+    missing = np.flatnonzero(~drawn & (labels == -1))
+    labels[missing[0]] = 3
+    return coords, labels
+
+
+@pytest.fixture(scope='module')
+def stability(clustered):
+    coords, labels = clustered
+    return compute_cluster_stability(
+        coords, labels, algorithm='dbscan', params=PARAMS,
+        n_bootstrap=N_BOOTSTRAP, n_jobs=2, random_state=RANDOM_STATE
+    )
+
+
+def test_cluster_stability_scores(stability):
+    assert stability.index.tolist() == [0, 1, 2, 3]
+    assert stability['size'].tolist() == [100, 100, 60, 1]
+    assert (stability.loc[[0, 1], 'stability'] > 0.95).all()
+    assert (stability.loc[[0, 1], 'stable_rate'] == 1.0).all()
+    assert stability.loc[2, 'stability'] < 0.2
+    assert stability.loc[2, 'dissolved_rate'] == 1.0
+    assert np.isnan(stability.loc[3, 'stability'])
+
+
+def test_stability_json_round_trip(stability, tmp_path):
+    path = save_stability_json(stability, metadata={'cache_key': 'abc'}, output_path=tmp_path / "stability.json")
+
+    scores = load_cluster_stability(path, cache_key='abc')
+
+    # Clusters never resampled have no score
+    assert sorted(scores) == [0, 1, 2]
+    assert scores[0] == round(stability.loc[0, 'stability'], 4)
+    assert load_cluster_stability(path) == scores
+    assert load_cluster_stability(path, cache_key='other') == {}
+    assert load_cluster_stability(tmp_path / "missing.json") == {}
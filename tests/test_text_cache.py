@@ -0,0 +1,72 @@
+"""
+Tests for the photo token cache and the incremental cluster text cache.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import text_mining
+from src.text_mining import (
+    compute_cluster_tfidf_descriptors, load_cluster_text_cache,
+    save_cluster_text_cache, text_fingerprint
+)
+
+
+@pytest.fixture
+def csv_round_trip(photo_texts, tmp_path):
+    """photo_texts written to CSV and read back ('' titles become NaN)."""
+    path = tmp_path / "clustered.csv"
+    photo_texts.to_csv(path, index=False)
+    return pd.read_csv(path)
+
+
+def test_text_fingerprint_survives_csv_round_trip(photo_texts, csv_round_trip):
+    assert (photo_texts['title'] == '').any()
+    assert csv_round_trip['title'].isna().sum() > photo_texts['title'].isna().sum()
+
+    assert text_fingerprint(csv_round_trip) == text_fingerprint(photo_texts)
+
+
+def test_photo_token_cache_hit_after_csv_round_trip(photo_texts, csv_round_trip, capsys):
+    offsets, values = text_mining.get_photo_token_arrays(photo_texts)
+    capsys.readouterr()
+
+    cached_offsets, cached_values = text_mining.get_photo_token_arrays(csv_round_trip)
+
+    assert "Loaded cached photo tokens" in capsys.readouterr().out
+    assert np.array_equal(cached_offsets, offsets)
+    assert list(cached_values) == list(values)
+
+
+def test_cluster_text_cache_hit_after_csv_round_trip(photo_texts, csv_round_trip, tmp_path, capsys):
+    cache_path = tmp_path / "cluster_text_cache.npz"
+    cache = load_cluster_text_cache(photo_texts, path=cache_path)
+    descriptors = compute_cluster_tfidf_descriptors(photo_texts, cache=cache)
+    save_cluster_text_cache(cache, path=cache_path)
+    capsys.readouterr()
+
+    cache = load_cluster_text_cache(csv_round_trip, path=cache_path)
+    cached = compute_cluster_tfidf_descriptors(csv_round_trip, cache=cache)
+
+    n_clusters = photo_texts.loc[photo_texts['cluster'] != -1, 'cluster'].nunique()
+    assert f"0 of {n_clusters} clusters recomputed" in capsys.readouterr().out
+    assert cached == descriptors
+
+
+def test_cached_descriptors_match_full_recompute_after_reclustering(photo_texts, tmp_path, capsys):
+    cache_path = tmp_path / "cluster_text_cache.npz"
+    cache = load_cluster_text_cache(photo_texts, path=cache_path)
+    compute_cluster_tfidf_descriptors(photo_texts, cache=cache)
+    save_cluster_text_cache(cache, path=cache_path)
+
+    # Merge clusters 0 and 1, relabel cluster 2 without changing its members
+    reclustered = photo_texts.copy()
+    reclustered['cluster'] = reclustered['cluster'].replace({1: 0, 2: 9})
+    capsys.readouterr()
+
+    cache = load_cluster_text_cache(reclustered, path=cache_path)
+    cached = compute_cluster_tfidf_descriptors(reclustered, cache=cache)
+
+    assert "1 of 5 clusters recomputed" in capsys.readouterr().out
+    assert cached == compute_cluster_tfidf_descriptors(reclustered)
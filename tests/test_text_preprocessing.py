@@ -0,0 +1,39 @@
+"""
+Tests for column-wise text preprocessing (src/text_mining.py).
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.text_mining import (
+    combine_text_fields, preprocess_text_column, tokenize_text_column
+)
+
+
+def test_preprocess_text_column_matches_row_apply(photo_texts):
+    expected = photo_texts.apply(combine_text_fields, axis=1)
+
+    result = preprocess_text_column(photo_texts)
+
+    assert result.tolist() == expected.tolist()
+    assert result.index.equals(photo_texts.index)
+
+
+def test_preprocess_text_column_edge_cases():
+    df = pd.DataFrame({
+        'tags': ['Fourvière_Basilique', None, 'http://flickr.com/x lyon 2012', 'İstanbul-lyon', ''],
+        'title': [None, 'Place Bellecour!', '', 'a b cd', None],
+    })
+    expected = df.apply(combine_text_fields, axis=1)
+
+    assert preprocess_text_column(df).tolist() == expected.tolist()
+
+
+def test_tokenize_text_column_offsets():
+    df = pd.DataFrame({'tags': ['basilique fourviere', None, 'musee'], 'title': ['', None, 'confluence']})
+
+    offsets, values = tokenize_text_column(df)
+
+    assert offsets.tolist() == [0, 2, 2, 4]
+    assert list(values) == ['basilique', 'fourviere', 'musee', 'confluence']
+    assert np.diff(offsets).min() >= 0
@@ -0,0 +1,91 @@
+"""
+Tests for the sparse TF-IDF descriptors against scikit-learn's TfidfVectorizer.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.text_mining import (
+    build_photo_term_matrix, cluster_term_counts, compute_cluster_tfidf_descriptors,
+    compute_streaming_tfidf_descriptors, get_photo_tokens, tfidf_from_counts
+)
+
+ASCII_WORD = re.compile(r'[a-zA-Z]{2,}')
+
+
+def photo_terms(tokens):
+    """Unigrams and bigrams of one photo's ASCII tokens."""
+    words = [t for t in tokens if ASCII_WORD.fullmatch(t)]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+@pytest.fixture
+def sklearn_tfidf(photo_texts):
+    """TfidfVectorizer over one document per cluster, n-grams within photos."""
+    clustered = photo_texts[photo_texts['cluster'] != -1]
+    tokens = get_photo_tokens(photo_texts)[clustered.index]
+    documents = {}
+    for cluster_id, photo_tokens in zip(clustered['cluster'], tokens):
+        documents.setdefault(cluster_id, []).extend(photo_terms(photo_tokens))
+    cluster_ids = sorted(documents)
+
+    vectorizer = TfidfVectorizer(analyzer=lambda terms: terms, min_df=2, max_df=0.8, max_features=5000)
+    matrix = vectorizer.fit_transform([documents[c] for c in cluster_ids])
+    return cluster_ids, matrix.toarray(), vectorizer.get_feature_names_out()
+
+
+def test_tfidf_from_counts_matches_tfidf_vectorizer(photo_texts, sklearn_tfidf):
+    expected_ids, expected, expected_terms = sklearn_tfidf
+
+    matrix, vocabulary = build_photo_term_matrix(photo_texts)
+    cluster_ids, counts = cluster_term_counts(matrix, photo_texts['cluster'].to_numpy())
+    tfidf, terms = tfidf_from_counts(counts, vocabulary)
+
+    assert cluster_ids.tolist() == expected_ids
+    assert list(terms) == list(expected_terms)
+    np.testing.assert_allclose(tfidf.toarray(), expected)
+
+
+def test_cluster_descriptors_are_top_tfidf_terms(photo_texts, sklearn_tfidf):
+    cluster_ids, expected, terms = sklearn_tfidf
+
+    descriptors = compute_cluster_tfidf_descriptors(photo_texts, top_n=5)
+
+    for row, cluster_id in enumerate(cluster_ids):
+        scores = expected[row]
+        # Highest score first, ties in alphabetical order
+        order = sorted(np.flatnonzero(scores), key=lambda j: (-scores[j], terms[j]))[:5]
+        assert [t for t, _ in descriptors[cluster_id]] == [terms[j] for j in order]
+        np.testing.assert_allclose([s for _, s in descriptors[cluster_id]], scores[order])
+
+
+def test_bigrams_never_span_two_photos():
+    df = pd.DataFrame({'tags': ['basilique fourviere', 'musee confluence'], 'title': [None, None]})
+
+    matrix, vocabulary = build_photo_term_matrix(df)
+
+    assert 'fourviere musee' not in set(vocabulary)
+    assert {'basilique fourviere', 'musee confluence'} <= set(vocabulary)
+    assert matrix.sum(axis=1).A1.tolist() == [3, 3]
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.parquet'])
+def test_streaming_descriptors_match_in_memory(photo_texts, tmp_path, suffix):
+    path = tmp_path / f"clustered{suffix}"
+    if suffix == '.csv':
+        photo_texts.to_csv(path, index=False)
+    else:
+        photo_texts.to_parquet(path, index=False)
+    expected = compute_cluster_tfidf_descriptors(photo_texts)
+
+    descriptors, sizes = compute_streaming_tfidf_descriptors(path, chunk_size=97)
+
+    assert list(descriptors) == list(expected)
+    for cluster_id, terms in expected.items():
+        assert [t for t, _ in descriptors[cluster_id]] == [t for t, _ in terms]
+        np.testing.assert_allclose([s for _, s in descriptors[cluster_id]], [s for _, s in terms])
+    assert sizes == photo_texts[photo_texts['cluster'] != -1].groupby('cluster').size().to_dict()
@@ -0,0 +1,82 @@
+"""
+Tests for trajectory mining (src/trajectories.py).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.trajectories import build_cluster_stops, compute_transition_matrix, find_frequent_paths
+
+# (user, cluster, capture time); -1 = noise, None = unknown time
+PHOTOS = [
+    ('alice', 0, '2019-12-06 10:30'),
+    ('bob', 1, '2019-12-06 10:05'),
+    ('alice', 2, '2019-12-06 12:00'),
+    ('alice', 0, '2019-12-06 10:00'),
+    ('bob', 0, '2019-12-06 10:00'),
+    ('alice', 1, '2019-12-07 10:00'),
+    ('alice', -1, '2019-12-07 09:30'),
+    ('alice', 1, '2019-12-06 11:00'),
+    ('bob', 0, '2019-12-06 10:10'),
+    ('bob', 2, None),
+    ('alice', 2, '2019-12-07 09:00'),
+]
+
+
+@pytest.fixture
+def photos() -> pd.DataFrame:
+    users, clusters, times = zip(*PHOTOS)
+    taken = pd.to_datetime(pd.Series(times))
+    return pd.DataFrame({
+        'user': users,
+        'cluster': clusters,
+        'date_taken_year': taken.dt.year,
+        'date_taken_month': taken.dt.month,
+        'date_taken_day': taken.dt.day,
+        'date_taken_hour': taken.dt.hour,
+        'date_taken_minute': taken.dt.minute,
+    })
+
+
+def test_build_cluster_stops(photos):
+    stops = build_cluster_stops(photos, trip_gap_hours=8)
+
+    assert stops['trip'].tolist() == [0, 0, 0, 1, 1, 2, 2, 2]
+    assert stops['user'].tolist() == ['alice'] * 5 + ['bob'] * 3
+    assert stops['cluster'].tolist() == [0, 1, 2, 2, 1, 0, 1, 0]
+    assert stops['n_photos'].tolist() == [2, 1, 1, 1, 1, 1, 1, 1]
+    assert stops['start'].iloc[0] == pd.Timestamp('2019-12-06 10:00')
+    assert stops['end'].iloc[0] == pd.Timestamp('2019-12-06 10:30')
+
+
+def test_build_cluster_stops_splits_trips_on_gap(photos):
+    # Alice's two days merge into one trip when the gap allows it
+    stops = build_cluster_stops(photos, trip_gap_hours=48)
+
+    assert stops['trip'].tolist() == [0, 0, 0, 0, 1, 1, 1]
+    assert stops['cluster'].tolist() == [0, 1, 2, 1, 0, 1, 0]
+
+
+def test_compute_transition_matrix(photos):
+    stops = build_cluster_stops(photos, trip_gap_hours=8)
+
+    cluster_ids, matrix = compute_transition_matrix(stops)
+
+    assert cluster_ids.tolist() == [0, 1, 2]
+    np.testing.assert_array_equal(matrix.toarray(), [
+        [0, 2, 0],
+        [1, 0, 1],
+        [0, 1, 0],
+    ])
+
+
+def test_find_frequent_paths(photos):
+    stops = build_cluster_stops(photos, trip_gap_hours=8)
+
+    pairs = find_frequent_paths(stops, length=2, top_n=1)
+    triples = find_frequent_paths(stops, length=3)
+
+    assert pairs == [{'path': [0, 1], 'count': 2, 'users': 2}]
+    assert sorted(p['path'] for p in triples) == [[0, 1, 0], [0, 1, 2]]
+    assert find_frequent_paths(stops, length=4) == []